@@ -0,0 +1,219 @@
+"""
+Benchmarks replaying the recorded API test cassettes, with no network access.
+
+* test_replay_get: time spent in Zenpy for every recorded GET of a cassette,
+  from building the request to deserializing the response.
+* test_deserialize_objects: objects deserialized per second from every
+  recorded response.
+* test_serialize_create_many: serialization throughput of recorded
+  create_many payloads.
+* test_iterate_pagination: cost of iterating generators across pages.
+
+Run with ``make benchmark``. To catch regressions, save a baseline before a
+change with ``make benchmark-baseline`` and compare against it afterwards with
+``make benchmark-compare``.
+"""
+
+import json
+from itertools import islice
+
+import pytest
+
+from replay import cassette_names, decode_body, load_interactions, replay_client
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.generator import BaseResultGenerator
+from zenpy.lib.request import CRUDRequest
+from zenpy.lib.util import as_singular
+
+HELP_CENTRE_PREFIXES = ('/api/v2/help_center', '/api/v2/community', '/api/v2/guide')
+
+
+def api_for(zenpy_client, url):
+    """ Help Centre responses are mapped to different classes. """
+    if any(prefix in url for prefix in HELP_CENTRE_PREFIXES):
+        return zenpy_client.help_center
+    return zenpy_client.tickets
+
+
+def consume(result):
+    """
+    Iterate over the first page of a generator without requesting the
+    next one, returning the number of objects.
+    """
+    if not isinstance(result, BaseResultGenerator):
+        return 1
+    count = 0
+    for _ in result:
+        count += 1
+        if count >= len(result.values):
+            break
+    return count
+
+
+def recorded_gets(name):
+    """ URLs of the successful JSON GET requests recorded in a cassette. """
+    urls = []
+    for interaction in load_interactions(name):
+        request, response = interaction['request'], interaction['response']
+        content_type = dict((name.lower(), values[0])
+                            for name, values in response['headers'].items()).get('content-type', '')
+        if request['method'] == 'GET' and response['status']['code'] == 200 \
+                and content_type.startswith('application/json') \
+                and request['uri'] not in urls:
+            urls.append(request['uri'])
+    return urls
+
+
+def replayable_gets(name):
+    """ The recorded GETs Zenpy can process on its own, outside the test that made them. """
+    zenpy_client, _ = replay_client(load_interactions(name))
+    urls = []
+    for url in recorded_gets(name):
+        try:
+            consume(api_for(zenpy_client, url)._get(url))
+        except (ZenpyException, KeyError, AttributeError, TypeError):
+            continue
+        urls.append(url)
+    return urls
+
+
+GET_CASSETTES = [name for name in cassette_names() if recorded_gets(name)]
+
+
+@pytest.mark.parametrize('cassette', GET_CASSETTES)
+def test_replay_get(benchmark, cassette):
+    urls = replayable_gets(cassette)
+    if not urls:
+        pytest.skip("no GET requests Zenpy can replay outside the original test")
+    zenpy_client, adapter = replay_client(load_interactions(cassette))
+    benchmark.group = 'replay GET'
+    benchmark.extra_info['requests'] = len(urls)
+
+    def replay():
+        adapter.reset()
+        return sum(consume(api_for(zenpy_client, url)._get(url)) for url in urls)
+
+    benchmark.extra_info['objects'] = benchmark(replay)
+
+
+def recorded_objects():
+    """
+    (object_type, json) for every top level object in every recorded response
+    that can be deserialized without the response handler that received it.
+    """
+    zenpy_client, _ = replay_client([])
+    mapping = zenpy_client.tickets._object_mapping
+    class_mapping = mapping.class_mapping
+    objects = []
+    for name in cassette_names():
+        for interaction in load_interactions(name):
+            response = interaction['response']
+            if response['status']['code'] != 200 or \
+                    any(prefix in interaction['request']['uri'] for prefix in HELP_CENTRE_PREFIXES):
+                continue
+            try:
+                body = json.loads(
+                    decode_body(response) or b'null')
+            except ValueError:
+                continue
+            if not isinstance(body, dict):
+                continue
+            for key, value in body.items():
+                object_type = as_singular(key)
+                if object_type not in class_mapping:
+                    continue
+                for object_json in value if isinstance(value, list) else [value]:
+                    if not isinstance(object_json, dict):
+                        continue
+                    try:
+                        mapping.object_from_json(object_type, object_json)
+                    except (TypeError, AttributeError, KeyError):
+                        continue
+                    objects.append((object_type, object_json))
+    return objects
+
+
+def test_deserialize_objects(benchmark):
+    zenpy_client, _ = replay_client([])
+    mapping = zenpy_client.tickets._object_mapping
+    objects = recorded_objects()
+    benchmark.group = 'deserialize'
+
+    def deserialize():
+        for object_type, object_json in objects:
+            mapping.object_from_json(object_type, object_json)
+
+    benchmark(deserialize)
+    benchmark.extra_info['objects'] = len(objects)
+    benchmark.extra_info['objects_per_second'] = len(objects) / benchmark.stats.stats.mean
+
+
+CREATE_MANY_ENDPOINTS = ('tickets', 'users', 'organizations')
+
+
+def recorded_create_many(endpoint):
+    """ The objects sent in every recorded create_many request for endpoint. """
+    objects = []
+    for name in cassette_names():
+        for interaction in load_interactions(name):
+            request = interaction['request']
+            if request['method'] == 'POST' and \
+                    '/{}/create_many.json'.format(endpoint) in request['uri']:
+                objects.extend(json.loads(request['body']['string'])[endpoint])
+    return objects
+
+
+@pytest.mark.parametrize('endpoint', CREATE_MANY_ENDPOINTS)
+def test_serialize_create_many(benchmark, endpoint):
+    zenpy_client, _ = replay_client([])
+    api = getattr(zenpy_client, endpoint)
+    zenpy_class = api._object_mapping.class_for_type(as_singular(endpoint))
+    payloads = recorded_create_many(endpoint)
+    # Zendesk accepts at most 100 objects per create_many request.
+    objects = [zenpy_class(**payloads[i % len(payloads)]) for i in range(100)]
+    benchmark.group = 'serialize create_many'
+
+    def serialize():
+        return api._serialize(CRUDRequest(api).build_payload(objects))
+
+    serialized = benchmark(serialize)
+    benchmark.extra_info['objects'] = len(objects)
+    benchmark.extra_info['bytes'] = len(json.dumps(serialized))
+    benchmark.extra_info['objects_per_second'] = len(objects) / benchmark.stats.stats.mean
+
+
+# Cassettes recorded by the pagination tests, the api they paginated, how, and
+# how many objects were read before the test stopped.
+PAGINATION_CASSETTES = {
+    'TestTicketsPagination.test_pagination': ('tickets', dict(cursor_pagination=1), 10),
+    'TestUsersPagination.test_pagination': ('users', dict(cursor_pagination=1), 10),
+    'TestActivities.test_pagination': ('activities', dict(cursor_pagination=True), None),
+    'TestTags.test_pagination': ('tags', dict(cursor_pagination=True), None),
+    'TestGroupMemberships.test_pagination': (
+        'group_memberships', dict(cursor_pagination=True), None),
+    'TicketsIncrementalTest.test_pagination': (
+        'tickets.incremental', dict(start_time=0, paginate_by_time=False, per_page=1), 100),
+    'UsersIncrementalTest.test_pagination': (
+        'users.incremental', dict(start_time=0, paginate_by_time=False, per_page=1), 100),
+}
+
+
+def resolve_api(zenpy_client, api_name):
+    api = zenpy_client
+    for name in api_name.split('.'):
+        api = getattr(api, name)
+    return api
+
+
+@pytest.mark.parametrize('cassette', sorted(PAGINATION_CASSETTES))
+def test_iterate_pagination(benchmark, cassette):
+    zenpy_client, adapter = replay_client(load_interactions(cassette))
+    api_name, kwargs, limit = PAGINATION_CASSETTES[cassette]
+    api = resolve_api(zenpy_client, api_name)
+    benchmark.group = 'iterate pagination'
+
+    def iterate():
+        adapter.reset()
+        return sum(1 for _ in islice(api(**kwargs), limit))
+
+    benchmark.extra_info['objects'] = benchmark(iterate)
@@ -0,0 +1,65 @@
+"""
+Benchmarks the cost of logging while processing a page of results.
+
+With logging at INFO no debug message should be formatted, so the INFO run
+should take the same time as the run with logging disabled. Run with:
+
+    make benchmark
+"""
+
+import json
+import logging
+
+import pytest
+from requests import Request, Response
+
+from zenpy import Zenpy
+
+PAGE_SIZE = 1000
+
+
+def make_page_response(subdomain='benchmark'):
+    url = 'https://{}.zendesk.com/api/v2/tickets.json'.format(subdomain)
+    tickets = [
+        dict(id=i,
+             subject='Ticket {}'.format(i),
+             description='Description of ticket {}'.format(i) * 5,
+             status='open',
+             requester_id=1000 + i % 50,
+             tags=['tag{}'.format(i % 10), 'benchmark'],
+             created_at='2020-01-01T00:00:00Z',
+             updated_at='2020-01-02T00:00:00Z',
+             custom_fields=[dict(id=f, value='value') for f in range(10)])
+        for i in range(PAGE_SIZE)
+    ]
+    response = Response()
+    response.status_code = 200
+    response.url = url
+    response.request = Request('GET', url).prepare()
+    response._content = json.dumps(
+        dict(tickets=tickets, next_page=None, previous_page=None, count=PAGE_SIZE)
+    ).encode()
+    return response
+
+
+@pytest.fixture
+def zenpy_client():
+    return Zenpy(subdomain='benchmark', email='benchmark@example.com', token='token')
+
+
+@pytest.mark.parametrize('level', ['CRITICAL', 'INFO', 'DEBUG'])
+def test_process_page(benchmark, zenpy_client, level):
+    logger = logging.getLogger('zenpy')
+    previous_level = logger.level
+    logger.setLevel(level)
+    # Make sure enabled messages are formatted, without flooding the output.
+    handler = logging.NullHandler()
+    logger.addHandler(handler)
+    benchmark.group = 'process ticket page'
+    response = make_page_response()
+    try:
+        tickets = benchmark(lambda: list(zenpy_client.tickets._process_response(response)))
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(previous_level)
+    assert len(tickets) == PAGE_SIZE
@@ -0,0 +1,76 @@
+"""
+Benchmarks reading the lists and dicts of a ticket through ProxyList and
+ProxyDict.
+
+Children are wrapped the first time they are read, so after the first pass
+reads should not allocate. Compare the ``first read`` and ``repeated read``
+groups to see the cost of wrapping. Run with:
+
+    make benchmark
+"""
+
+import pytest
+
+from zenpy import Zenpy
+
+CUSTOM_FIELDS = 200
+TAGS = 200
+
+
+def ticket_json(ticket_id):
+    return dict(
+        id=ticket_id,
+        subject='Ticket {}'.format(ticket_id),
+        tags=['tag{}'.format(i) for i in range(TAGS)],
+        custom_fields=[dict(id=field_id, value='value {}'.format(field_id))
+                       for field_id in range(CUSTOM_FIELDS)],
+        via=dict(channel='email',
+                 source=dict(rel=None,
+                             from_=dict(address='customer@example.com', name='Customer'),
+                             to=dict(address='support@example.com', name='Support'))),
+    )
+
+
+@pytest.fixture
+def object_mapping():
+    zenpy_client = Zenpy(subdomain='benchmark', email='benchmark@example.com', token='token',
+                         disable_cache=True)
+    return zenpy_client.tickets._object_mapping
+
+
+def read_custom_fields(ticket):
+    return sum(1 for field in ticket.custom_fields if field['value'])
+
+
+def read_tags(ticket):
+    return sum(len(tag) for tag in ticket.tags)
+
+
+def read_via_source(ticket):
+    total = 0
+    for _ in range(CUSTOM_FIELDS):
+        source = ticket.via.source
+        total += len(source.to['address']) + len(source.from_['name'])
+    return total
+
+
+READERS = [read_custom_fields, read_tags, read_via_source]
+READER_IDS = ['custom_fields', 'tags', 'via.source']
+
+
+@pytest.mark.parametrize('read', READERS, ids=READER_IDS)
+def test_first_read(benchmark, object_mapping, read):
+    """ Includes wrapping every child, so each round reads a fresh ticket. """
+    benchmark.group = 'proxy: first read'
+    tickets = iter(object_mapping.object_from_json('ticket', ticket_json(i))
+                   for i in range(1000000))
+    benchmark.pedantic(read, setup=lambda: ((next(tickets),), {}), rounds=200)
+
+
+@pytest.mark.parametrize('read', READERS, ids=READER_IDS)
+def test_repeated_read(benchmark, object_mapping, read):
+    benchmark.group = 'proxy: repeated read'
+    ticket = object_mapping.object_from_json('ticket', ticket_json(1))
+    read(ticket)
+    assert benchmark(read, ticket)
+    assert not ticket.to_dict(serialize=True).keys() - {'id'}
@@ -0,0 +1,127 @@
+"""
+Benchmarks Zenpy against large generated payloads, see synthetic.py.
+
+Each benchmark runs at several sizes. The time per object should stay roughly
+constant as the size grows; if it does not, something is quadratic. Compare
+the ``per_object`` extra info between sizes, eg with
+``make benchmark BENCHMARK_ARGS="... -k scale --benchmark-columns=mean"``.
+"""
+
+from itertools import islice
+
+import pytest
+
+from synthetic import PayloadGenerator, SyntheticZendesk
+from zenpy.lib.api_objects import User
+from zenpy.lib.cache import ZenpyCacheManager
+
+
+def run(benchmark, function, objects):
+    """ Warm the synthetic responses up, then benchmark function. """
+    function()
+    result = benchmark(function)
+    benchmark.extra_info['objects'] = objects
+    benchmark.extra_info['per_object'] = benchmark.stats.stats.mean / objects
+    return result
+
+
+@pytest.mark.parametrize('paginate_by_time', [True, False], ids=['time', 'cursor'])
+@pytest.mark.parametrize('page_size', [100, 1000])
+def test_incremental_tickets(benchmark, page_size, paginate_by_time):
+    synthetic = SyntheticZendesk(page_size=page_size, pages=3)
+    zenpy_client = synthetic.client()
+    benchmark.group = 'scale: incremental tickets'
+
+    def iterate():
+        return sum(1 for _ in zenpy_client.tickets.incremental(
+            start_time=0, paginate_by_time=paginate_by_time))
+
+    assert run(benchmark, iterate, page_size * 3) == page_size * 3
+
+
+@pytest.mark.parametrize('page_size', [100, 1000])
+def test_incremental_users_cached(benchmark, page_size):
+    """ Users are cached as they are deserialized, so this includes cache inserts. """
+    synthetic = SyntheticZendesk(page_size=page_size, pages=3)
+    zenpy_client = synthetic.client()
+    benchmark.group = 'scale: incremental users'
+
+    def iterate():
+        return sum(1 for _ in zenpy_client.users.incremental(start_time=0, paginate_by_time=True))
+
+    run(benchmark, iterate, page_size * 3)
+
+
+@pytest.mark.parametrize('comments', [50, 500])
+def test_ticket_comments(benchmark, comments):
+    synthetic = SyntheticZendesk(comments=comments)
+    zenpy_client = synthetic.client()
+    benchmark.group = 'scale: ticket comments'
+
+    def iterate():
+        return sum(len(comment.body) for comment in zenpy_client.tickets.comments(ticket=1))
+
+    run(benchmark, iterate, comments)
+
+
+@pytest.mark.parametrize('user_fields', [100, 5000])
+def test_read_user_fields(benchmark, user_fields):
+    """ Reading every custom field through the ProxyDict. """
+    synthetic = SyntheticZendesk(user_fields=user_fields)
+    zenpy_client = synthetic.client(disable_cache=True)
+    benchmark.group = 'scale: read user fields'
+
+    def read():
+        user = zenpy_client.users(id=1)
+        return sum(len(user.user_fields[key]) for key in user.user_fields)
+
+    run(benchmark, read, user_fields)
+
+
+@pytest.mark.parametrize('user_fields', [100, 5000])
+def test_update_user_fields(benchmark, user_fields):
+    """ Modifying custom fields then serializing the user for an update. """
+    synthetic = SyntheticZendesk(user_fields=user_fields)
+    zenpy_client = synthetic.client(disable_cache=True)
+    benchmark.group = 'scale: update user fields'
+
+    def update():
+        user = zenpy_client.users(id=1)
+        for i in range(0, user_fields, 10):
+            user.user_fields['field_{}'.format(i)] = 'updated'
+        return zenpy_client.users._serialize(user)
+
+    run(benchmark, update, user_fields)
+
+
+@pytest.mark.parametrize('tags', [100, 5000])
+def test_proxy_list(benchmark, tags):
+    """ Appending to and reading from a large ProxyList. """
+    synthetic = SyntheticZendesk(page_size=1, pages=1)
+    zenpy_client = synthetic.client(disable_cache=True)
+    ticket = next(iter(zenpy_client.tickets.incremental(start_time=0, paginate_by_time=True)))
+    benchmark.group = 'scale: proxy list'
+
+    def append_and_read():
+        del ticket.tags[:]
+        for i in range(tags):
+            ticket.tags.append('tag{}'.format(i))
+        return sum(len(ticket.tags[i]) for i in range(tags))
+
+    run(benchmark, append_and_read, tags)
+
+
+@pytest.mark.parametrize('objects', [1000, 20000])
+def test_cache_manager(benchmark, objects):
+    """ Adding and retrieving users, past the capacity of the user cache. """
+    generator = PayloadGenerator()
+    users = [User(**generator.user(user_fields=0)) for _ in range(objects)]
+    cache = ZenpyCacheManager()
+    benchmark.group = 'scale: cache manager'
+
+    def add_and_get():
+        for user in users:
+            cache.add(user)
+        return sum(1 for user in islice(users, 0, None, 10) if cache.get('user', user.id))
+
+    run(benchmark, add_and_get, objects)
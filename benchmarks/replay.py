@@ -0,0 +1,138 @@
+"""
+Replays the betamax cassettes recorded for the API tests through a requests
+transport adapter, so Zenpy can be benchmarked without a network connection.
+
+Interactions are matched on method, path and query parameters like the
+``path_matcher`` used by the tests. Each response body is decoded once when
+the cassette is loaded, so replaying costs as little as possible and the
+benchmarks measure Zenpy rather than the replay machinery.
+"""
+
+import base64
+import glob
+import gzip
+import json
+import os
+from collections import defaultdict
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from zenpy import Zenpy
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), os.pardir,
+                            'tests', 'test_api', 'betamax')
+
+# Headers describing the encoding of the recorded body, which no longer
+# apply once the body has been decoded.
+ENCODING_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def cassette_names():
+    """ Return the names of all recorded cassettes, sorted. """
+    return sorted(os.path.splitext(os.path.basename(path))[0]
+                  for path in glob.glob(os.path.join(CASSETTE_DIR, '*.json')))
+
+
+def load_interactions(*names):
+    """ Return the recorded interactions of the named cassettes, in order. """
+    interactions = []
+    for name in names:
+        with open(os.path.join(CASSETTE_DIR, name + '.json')) as f:
+            interactions.extend(json.load(f)['http_interactions'])
+    return interactions
+
+
+def request_key(method, url):
+    parsed = urlparse(url)
+    query = tuple(sorted((key, tuple(values))
+                         for key, values in parse_qs(parsed.query).items()))
+    return method.upper(), parsed.path, query
+
+
+def decode_body(recorded_response):
+    """ Return the body of a recorded response as bytes. """
+    body = recorded_response['body']
+    if body.get('base64_string'):
+        content = base64.b64decode(body['base64_string'])
+    else:
+        content = (body.get('string') or '').encode(body.get('encoding') or 'utf-8')
+    # Header names were recorded with inconsistent case, so look at the body.
+    if content[:2] == GZIP_MAGIC:
+        content = gzip.decompress(content)
+    return content
+
+
+class RecordedResponse(object):
+    """ A recorded response, decoded once and turned into Responses on demand. """
+
+    def __init__(self, recorded_response):
+        self.status_code = recorded_response['status']['code']
+        self.reason = recorded_response['status']['message']
+        self.headers = dict(
+            (name, ', '.join(values))
+            for name, values in recorded_response['headers'].items()
+            if name.lower() not in ENCODING_HEADERS)
+        self.content = decode_body(recorded_response)
+
+    def build(self, request):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter answering requests from recorded interactions. When
+    the same request was recorded several times the recordings are returned
+    in turn, starting again from the first once all have been used.
+    """
+
+    def __init__(self, interactions):
+        super(CassetteAdapter, self).__init__()
+        self.responses = defaultdict(list)
+        self.calls = defaultdict(int)
+        for interaction in interactions:
+            request = interaction['request']
+            self.responses[request_key(request['method'], request['uri'])].append(
+                RecordedResponse(interaction['response']))
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url)
+        recorded = self.responses.get(key)
+        if not recorded:
+            raise requests.ConnectionError(
+                "No recorded interaction for {} {}".format(request.method, request.url),
+                request=request)
+        call = self.calls[key]
+        self.calls[key] = call + 1
+        return recorded[call % len(recorded)].build(request)
+
+    def reset(self):
+        """ Replay recordings from the first one again. """
+        self.calls.clear()
+
+    def close(self):
+        pass
+
+
+def replay_client(interactions, **kwargs):
+    """
+    Return a Zenpy client whose requests are answered by a CassetteAdapter
+    serving interactions, and the adapter.
+    """
+    adapter = CassetteAdapter(interactions)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    zenpy_client = Zenpy(subdomain='d3v-zenpydev', email='benchmark@example.com',
+                         token='token', session=session, **kwargs)
+    return zenpy_client, adapter
@@ -0,0 +1,246 @@
+"""
+Generates realistic Zendesk responses of arbitrary size from the sample
+objects in the specification folder, and serves them through a requests
+transport adapter so Zenpy can be benchmarked at production scale without
+a network connection.
+
+The recorded cassettes and specification samples hold a handful of objects
+each, which hides behaviour that only shows up with large payloads: 1000
+record incremental pages, tickets with hundreds of comments and users with
+thousands of custom fields.
+"""
+
+import copy
+import json
+import os
+import random
+import re
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from zenpy import Zenpy
+
+SPECIFICATION_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'specification')
+
+BASE_URL = 'https://synthetic.zendesk.com/api/v2'
+
+# Far enough in the past that incremental generators never stop early
+# because the end_time is too recent.
+EPOCH = datetime(2020, 1, 1)
+
+WORDS = ('printer', 'invoice', 'refund', 'login', 'password', 'shipping', 'delay',
+         'order', 'account', 'billing', 'error', 'upgrade', 'cancel', 'broken',
+         'urgent', 'question', 'feedback', 'report', 'access', 'mobile')
+
+
+def load_sample(object_type, api='zendesk'):
+    """ Return the specification sample for object_type. """
+    with open(os.path.join(SPECIFICATION_DIR, api, object_type + '.json')) as f:
+        return json.load(f)
+
+
+class PayloadGenerator(object):
+    """
+    Generates objects shaped like the specification samples. Every object has a
+    unique id, and strings, timestamps and ids are varied so objects are not
+    identical. Generation is seeded, so the same payloads are produced each run.
+    """
+
+    def __init__(self, seed=0, related_ids=1000):
+        """
+        :param seed: seed of the random number generator
+        :param related_ids: number of distinct values used for ids referencing
+            other objects, such as requester_id
+        """
+        self.random = random.Random(seed)
+        self.related_ids = related_ids
+        self.samples = dict()
+        self.next_id = 1
+
+    def sample(self, object_type):
+        if object_type not in self.samples:
+            self.samples[object_type] = load_sample(object_type)
+        return self.samples[object_type]
+
+    def make(self, object_type, **overrides):
+        """ Return a single object of object_type as JSON. """
+        object_id = self.next_id
+        self.next_id += 1
+        obj = copy.deepcopy(self.sample(object_type))
+        for key, value in obj.items():
+            obj[key] = self._vary(key, value, object_id)
+        obj['id'] = object_id
+        if 'url' in obj:
+            obj['url'] = '{}/{}/{}.json'.format(BASE_URL, object_type + 's', object_id)
+        obj.update(overrides)
+        return obj
+
+    def many(self, object_type, count, **overrides):
+        return [self.make(object_type, **overrides) for _ in range(count)]
+
+    def ticket(self, **overrides):
+        return self.make('ticket',
+                         tags=self.words(3),
+                         custom_fields=[dict(id=i, value=self.sentence(2)) for i in range(10)],
+                         **overrides)
+
+    def user(self, user_fields=10, **overrides):
+        """ A user with user_fields custom fields. """
+        fields = dict(('field_{}'.format(i), self.sentence(2)) for i in range(user_fields))
+        return self.make('user', user_fields=fields, tags=self.words(3), **overrides)
+
+    def comment(self, **overrides):
+        return self.make('comment', body=self.sentence(40), **overrides)
+
+    def words(self, count):
+        return [self.random.choice(WORDS) for _ in range(count)]
+
+    def sentence(self, count):
+        return ' '.join(self.words(count))
+
+    def _vary(self, key, value, object_id):
+        if isinstance(value, bool) or value is None:
+            return value
+        if key.endswith('_at') and isinstance(value, str):
+            moment = EPOCH + timedelta(seconds=object_id * 60 + self.random.randint(0, 59))
+            return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+        if key.endswith('_id') and isinstance(value, int):
+            return self.random.randint(1, self.related_ids)
+        if key in ('subject', 'raw_subject', 'description', 'name', 'body'):
+            return '{} {}'.format(self.sentence(6), object_id)
+        if key == 'email':
+            return 'user{}@example.com'.format(object_id)
+        return value
+
+
+class SyntheticZendesk(object):
+    """
+    Serves generated responses for a handful of endpoints:
+
+    * ``incremental/tickets.json`` and ``incremental/users.json``: ``pages``
+      pages of ``page_size`` objects using time based pagination.
+    * ``incremental/tickets/cursor.json`` and ``incremental/users/cursor.json``:
+      the same using cursor based pagination.
+    * ``users.json``: ``pages`` pages of ``page_size`` users using cursor pagination.
+    * ``tickets/{id}/comments.json``: ``comments`` comments.
+    * ``users/{id}.json``: a user with ``user_fields`` custom fields.
+
+    Responses are generated the first time they are requested and reused after
+    that, so only the first request pays for generating them.
+    """
+
+    def __init__(self, page_size=1000, pages=3, comments=500, user_fields=1000, seed=0):
+        self.page_size = page_size
+        self.pages = pages
+        self.comments = comments
+        self.user_fields = user_fields
+        self.generator = PayloadGenerator(seed=seed)
+        self.responses = dict()
+        self.routes = (
+            (re.compile(r'/incremental/(tickets|users)\.json$'), self.incremental_page),
+            (re.compile(r'/incremental/(tickets|users)/cursor\.json$'), self.incremental_cursor_page),
+            (re.compile(r'/users\.json$'), self.cursor_page),
+            (re.compile(r'/tickets/(\d+)/comments\.json$'), self.ticket_comments),
+            (re.compile(r'/users/(\d+)\.json$'), self.show_user),
+        )
+
+    def client(self, **kwargs):
+        """ Return a Zenpy client whose requests are answered by this instance. """
+        session = requests.Session()
+        session.mount('https://', SyntheticAdapter(self))
+        return Zenpy(subdomain='synthetic', email='benchmark@example.com', token='token',
+                     session=session, **kwargs)
+
+    def respond(self, url):
+        """ Return the status and body for url. """
+        if url not in self.responses:
+            parsed = urlparse(url)
+            params = dict((k, v[0]) for k, v in parse_qs(parsed.query).items())
+            for pattern, handler in self.routes:
+                match = pattern.search(parsed.path)
+                if match:
+                    body = handler(params, *match.groups())
+                    self.responses[url] = (200, json.dumps(body).encode())
+                    break
+            else:
+                self.responses[url] = (404, json.dumps(dict(error='RecordNotFound')).encode())
+        return self.responses[url]
+
+    def incremental_page(self, params, object_type):
+        start_time = int(params.get('start_time', 0))
+        page = min(start_time, self.pages - 1)
+        make = self.generator.ticket if object_type == 'tickets' else self.generator.user
+        objects = [make() for _ in range(self.page_size)]
+        end_time = int((EPOCH - datetime(1970, 1, 1)).total_seconds()) + page + 1
+        last_page = page + 1 >= self.pages
+        return {
+            object_type: objects,
+            'count': len(objects),
+            'end_time': end_time,
+            'end_of_stream': last_page,
+            # The page number is used as the start_time of the next page.
+            'next_page': None if last_page else '{}/incremental/{}.json?start_time={}'.format(
+                BASE_URL, object_type, page + 1),
+        }
+
+    def incremental_cursor_page(self, params, object_type):
+        page = int(params.get('cursor', 0))
+        make = self.generator.ticket if object_type == 'tickets' else self.generator.user
+        last_page = page + 1 >= self.pages
+        return {
+            object_type: [make() for _ in range(self.page_size)],
+            'after_cursor': None if last_page else str(page + 1),
+            'after_url': None if last_page else '{}/incremental/{}/cursor.json?cursor={}'.format(
+                BASE_URL, object_type, page + 1),
+            'before_cursor': None,
+            'before_url': None,
+            'end_of_stream': last_page,
+        }
+
+    def cursor_page(self, params):
+        page = int(params.get('page[after]', 0))
+        has_more = page + 1 < self.pages
+        return {
+            'users': [self.generator.user() for _ in range(self.page_size)],
+            'meta': dict(has_more=has_more, after_cursor=str(page + 1), before_cursor=None),
+            'links': dict(next='{}/users.json?{}'.format(
+                BASE_URL, urlencode({'page[after]': page + 1, 'page[size]': self.page_size}))
+                if has_more else None, prev=None),
+        }
+
+    def ticket_comments(self, params, ticket_id):
+        return {
+            'comments': [self.generator.comment() for _ in range(self.comments)],
+            'count': self.comments,
+            'next_page': None,
+            'previous_page': None,
+        }
+
+    def show_user(self, params, user_id):
+        return {'user': self.generator.user(user_fields=self.user_fields, id=int(user_id))}
+
+
+class SyntheticAdapter(BaseAdapter):
+    """ Transport adapter answering requests from a :class:`SyntheticZendesk`. """
+
+    def __init__(self, synthetic):
+        super(SyntheticAdapter, self).__init__()
+        self.synthetic = synthetic
+
+    def send(self, request, **kwargs):
+        status_code, content = self.synthetic.respond(request.url)
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json; charset=utf-8'})
+        response._content = content
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
@@ -24,6 +24,12 @@ setup(
         'pytz>=2018.9',
         'six>=1.14.0',
     ],
+    extras_require={
+        'opentelemetry': ['opentelemetry-api'],
+        'arrow': ['pyarrow'],
+        'zstd': ['zstandard'],
+        'numpy': ['numpy'],
+    },
     keywords=['zendesk', 'api', 'wrapper'],
     classifiers=[
         'Development Status :: 5 - Production/Stable',
@@ -0,0 +1,21 @@
+"""
+Builds Api objects for unit tests, with a mocked session and cache.
+"""
+
+from unittest.mock import MagicMock
+
+
+def make_api(api_class, **overrides):
+    """ Return an instance of api_class built from the config Zenpy passes it. """
+    config = dict(
+        domain="zendesk.com",
+        subdomain="test",
+        session=MagicMock(),
+        timeout=60,
+        ratelimit=None,
+        ratelimit_budget=None,
+        ratelimit_request_interval=10,
+        cache=MagicMock(),
+    )
+    config.update(overrides)
+    return api_class(config)
@@ -0,0 +1,516 @@
+"""
+A local, in-memory imitation of the Zendesk API for load and concurrency testing.
+
+FakeZendesk serves the endpoint shapes produced by EndpointFactory over real
+HTTP on localhost, so the whole request path (sessions, connection pools,
+rate limiting, generators and response handlers) can be exercised offline:
+
+* ``GET {resource}.json``: offset pagination with ``page`` and ``per_page``, or
+  cursor pagination when ``page[size]`` or ``page[after]`` is passed.
+* ``GET {resource}/{id}.json``, ``PUT`` and ``DELETE`` on the same path.
+* ``GET {resource}/{id}/{children}.json``: the objects in children whose
+  ``{resource}_id`` is id, eg ``tickets/1/comments.json`` lists the comments
+  with a ticket_id of 1. Paginated like ``{resource}.json``.
+* ``GET {resource}/show_many.json?ids=``
+* ``POST {resource}.json`` and ``POST {resource}/create_many.json``, the
+  latter returning a job status which can be polled at
+  ``job_statuses/{id}.json`` until it is completed.
+* ``GET incremental/{resource}.json``: time based incremental export.
+* ``GET incremental/{resource}/cursor.json``: cursor based incremental export.
+
+Successful GET responses carry an ``ETag``, and are answered with a 304 when
+it matches the ``If-None-Match`` request header.
+
+Every response carries ``X-Rate-Limit`` and ``X-Rate-Limit-Remaining`` headers.
+Once ``rate_limit`` requests have been made in a window, requests are answered
+with a 429 and a ``Retry-After`` header until the window ends. :meth:`throttle`
+forces 429 responses for the next requests regardless.
+
+Objects are stamped with timestamps that start on 2020-01-01 and increase by
+one second per write, so incremental exports are ordered and never stop early
+because the end_time is too recent.
+
+Zenpy is pointed at the server through the ZENPY_FORCE_SCHEME and
+ZENPY_FORCE_NETLOC environment variables, which are set for the duration of
+the ``with`` block:
+
+.. code-block:: python
+
+    with FakeZendesk(rate_limit=200) as server:
+        server.populate('tickets', 5000)
+        zenpy_client = server.client()
+        for ticket in zenpy_client.tickets():
+            ...
+
+It can also be run on its own, for use from another process::
+
+    PYTHONPATH=.:tests python -m test_api.fixtures.fake_zendesk --populate tickets=10000
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, sleep
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from zenpy import Zenpy
+from zenpy.lib.util import as_singular
+
+EPOCH = datetime(2020, 1, 1)
+UNIX_EPOCH = datetime(1970, 1, 1)
+API_PREFIX = '/api/v2/'
+
+DEFAULT_FIELDS = {
+    'tickets': lambda i: dict(subject='Ticket {}'.format(i), description='Description {}'.format(i),
+                              status='open', priority='normal', tags=['fake']),
+    'users': lambda i: dict(name='User {}'.format(i), email='user{}@example.com'.format(i),
+                            role='end-user', user_fields={}),
+    'organizations': lambda i: dict(name='Organization {}'.format(i), tags=[]),
+}
+
+
+class FakeZendesk(object):
+    """
+    In-memory Zendesk served over HTTP on a background thread. All state is
+    guarded by a single lock, so it can be hammered from many threads.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, rate_limit=700, rate_limit_window=60,
+                 latency=0, job_polls=0, incremental_page_size=1000):
+        """
+        :param host: interface to listen on
+        :param port: port to listen on, 0 picks a free port
+        :param rate_limit: requests allowed per window, None for no limit
+        :param rate_limit_window: length of a rate limit window in seconds
+        :param latency: seconds to wait before answering each request
+        :param job_polls: number of times a job status is reported as working
+            before it is completed
+        :param incremental_page_size: default page size of incremental exports
+        """
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.latency = latency
+        self.job_polls = job_polls
+        self.incremental_page_size = incremental_page_size
+        self.lock = threading.Lock()
+        self.store = dict()
+        self.next_ids = dict()
+        self.job_statuses = dict()
+        self.request_log = deque(maxlen=10000)
+        self.request_count = 0
+        self.ticks = 0
+        self._window_started = monotonic()
+        self._window_used = 0
+        self._throttled = 0
+        self._throttle_retry_after = 1
+        self._saved_environ = None
+        self.httpd = ThreadingHTTPServer((host, port), FakeZendeskHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+        self.routes = (
+            ('GET', re.compile(r'incremental/(\w+)/cursor\.json$'), self.incremental_cursor),
+            ('GET', re.compile(r'incremental/(\w+)\.json$'), self.incremental),
+            ('GET', re.compile(r'job_statuses/show_many\.json$'), self.show_many_job_statuses),
+            ('GET', re.compile(r'job_statuses/(\w+)\.json$'), self.show_job_status),
+            ('GET', re.compile(r'(\w+)/show_many\.json$'), self.show_many),
+            ('POST', re.compile(r'(\w+)/create_many\.json$'), self.create_many),
+            ('GET', re.compile(r'(\w+)/(\d+)/(\w+)\.json$'), self.list_children),
+            ('GET', re.compile(r'(\w+)/(\d+)\.json$'), self.show),
+            ('PUT', re.compile(r'(\w+)/(\d+)\.json$'), self.update),
+            ('DELETE', re.compile(r'(\w+)/(\d+)\.json$'), self.delete),
+            ('GET', re.compile(r'(\w+)\.json$'), self.list),
+            ('POST', re.compile(r'(\w+)\.json$'), self.create),
+        )
+
+    @property
+    def netloc(self):
+        host, port = self.httpd.server_address[:2]
+        return '{}:{}'.format(host, port)
+
+    @property
+    def base_url(self):
+        return 'http://{}{}'.format(self.netloc, API_PREFIX.rstrip('/'))
+
+    @property
+    def environ(self):
+        """ The environment variables that point Zenpy at this server. """
+        return dict(ZENPY_FORCE_SCHEME='http', ZENPY_FORCE_NETLOC=self.netloc)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                           kwargs=dict(poll_interval=0.05),
+                                           name='FakeZendesk', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        self._saved_environ = dict((key, os.environ.get(key)) for key in self.environ)
+        os.environ.update(self.environ)
+        return self
+
+    def __exit__(self, *exc_info):
+        for key, value in self._saved_environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self.stop()
+
+    def client(self, **kwargs):
+        """
+        Return a Zenpy client for this server. Requests only reach the server
+        while the environment from :attr:`environ` is set, eg inside the
+        ``with`` block.
+        """
+        return Zenpy(subdomain='fake', email='fake@example.com', token='token', **kwargs)
+
+    def populate(self, resource, count, **fields):
+        """ Create count objects in resource and return them. """
+        with self.lock:
+            return [self._create(resource, dict(fields)) for _ in range(count)]
+
+    def throttle(self, count=1, retry_after=1):
+        """ Answer the next count requests with a 429. """
+        with self.lock:
+            self._throttled = count
+            self._throttle_retry_after = retry_after
+
+    def objects(self, resource):
+        """ The objects in resource, ordered by id. """
+        with self.lock:
+            return list(self.store.get(resource, {}).values())
+
+    def dispatch(self, method, url, body):
+        """
+        Answer a request, returning the status, extra headers and body.
+        """
+        parsed = urlparse(url)
+        params = dict((key, values[0]) for key, values in parse_qs(parsed.query).items())
+        path = parsed.path[len(API_PREFIX):] if parsed.path.startswith(API_PREFIX) else parsed.path
+        if self.latency:
+            sleep(self.latency)
+        with self.lock:
+            self.request_count += 1
+            self.request_log.append((method, parsed.path, parsed.query))
+            limited, headers = self._check_rate_limit()
+            if limited:
+                return 429, headers, dict(error='TooManyRequests',
+                                          description='Rate limit exceeded')
+            for route_method, pattern, handler in self.routes:
+                match = pattern.match(path)
+                if route_method == method and match:
+                    status, response_body = handler(params, body, *match.groups())
+                    return status, headers, response_body
+            return 404, headers, dict(error='InvalidEndpoint',
+                                      description='Not found: {} {}'.format(method, path))
+
+    def _check_rate_limit(self):
+        if self._throttled:
+            self._throttled -= 1
+            return True, {'Retry-After': str(self._throttle_retry_after),
+                          'X-Rate-Limit': str(self.rate_limit or 0),
+                          'X-Rate-Limit-Remaining': '0'}
+        if self.rate_limit is None:
+            return False, {}
+        now = monotonic()
+        if now - self._window_started >= self.rate_limit_window:
+            self._window_started = now
+            self._window_used = 0
+        headers = {'X-Rate-Limit': str(self.rate_limit)}
+        if self._window_used >= self.rate_limit:
+            retry_after = self.rate_limit_window - (now - self._window_started)
+            headers['Retry-After'] = str(max(1, int(math.ceil(retry_after))))
+            headers['X-Rate-Limit-Remaining'] = '0'
+            return True, headers
+        self._window_used += 1
+        headers['X-Rate-Limit-Remaining'] = str(self.rate_limit - self._window_used)
+        return False, headers
+
+    # Handlers, called with the lock held.
+
+    def list(self, params, body, resource):
+        objects = list(self.store.get(resource, {}).values())
+        return 200, self._page(resource + '.json', resource, objects, params)
+
+    def list_children(self, params, body, parent, parent_id, resource):
+        if int(parent_id) not in self.store.get(parent, {}):
+            return self._not_found()
+        parent_key = as_singular(parent) + '_id'
+        objects = [obj for obj in self.store.get(resource, {}).values()
+                   if obj.get(parent_key) == int(parent_id)]
+        path = '{}/{}/{}.json'.format(parent, parent_id, resource)
+        return 200, self._page(path, resource, objects, params)
+
+    def _page(self, path, resource, objects, params):
+        if 'page[size]' in params or 'page[after]' in params:
+            return self._cursor_page(path, resource, objects, params)
+        per_page = int(params.get('per_page', 100))
+        page = int(params.get('page', 1))
+        start = (page - 1) * per_page
+        return {
+            resource: objects[start:start + per_page],
+            'count': len(objects),
+            'next_page': self._url(path, page=page + 1, per_page=per_page)
+            if start + per_page < len(objects) else None,
+            'previous_page': self._url(path, page=page - 1, per_page=per_page)
+            if page > 1 else None,
+        }
+
+    def _cursor_page(self, path, resource, objects, params):
+        size = int(params.get('page[size]', 100))
+        start = int(params.get('page[after]', 0))
+        end = start + size
+        has_more = end < len(objects)
+        return {
+            resource: objects[start:end],
+            'meta': dict(has_more=has_more,
+                         after_cursor=str(end) if has_more else None,
+                         before_cursor=str(start) if start else None),
+            'links': dict(next=self._url(path, **{'page[size]': size, 'page[after]': end})
+                          if has_more else None,
+                          prev=None),
+        }
+
+    def show(self, params, body, resource, object_id):
+        obj = self.store.get(resource, {}).get(int(object_id))
+        if obj is None:
+            return self._not_found()
+        return 200, {as_singular(resource): obj}
+
+    def show_many(self, params, body, resource):
+        objects = self.store.get(resource, {})
+        ids = [int(i) for i in params.get('ids', '').split(',') if i]
+        return 200, {resource: [objects[i] for i in ids if i in objects]}
+
+    def create(self, params, body, resource):
+        obj = self._create(resource, body[as_singular(resource)])
+        response = {as_singular(resource): obj}
+        if resource == 'tickets':
+            response['audit'] = dict(id=self._next_id('ticket_audits'), ticket_id=obj['id'],
+                                     created_at=obj['created_at'], events=[])
+        return 201, response
+
+    def create_many(self, params, body, resource):
+        results = []
+        for index, fields in enumerate(body[resource]):
+            obj = self._create(resource, fields)
+            results.append(dict(id=obj['id'], index=index, status='Created', success=True))
+        job_id = uuid.uuid4().hex
+        self.job_statuses[job_id] = dict(id=job_id,
+                                         url=self._url('job_statuses/{}.json'.format(job_id)),
+                                         job_type='Bulk Create Job',
+                                         total=len(results),
+                                         polls=self.job_polls,
+                                         final_results=results)
+        return 200, {'job_status': self._job_status(job_id, poll=False)}
+
+    def show_job_status(self, params, body, job_id):
+        if job_id not in self.job_statuses:
+            return self._not_found()
+        return 200, {'job_status': self._job_status(job_id)}
+
+    def show_many_job_statuses(self, params, body):
+        ids = [i for i in params.get('ids', '').split(',') if i in self.job_statuses]
+        return 200, {'job_statuses': [self._job_status(i) for i in ids]}
+
+    def _job_status(self, job_id, poll=True):
+        job = self.job_statuses[job_id]
+        status = dict((key, value) for key, value in job.items()
+                      if key not in ('polls', 'final_results'))
+        if not poll:
+            status.update(status='queued', progress=0, results=None)
+        elif job['polls'] > 0:
+            job['polls'] -= 1
+            status.update(status='working', progress=job['total'] // 2, results=None)
+        else:
+            status.update(status='completed', progress=job['total'],
+                          results=job['final_results'])
+        return status
+
+    def update(self, params, body, resource, object_id):
+        obj = self.store.get(resource, {}).get(int(object_id))
+        if obj is None:
+            return self._not_found()
+        obj.update(body[as_singular(resource)])
+        obj['id'] = int(object_id)
+        obj['updated_at'] = self._tick()
+        return 200, {as_singular(resource): obj}
+
+    def delete(self, params, body, resource, object_id):
+        if self.store.get(resource, {}).pop(int(object_id), None) is None:
+            return self._not_found()
+        return 204, None
+
+    def incremental(self, params, body, resource):
+        per_page = int(params.get('per_page', self.incremental_page_size))
+        start_time = int(params.get('start_time', 0))
+        objects = self._updated_since(resource, start_time)
+        page = objects[:per_page]
+        end_time = self._timestamp(page[-1]['updated_at']) + 1 if page else start_time
+        end_of_stream = len(objects) <= per_page
+        return 200, {
+            resource: page,
+            'count': len(page),
+            'end_time': end_time,
+            'end_of_stream': end_of_stream,
+            'next_page': self._url('incremental/{}.json'.format(resource),
+                                   start_time=end_time, per_page=per_page),
+        }
+
+    def incremental_cursor(self, params, body, resource):
+        per_page = int(params.get('per_page', self.incremental_page_size))
+        objects = self._updated_since(resource, 0)
+        keys = [self._cursor_key(obj) for obj in objects]
+        if 'cursor' in params:
+            # Cursors point after the (updated_at, id) of the last object
+            # returned, so objects updated since are returned again.
+            timestamp, object_id = params['cursor'].split('_')
+            start = bisect.bisect_right(keys, (int(timestamp), int(object_id)))
+        else:
+            start = len(objects) - len(
+                self._updated_since(resource, int(params.get('start_time', 0))))
+        end = min(start + per_page, len(objects))
+        before = max(start - per_page, 0)
+        after_cursor = self._cursor(keys[end - 1]) if end else '0_0'
+        before_cursor = self._cursor(keys[before - 1]) if before else '0_0'
+        path = 'incremental/{}/cursor.json'.format(resource)
+        return 200, {
+            resource: objects[start:end],
+            'after_cursor': after_cursor,
+            'after_url': self._url(path, cursor=after_cursor, per_page=per_page),
+            'before_cursor': before_cursor if start else None,
+            'before_url': self._url(path, cursor=before_cursor, per_page=per_page) if start else None,
+            'end_of_stream': end >= len(objects),
+        }
+
+    def _cursor_key(self, obj):
+        return self._timestamp(obj['updated_at']), obj['id']
+
+    @staticmethod
+    def _cursor(key):
+        return '{}_{}'.format(*key)
+
+    def _updated_since(self, resource, start_time):
+        objects = sorted(self.store.get(resource, {}).values(),
+                         key=lambda obj: (obj['updated_at'], obj['id']))
+        return [obj for obj in objects if self._timestamp(obj['updated_at']) >= start_time]
+
+    def _create(self, resource, fields):
+        object_id = self._next_id(resource)
+        obj = DEFAULT_FIELDS.get(resource, lambda i: dict(name='{} {}'.format(resource, i)))(object_id)
+        obj.update(fields)
+        obj['id'] = object_id
+        obj['url'] = self._url('{}/{}.json'.format(resource, object_id))
+        obj['created_at'] = obj['updated_at'] = self._tick()
+        self.store.setdefault(resource, dict())[object_id] = obj
+        return obj
+
+    def _next_id(self, resource):
+        object_id = self.next_ids.get(resource, 1)
+        self.next_ids[resource] = object_id + 1
+        return object_id
+
+    def _tick(self):
+        self.ticks += 1
+        return (EPOCH + timedelta(seconds=self.ticks)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    @staticmethod
+    def _timestamp(value):
+        moment = datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+        return int((moment - UNIX_EPOCH).total_seconds())
+
+    def _url(self, path, **params):
+        url = '{}/{}'.format(self.base_url, path)
+        return '{}?{}'.format(url, urlencode(params)) if params else url
+
+    @staticmethod
+    def _not_found():
+        return 404, dict(error='RecordNotFound', description='Not found')
+
+
+class FakeZendeskHandler(BaseHTTPRequestHandler):
+    """ Hands requests to the FakeZendesk attached to the server. """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def do_PUT(self):
+        self._respond('PUT')
+
+    def do_DELETE(self):
+        self._respond('DELETE')
+
+    def _respond(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length).decode('utf-8')) if length else None
+        status, headers, response_body = self.server.fake.dispatch(method, self.path, body)
+        content = json.dumps(response_body).encode('utf-8') if response_body is not None else b''
+        if method == 'GET' and status == 200:
+            headers = dict(headers, ETag='"{}"'.format(hashlib.md5(content).hexdigest()))
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                status, content = 304, b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if content:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake Zendesk API on localhost.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--rate-limit', type=int, default=700,
+                        help='requests allowed per minute, 0 for no limit')
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to each response')
+    parser.add_argument('--populate', nargs='*', default=[], metavar='RESOURCE=COUNT',
+                        help='objects to create up front, eg tickets=10000 users=500')
+    args = parser.parse_args()
+
+    server = FakeZendesk(host=args.host, port=args.port,
+                         rate_limit=args.rate_limit or None, latency=args.latency)
+    for spec in args.populate:
+        resource, count = spec.split('=')
+        server.populate(resource, int(count))
+    print('Serving on {}, point Zenpy at it with:'.format(server.base_url))
+    for key, value in sorted(server.environ.items()):
+        print('    export {}={}'.format(key, value))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+"""
+Tests for bulk attachment transfers.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api import AttachmentApi
+from zenpy.lib.api_objects import Attachment, Comment, Ticket, Upload
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.transfer import AttachmentDownloader, ChunkedUploadReader, UploadIndex, \
+    upload_tokens
+
+
+class FakeResponse(object):
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.content), 4):
+            yield self.content[i:i + 4]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAttachmentApi(object):
+    """ Serves attachment content, honouring Range headers. """
+
+    def __init__(self, contents, honour_range=True):
+        self.contents = contents
+        self.honour_range = honour_range
+        self.timeout = 60
+        self.session = MagicMock()
+        self.requests = []
+
+    def __call__(self, id):
+        return self.attachment(id)
+
+    def attachment(self, attachment_id):
+        return Attachment(id=attachment_id,
+                          file_name='file.txt',
+                          size=len(self.contents[attachment_id]),
+                          content_url='https://test/{}'.format(attachment_id))
+
+    def _call_api(self, http_method, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        content = self.contents[int(url.rsplit('/', 1)[-1])]
+        if headers and self.honour_range:
+            offset = int(headers['Range'][len('bytes='):-1])
+            return FakeResponse(content[offset:], status_code=206)
+        return FakeResponse(content)
+
+
+class TestAttachmentDownloader(TestCase):
+    def setUp(self):
+        self.destination = tempfile.mkdtemp()
+        self.contents = {i: ('attachment %s ' % i).encode() * 10 for i in range(1, 6)}
+        self.api = FakeAttachmentApi(self.contents)
+        self.downloader = AttachmentDownloader(self.api, self.destination, max_workers=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.destination)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_downloads_ids_and_objects(self):
+        items = [1, 2, self.api.attachment(3)]
+        items.append(Comment(attachments=[self.api.attachment(4), self.api.attachment(5)]))
+        paths = self.downloader.download(items)
+        self.assertEqual(sorted(paths), [1, 2, 3, 4, 5])
+        for attachment_id, path in paths.items():
+            self.assertEqual(os.path.basename(path), '{}-file.txt'.format(attachment_id))
+            self.assertEqual(self.read(path), self.contents[attachment_id])
+        self.assertEqual(os.listdir(self.destination).count('1-file.txt.part'), 0)
+
+    def test_resumes_partial_download(self):
+        part_path = os.path.join(self.destination, '1-file.txt.part')
+        with open(part_path, 'wb') as f:
+            f.write(self.contents[1][:10])
+        path = self.downloader.download_one(1)
+        self.assertEqual(self.api.requests, [('https://test/1', {'Range': 'bytes=10-'})])
+        self.assertEqual(self.read(path), self.contents[1])
+        self.assertFalse(os.path.exists(part_path))
+
+    def test_restarts_when_range_is_ignored(self):
+        self.api.honour_range = False
+        with open(os.path.join(self.destination, '1-file.txt.part'), 'wb') as f:
+            f.write(self.contents[1][:10])
+        path = self.downloader.download_one(1)
+        self.assertEqual(self.read(path), self.contents[1])
+
+    def test_skips_completed_download(self):
+        self.downloader.download_one(1)
+        self.downloader.download_one(1)
+        self.assertEqual(len(self.api.requests), 1)
+
+    def test_size_mismatch_is_an_error(self):
+        attachment = self.api.attachment(1)
+        attachment.size += 1
+        with self.assertRaises(ZenpyException):
+            self.downloader.download_one(attachment)
+        self.assertFalse(os.path.exists(os.path.join(self.destination, '1-file.txt')))
+
+    def test_errors_returned_when_not_raising(self):
+        attachment = self.api.attachment(1)
+        attachment.size += 1
+        results = self.downloader.download([attachment, 2], raise_on_error=False)
+        self.assertIsInstance(results[1], ZenpyException)
+        self.assertTrue(os.path.exists(results[2]))
+
+
+class FakeUploadSession(object):
+    """ Records uploaded bodies, optionally rate limiting the first request. """
+
+    def __init__(self, rate_limit_first=False):
+        self.rate_limit_first = rate_limit_first
+        self.uploads = []
+        self.lock = threading.Lock()
+
+    def post(self, url, data=None, **kwargs):
+        body = b''.join(data)
+        with self.lock:
+            if self.rate_limit_first:
+                self.rate_limit_first = False
+                return MagicMock(status_code=429, headers={'retry-after': '1'})
+            self.uploads.append((url, body))
+        response = MagicMock(status_code=201, headers={})
+        response.upload = Upload(token='token', attachment=None)
+        return response
+
+
+def make_attachment_api(session):
+    config = dict(
+        domain="zendesk.com",
+        subdomain="test",
+        session=session,
+        timeout=60,
+        ratelimit=None,
+        ratelimit_budget=None,
+        ratelimit_request_interval=10,
+        cache=MagicMock(),
+    )
+    return AttachmentApi(config)
+
+
+class TestAttachmentUploader(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.directory, 'file{}.txt'.format(i))
+            with open(path, 'wb') as f:
+                f.write(('upload %s ' % i).encode() * 100)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def upload(self, files, session=None, **kwargs):
+        session = session or FakeUploadSession()
+        api = make_attachment_api(session)
+        with patch.object(AttachmentApi, '_process_response',
+                          side_effect=lambda response: response.upload):
+            return session, api.upload_many(files, max_workers=3, **kwargs)
+
+    def test_uploads_share_first_token(self):
+        session, uploads = self.upload(self.paths)
+        self.assertEqual(len(uploads), 5)
+        urls = [url for url, _ in session.uploads]
+        self.assertNotIn('token=', urls[0])
+        self.assertTrue(all('token=token' in url for url in urls[1:]))
+        for path in self.paths:
+            with open(path, 'rb') as f:
+                self.assertIn(f.read(), [body for _, body in session.uploads])
+
+    def test_existing_token_is_used_for_all_files(self):
+        session, _ = self.upload(self.paths, token='existing')
+        self.assertTrue(all('token=existing' in url for url, _ in session.uploads))
+
+    def test_file_objects_and_target_names(self):
+        session, _ = self.upload([(io.BytesIO(b'data'), 'renamed.txt')])
+        url, body = session.uploads[0]
+        self.assertIn('filename=renamed.txt', url)
+        self.assertEqual(body, b'data')
+
+    def test_retry_after_rate_limit_resends_whole_file(self):
+        with patch('zenpy.lib.api.sleep'):
+            session, _ = self.upload(self.paths[:1],
+                                     session=FakeUploadSession(rate_limit_first=True))
+        with open(self.paths[0], 'rb') as f:
+            self.assertEqual(session.uploads, [(session.uploads[0][0], f.read())])
+
+    def test_progress_reported_in_chunks(self):
+        progress = []
+        reader = ChunkedUploadReader(io.BytesIO(b'x' * 10), 'x.txt', chunk_size=4,
+                                     progress_callback=lambda *args: progress.append(args))
+        self.assertEqual(len(reader), 10)
+        self.assertEqual([len(c) for c in reader], [4, 4, 2])
+        self.assertEqual(progress, [('x.txt', 4, 10), ('x.txt', 8, 10), ('x.txt', 10, 10)])
+
+
+class TestUploadIndex(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.api = make_attachment_api(MagicMock())
+        self.path = os.path.join(self.directory, 'uploads.db')
+        self.api.upload_index = UploadIndex(self.path)
+        self.tokens = iter('token{}'.format(i) for i in range(100))
+        patcher = patch.object(AttachmentApi, '_upload', side_effect=self.fake_upload)
+        self.upload = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.api.upload_index.close()
+        shutil.rmtree(self.directory)
+
+    def fake_upload(self, fp, target_name=None, **kwargs):
+        return Upload(token=next(self.tokens),
+                      attachment=Attachment(id=1, file_name=target_name))
+
+    def next_run(self):
+        """ Reopen the index, as a later run of an import would. """
+        self.api.upload_index.close()
+        self.api.upload_index = UploadIndex(self.path)
+
+    def test_identical_content_is_uploaded_once(self):
+        first = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.next_run()
+        second = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.assertEqual(first.token, second.token)
+        self.assertEqual(second.attachment.file_name, 'logo.png')
+        self.assertEqual(self.upload.call_count, 1)
+        self.assertEqual(self.api.upload_index.stats(),
+                         dict(hits=1, misses=0, bytes_saved=4))
+
+    def test_token_is_handed_out_once(self):
+        first = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        second = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.assertNotEqual(first.token, second.token)
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_different_content_or_name_is_uploaded(self):
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.api.upload(io.BytesIO(b'other'), target_name='logo.png')
+        self.api.upload(io.BytesIO(b'logo'), target_name='signature.png')
+        self.assertEqual(self.upload.call_count, 3)
+
+    def test_file_position_is_restored_after_hashing(self):
+        fp = io.BytesIO(b'logo')
+        self.api.upload(fp, target_name='logo.png')
+        self.assertEqual(self.upload.call_args[0][0].read(), b'logo')
+
+    def test_explicit_token_bypasses_index(self):
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png', token='existing')
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_expired_uploads_are_not_reused(self):
+        self.api.upload_index.ttl = 0
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.next_run()
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_zendesk_expiry_is_respected(self):
+        index = self.api.upload_index
+        expires_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() - 1))
+        index.add('digest', 'logo.png', 4, Upload(token='old', expires_at=expires_at))
+        self.assertIsNone(index.get('digest', 'logo.png'))
+
+    def test_invalidated_token_is_not_reused(self):
+        upload = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.api.upload_index.invalidate(upload.token)
+        self.next_run()
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_used_token_is_not_reused(self):
+        upload = self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.api.upload_index.mark_used([upload.token])
+        self.next_run()
+        self.api.upload(io.BytesIO(b'logo'), target_name='logo.png')
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_upload_tokens(self):
+        payload = dict(tickets=[dict(comment=dict(uploads=['a', 'b'])),
+                                dict(comment=dict(body='none'))],
+                       request=dict(comment=dict(uploads='c')))
+        self.assertEqual(sorted(upload_tokens(payload)), ['a', 'b', 'c'])
+
+    def test_index_persists_between_instances(self):
+        path = os.path.join(self.directory, 'uploads.db')
+        file_path = os.path.join(self.directory, 'logo.png')
+        with open(file_path, 'wb') as f:
+            f.write(b'logo')
+        self.api.upload_index = UploadIndex(path)
+        self.api.upload(file_path)
+        self.api.upload_index.close()
+        self.api.upload_index = UploadIndex(path)
+        self.api.upload(file_path)
+        self.assertEqual(self.upload.call_count, 1)
+
+
+class TestUploadIndexImport(TestCase):
+    """ Importing tickets that attach the same file through a client with an upload index. """
+
+    def setUp(self):
+        self.server = FakeZendesk()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.zenpy_client = self.server.client(upload_index=UploadIndex())
+        self.tokens = iter('token{}'.format(i) for i in range(100))
+        patcher = patch.object(AttachmentApi, '_upload', side_effect=self.fake_upload)
+        self.upload = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_upload(self, fp, target_name=None, **kwargs):
+        return Upload(token=next(self.tokens),
+                      attachment=Attachment(id=1, file_name=target_name))
+
+    def test_each_ticket_gets_an_unused_token(self):
+        for i in range(2):
+            upload = self.zenpy_client.attachments.upload(io.BytesIO(b'logo'),
+                                                          target_name='logo.png')
+            self.zenpy_client.tickets.create(Ticket(
+                subject='Import {}'.format(i),
+                comment=Comment(body='Imported', uploads=[upload.token])))
+        tokens = [ticket['comment']['uploads'] for ticket in self.server.objects('tickets')]
+        self.assertEqual(tokens, [['token0'], ['token1']])
+        self.assertEqual(self.upload.call_count, 2)
+
+    def test_tickets_in_one_batch_get_their_own_token(self):
+        tickets = []
+        for i in range(2):
+            upload = self.zenpy_client.attachments.upload(io.BytesIO(b'logo'),
+                                                          target_name='logo.png')
+            tickets.append(Ticket(subject='Import {}'.format(i),
+                                  comment=Comment(body='Imported', uploads=[upload.token])))
+        self.zenpy_client.tickets.create(tickets)
+        tokens = [ticket['comment']['uploads'] for ticket in self.server.objects('tickets')]
+        self.assertEqual(sorted(tokens), [['token0'], ['token1']])
@@ -0,0 +1,104 @@
+"""
+Tests for the concurrent map() and batch() helpers.
+"""
+
+import threading
+import time
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.batch import BatchResults, map_concurrently
+from zenpy.lib.exception import RecordNotFoundException
+
+
+class TestMapConcurrently(TestCase):
+    def test_ordered(self):
+        def slow_for_small(item):
+            time.sleep(0.01 * (5 - item))
+            return item * 2
+
+        results = list(map_concurrently(slow_for_small, range(5), max_workers=5))
+        self.assertEqual([r.value for r in results], [0, 2, 4, 6, 8])
+        self.assertEqual([r.item for r in results], [0, 1, 2, 3, 4])
+
+    def test_unordered_yields_as_completed(self):
+        released = [threading.Event() for _ in range(3)]
+
+        def wait_for_release(item):
+            self.assertTrue(released[item].wait(timeout=5))
+            return item
+
+        results = map_concurrently(wait_for_release, range(3), max_workers=3, ordered=False)
+        completed = []
+        for item in (2, 1, 0):
+            released[item].set()
+            completed.append(next(results).item)
+        self.assertEqual(completed, [2, 1, 0])
+        self.assertEqual(list(results), [])
+
+    def test_errors_are_collected(self):
+        def fail_on_odd(item):
+            if item % 2:
+                raise ValueError(item)
+            return item
+
+        results = BatchResults(map_concurrently(fail_on_odd, range(6), max_workers=2))
+        self.assertEqual(results.values, [0, 2, 4])
+        self.assertEqual([r.item for r in results.errors], [1, 3, 5])
+        self.assertIsInstance(results.errors[0].error, ValueError)
+        self.assertFalse(results.errors[0].ok)
+
+    def test_bounded_submission(self):
+        started = []
+        lock = threading.Lock()
+
+        def record(item):
+            with lock:
+                started.append(item)
+            return item
+
+        results = map_concurrently(record, iter(range(1000)), max_workers=2)
+        next(results)
+        results.close()
+        self.assertLess(len(started), 10)
+
+
+class TestApiBatch(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('tickets', 10)
+        self.server.populate('users', 3)
+        for ticket_id in range(1, 11):
+            self.server.populate('comments', ticket_id % 3 + 1, ticket_id=ticket_id)
+            self.server.populate('audits', 1, ticket_id=ticket_id)
+        self.server.populate('identities', 2, user_id=2)
+        self.zenpy_client = self.server.client(disable_cache=True, max_concurrency=4)
+
+    def test_map_ids(self):
+        results = list(self.zenpy_client.tickets.map([3, 1, 99, 2]))
+        self.assertEqual([r.value.id for r in results if r.ok], [3, 1, 2])
+        self.assertIsInstance(results[2].error, RecordNotFoundException)
+
+    def test_comments_map(self):
+        tickets = list(self.zenpy_client.tickets(cursor_pagination=False))
+        results = list(self.zenpy_client.tickets.comments.map(tickets, max_workers=8))
+        self.assertEqual([r.item for r in results], tickets)
+        self.assertEqual([len(r.value) for r in results],
+                         [ticket_id % 3 + 1 for ticket_id in range(1, 11)])
+        self.assertTrue(all(c.ticket_id == r.item.id for r in results for c in r.value))
+
+    def test_comments_still_callable(self):
+        self.assertEqual(len(list(self.zenpy_client.tickets.comments(ticket=3))), 1)
+        self.assertIn('Retrieve the comments', self.zenpy_client.tickets.comments.__doc__)
+
+    def test_audits_batch(self):
+        results = self.zenpy_client.tickets.audits.batch(range(1, 11))
+        self.assertEqual(len(results.values), 10)
+        self.assertEqual(results.errors, [])
+
+    def test_identities_batch(self):
+        results = self.zenpy_client.users.identities.batch([1, 2, 3, 4])
+        self.assertEqual([len(value) for value in results.values], [0, 2, 0])
+        self.assertEqual([r.item for r in results.errors], [4])
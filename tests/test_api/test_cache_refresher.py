@@ -0,0 +1,75 @@
+"""
+Tests for the background cache refresher.
+"""
+
+import time
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.refresher import CacheRefresher
+
+
+class TestCacheRefresher(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('users', 3)
+        self.server.populate('tickets', 3)
+        self.server.populate('organizations', 2)
+        self.zenpy_client = self.server.client()
+        self.refresher = CacheRefresher(self.zenpy_client, start_time=0, interval=0.05)
+        self.addCleanup(self.refresher.stop)
+
+    def update(self, resource, object_id, **fields):
+        self.server.dispatch('PUT', '/api/v2/{}/{}.json'.format(resource, object_id),
+                             {resource[:-1]: fields})
+
+    def test_updates_cached_objects(self):
+        user = self.zenpy_client.users(id=1)
+        self.refresher.refresh()
+        self.update('users', 1, name='Renamed')
+        self.update('users', 2, name='Not cached')
+        self.refresher.refresh()
+        self.assertIsNot(self.zenpy_client.users(id=1), user)
+        self.assertEqual(self.zenpy_client.cache.get('user', 1).name, 'Renamed')
+        self.assertNotIn(2, self.zenpy_client.cache.mapping['user'])
+
+    def test_evicts_deleted_objects(self):
+        self.zenpy_client.tickets(id=2)
+        self.refresher.refresh()
+        self.update('tickets', 2, status='deleted')
+        self.refresher.refresh()
+        self.assertNotIn(2, self.zenpy_client.cache.mapping['ticket'])
+        self.assertEqual(self.refresher.evicted, 1)
+
+    def test_follows_cursor(self):
+        self.refresher.refresh()
+        requests_before = self.server.request_count
+        self.refresher.refresh()
+        # One request per object type, each picking up where the last poll stopped.
+        self.assertEqual(self.server.request_count - requests_before, 3)
+        self.assertIn('cursor=', self.server.request_log[-3][2])
+
+    def test_background_thread(self):
+        self.zenpy_client.organizations(id=1)
+        with self.refresher:
+            self.update('organizations', 1, name='Renamed')
+            deadline = time.time() + 5
+            while self.refresher.updated < 1 and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertFalse(self.refresher.running)
+        self.assertEqual(self.zenpy_client.cache.get('organization', 1).name, 'Renamed')
+
+    def test_errors_counted(self):
+        self.server.throttle(count=1)
+        refresher = CacheRefresher(self.server.client(raise_on_ratelimit=True), start_time=0)
+        refresher.refresh()
+        self.assertEqual(refresher.errors, 1)
+        refresher.refresh()
+        self.assertEqual(refresher.errors, 1)
+
+    def test_unknown_type(self):
+        with self.assertRaises(ZenpyException):
+            CacheRefresher(self.zenpy_client, object_types=('group',))
@@ -0,0 +1,125 @@
+"""
+Tests for the columnar (Arrow/Parquet) export sinks.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase, skipUnless
+
+import pytz
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api_objects import CustomField, Ticket, TicketField, UserField
+from zenpy.lib.columnar import ColumnarSchema, ColumnBuffer, column_batches
+from zenpy.lib.exception import ZenpyException
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def custom_fields(i):
+    return [dict(id=10, value='value {}'.format(i)), dict(id=11, value=str(i)),
+            dict(id=12, value=i % 2 == 0)]
+
+
+class TestColumnarSchema(TestCase):
+    def test_generated_schema(self):
+        schema = ColumnarSchema('ticket')
+        types = dict(schema.columns)
+        self.assertEqual(types['id'], 'int64')
+        self.assertEqual(types['created_at'], 'timestamp')
+        self.assertEqual(types['tags'], 'list<string>')
+        self.assertEqual(types['via'], 'json')
+
+    def test_custom_field_columns(self):
+        schema = ColumnarSchema('ticket', custom_fields=[
+            TicketField(id=10, type='text'), TicketField(id=11, type='integer'), 12])
+        self.assertEqual(schema.names[-3:], ['custom_field_10', 'custom_field_11', 'custom_field_12'])
+        self.assertEqual(schema.types[-3:], ['string', 'int64', 'string'])
+        schema = ColumnarSchema('user', custom_fields=[UserField(key='plan', type='dropdown')])
+        self.assertEqual(schema.names[-1], 'user_field_plan')
+
+    def test_unknown_type(self):
+        with self.assertRaises(ZenpyException):
+            ColumnarSchema('no_such_thing')
+
+
+class TestColumnBuffer(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        for i in range(25):
+            self.server.populate('tickets', 1, custom_fields=custom_fields(i))
+        self.zenpy_client = self.server.client(disable_cache=True)
+        self.schema = ColumnarSchema('ticket', custom_fields=[
+            TicketField(id=10, type='text'), TicketField(id=11, type='integer'),
+            TicketField(id=12, type='checkbox')])
+
+    def tickets(self):
+        return self.zenpy_client.tickets.incremental(start_time=0)
+
+    def test_batches_bounded(self):
+        batches = list(column_batches(self.tickets(), self.schema, batch_size=10))
+        self.assertEqual([len(batch['id']) for batch in batches], [10, 10, 5])
+        first = batches[0]
+        self.assertEqual(first['id'][:3], [1, 2, 3])
+        self.assertEqual(first['custom_field_11'][:3], [0, 1, 2])
+        self.assertEqual(first['custom_field_12'][:2], [True, False])
+        self.assertEqual(first['created_at'][0], datetime(2020, 1, 1, 0, 0, 1, tzinfo=pytz.utc))
+        self.assertEqual(first['tags'][0], ['fake'])
+
+    def test_reading_does_not_dirty_objects(self):
+        tickets = list(self.tickets())
+        buffer = ColumnBuffer(self.schema)
+        for ticket in tickets:
+            buffer.append(ticket)
+        self.assertTrue(all(not ticket._dirty_attributes for ticket in tickets))
+        self.assertEqual(len(buffer), 25)
+        self.assertEqual(len(buffer.take()['id']), 25)
+        self.assertEqual(len(buffer), 0)
+
+    def test_dicts(self):
+        buffer = ColumnBuffer(self.schema)
+        buffer.append(dict(id=1, created_at='2021-03-04T05:06:07Z', via=dict(channel='web'),
+                           custom_fields=custom_fields(3)))
+        columns = buffer.take()
+        self.assertEqual(columns['via'], ['{"channel": "web"}'])
+        self.assertEqual(columns['custom_field_10'], ['value 3'])
+        self.assertEqual(columns['subject'], [None])
+
+    def test_custom_field_objects(self):
+        buffer = ColumnBuffer(self.schema)
+        buffer.append(Ticket(id=1, custom_fields=[CustomField(id=10, value='value 1'),
+                                                  CustomField(id=11, value='7')]))
+        columns = buffer.take()
+        self.assertEqual(columns['custom_field_10'], ['value 1'])
+        self.assertEqual(columns['custom_field_11'], [7])
+        self.assertEqual(columns['custom_field_12'], [None])
+
+    @skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_record_batches(self):
+        from zenpy.lib.columnar import record_batches
+        batches = list(record_batches(self.tickets(), self.schema, batch_size=10))
+        self.assertEqual([batch.num_rows for batch in batches], [10, 10, 5])
+        self.assertEqual(batches[0].schema.field('custom_field_11').type, pyarrow.int64())
+        table = pyarrow.Table.from_batches(batches)
+        self.assertEqual(table.column('id').to_pylist(), list(range(1, 26)))
+
+    @skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_parquet_sink(self):
+        from zenpy.lib.columnar import ParquetSink
+        fd, path = tempfile.mkstemp(suffix='.parquet')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with ParquetSink(path, self.schema, batch_size=10) as sink:
+            sink.write_all(self.tickets())
+        self.assertEqual((sink.rows, sink.row_groups), (25, 3))
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        table = parquet_file.read()
+        self.assertEqual(table.column('custom_field_10').to_pylist()[:2], ['value 0', 'value 1'])
@@ -0,0 +1,98 @@
+"""
+Tests for connection pool configuration and pool usage stats.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy import Zenpy
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.pool import ZenpyHTTPAdapter
+
+
+def make_client(**kwargs):
+    return Zenpy(subdomain='test', email='test@example.com', token='token', **kwargs)
+
+
+class TestPoolConfiguration(TestCase):
+    def adapter(self, zenpy_client):
+        return zenpy_client.users.session.get_adapter('https://test.zendesk.com')
+
+    def test_default_pool(self):
+        adapter = self.adapter(make_client())
+        self.assertIsInstance(adapter, ZenpyHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertFalse(adapter._pool_block)
+
+    def test_pool_sized_to_concurrency(self):
+        self.assertEqual(self.adapter(make_client(max_concurrency=32))._pool_maxsize, 32)
+        self.assertEqual(self.adapter(make_client(max_concurrency=4))._pool_maxsize, 10)
+
+    def test_explicit_pool_options(self):
+        adapter = self.adapter(make_client(max_concurrency=32, pool_maxsize=5,
+                                           pool_connections=2, pool_block=True))
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertTrue(adapter._pool_block)
+
+    def test_http_adapter_kwargs(self):
+        kwargs = Zenpy.http_adapter_kwargs(max_concurrency=20)
+        self.assertEqual(kwargs['pool_maxsize'], 20)
+        self.assertEqual(kwargs['max_retries'].total, 3)
+        HTTPAdapter(**Zenpy.http_adapter_kwargs())
+
+    def test_custom_session_untouched(self):
+        session = requests.Session()
+        adapter = HTTPAdapter()
+        session.mount('https://', adapter)
+        zenpy_client = make_client(session=session)
+        self.assertIs(self.adapter(zenpy_client), adapter)
+        self.assertEqual(zenpy_client.pool_stats(), {})
+
+    def test_custom_session_rejects_pool_options(self):
+        with self.assertRaises(ZenpyException):
+            make_client(session=requests.Session(), max_concurrency=16)
+
+    def test_keep_alive_disabled(self):
+        zenpy_client = make_client(keep_alive=False)
+        self.assertEqual(zenpy_client.users.session.headers['Connection'], 'close')
+
+
+class TestPoolStats(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None, latency=0.02)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('tickets', 1)
+
+    def hammer(self, zenpy_client, threads, requests_per_thread=5):
+        def fetch(_):
+            for _ in range(requests_per_thread):
+                zenpy_client.tickets(id=1)
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(fetch, range(threads)))
+        stats = zenpy_client.pool_stats()
+        self.assertEqual(len(stats), 1)
+        return list(stats.values())[0]
+
+    def test_pool_sized_for_threads_reuses_connections(self):
+        zenpy_client = self.server.client(disable_cache=True, max_concurrency=8)
+        stats = self.hammer(zenpy_client, threads=8)
+        self.assertEqual(stats['requests'], 40)
+        self.assertEqual(stats['in_use'], 0)
+        self.assertLessEqual(stats['connections'], 8)
+        self.assertEqual(stats['discarded'], 0)
+
+    def test_undersized_pool_discards_connections(self):
+        zenpy_client = self.server.client(disable_cache=True, pool_maxsize=1)
+        stats = self.hammer(zenpy_client, threads=8)
+        self.assertEqual(stats['maxsize'], 1)
+        self.assertGreater(stats['exhausted'], 0)
+        self.assertGreater(stats['discarded'], 0)
+        self.assertGreater(stats['connections'], 1)
+        self.assertGreater(stats['peak_in_use'], 1)
@@ -0,0 +1,144 @@
+"""
+Tests for reading and setting custom field values.
+"""
+
+from unittest import TestCase
+
+from zenpy.lib.api_objects import CustomField, Organization, Ticket, TicketField, User, UserField
+from zenpy.lib.cache import ZenpyCacheManager
+from zenpy.lib.custom_fields import CustomFieldIndex, get_custom_field, set_custom_field
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.mapping import ZendeskObjectMapping
+from zenpy.lib.proxy import ProxyDict
+
+
+class StubApi(object):
+    cache = ZenpyCacheManager(disabled=True)
+
+
+def from_json(object_type, object_json):
+    return ZendeskObjectMapping(StubApi()).object_from_json(object_type, object_json)
+
+
+def fetched_ticket():
+    return from_json('ticket', {
+        'id': 1,
+        'custom_fields': [{'id': field_id, 'value': 'v{}'.format(field_id)}
+                          for field_id in range(100, 120)],
+    })
+
+
+class TestTicketCustomFields(TestCase):
+    def test_get(self):
+        ticket = fetched_ticket()
+        self.assertEqual(get_custom_field(ticket, 105), 'v105')
+        self.assertEqual(get_custom_field(ticket, 119), 'v119')
+        self.assertIsNone(get_custom_field(ticket, 999))
+        self.assertEqual(get_custom_field(ticket, 999, 'default'), 'default')
+        self.assertIsNone(get_custom_field(Ticket(), 105))
+
+    def test_get_does_not_wrap_or_dirty(self):
+        ticket = fetched_ticket()
+        get_custom_field(ticket, 105)
+        self.assertIs(type(list.__getitem__(ticket.custom_fields, 5)), dict)
+        self.assertEqual(ticket.to_dict(serialize=True), {'id': 1})
+
+    def test_set_marks_dirty(self):
+        ticket = fetched_ticket()
+        set_custom_field(ticket, 105, 'changed')
+        self.assertEqual(get_custom_field(ticket, 105), 'changed')
+        serialized = ticket.to_dict(serialize=True)
+        self.assertIn({'id': 105, 'value': 'changed'}, serialized['custom_fields'])
+
+    def test_set_adds_missing_field(self):
+        ticket = fetched_ticket()
+        set_custom_field(ticket, 999, 'new')
+        self.assertEqual(get_custom_field(ticket, 999), 'new')
+        self.assertIn('custom_fields', ticket.to_dict(serialize=True))
+        empty = Ticket(id=2)
+        set_custom_field(empty, 5, 'x')
+        self.assertEqual(empty.custom_fields, [{'id': 5, 'value': 'x'}])
+
+    def test_index_follows_changes(self):
+        ticket = fetched_ticket()
+        self.assertEqual(get_custom_field(ticket, 119), 'v119')
+        ticket.custom_fields.remove(list.__getitem__(ticket.custom_fields, 0))
+        self.assertEqual(get_custom_field(ticket, 119), 'v119')
+        self.assertIsNone(get_custom_field(ticket, 100))
+        ticket.custom_fields = [{'id': 100, 'value': 'replaced'}]
+        self.assertEqual(get_custom_field(ticket, 100), 'replaced')
+
+    def test_index_follows_fields_replaced_in_place(self):
+        ticket = from_json('ticket', {'id': 1, 'custom_fields': [{'id': 1, 'value': 'a'},
+                                                                 {'id': 2, 'value': 'b'}]})
+        self.assertEqual(get_custom_field(ticket, 2), 'b')
+        ticket.custom_fields[1] = {'id': 3, 'value': 'c'}
+        self.assertEqual(get_custom_field(ticket, 3), 'c')
+        self.assertIsNone(get_custom_field(ticket, 2))
+
+    def test_index_kept_until_list_changes(self):
+        ticket = fetched_ticket()
+        get_custom_field(ticket, 105)
+        index = ticket.__dict__['_custom_field_positions'][2]
+        self.assertIsNone(get_custom_field(ticket, 999))
+        set_custom_field(ticket, 106, 'changed')
+        set_custom_field(ticket, 999, 'new')
+        self.assertEqual(get_custom_field(ticket, 999), 'new')
+        self.assertIs(ticket.__dict__['_custom_field_positions'][2], index)
+        ticket.custom_fields.append({'id': 1000, 'value': 'appended'})
+        self.assertEqual(get_custom_field(ticket, 1000), 'appended')
+        self.assertIsNot(ticket.__dict__['_custom_field_positions'][2], index)
+
+    def test_custom_field_objects(self):
+        ticket = Ticket(custom_fields=[CustomField(id=5, value='a')])
+        self.assertEqual(get_custom_field(ticket, 5), 'a')
+        set_custom_field(ticket, 5, 'b')
+        self.assertEqual(ticket.custom_fields[0].value, 'b')
+
+    def test_index_not_serialized(self):
+        ticket = fetched_ticket()
+        get_custom_field(ticket, 105)
+        self.assertNotIn('custom_field_positions', ticket.to_dict())
+
+
+class TestKeyedCustomFields(TestCase):
+    def test_user_fields(self):
+        user = from_json('user', {'id': 1, 'user_fields': {'plan': 'gold'}})
+        self.assertEqual(get_custom_field(user, 'plan'), 'gold')
+        set_custom_field(user, 'plan', 'silver')
+        self.assertEqual(user.to_dict(serialize=True)['user_fields'], {'plan': 'silver'})
+
+    def test_organization_without_fields(self):
+        organization = Organization(id=1)
+        self.assertIsNone(get_custom_field(organization, 'tier'))
+        set_custom_field(organization, 'tier', 2)
+        self.assertEqual(organization.organization_fields, {'tier': 2})
+
+
+class TestCustomFieldIndex(TestCase):
+    def test_ticket_fields_by_title(self):
+        index = CustomFieldIndex([TicketField(id=105, title='Region'),
+                                  TicketField(id=106, title='Queue')])
+        ticket = fetched_ticket()
+        self.assertEqual(index.get(ticket, 'Region'), 'v105')
+        self.assertEqual(index.get(ticket, 106), 'v106')
+        index.set(ticket, 'Queue', 'tier_1')
+        self.assertEqual(get_custom_field(ticket, 106), 'tier_1')
+        self.assertEqual(index.values(ticket, ['Region', 'Queue']),
+                         {'Region': 'v105', 'Queue': 'tier_1'})
+
+    def test_user_fields_by_title_and_id(self):
+        index = CustomFieldIndex([UserField(id=7, key='plan', title='Plan')])
+        user = User(id=1, user_fields=ProxyDict(plan='gold'))
+        self.assertEqual(index.get(user, 'Plan'), 'gold')
+        self.assertEqual(index.get(user, 7), 'gold')
+        self.assertEqual(index.get(user, 'plan'), 'gold')
+
+    def test_unknown_field(self):
+        index = CustomFieldIndex([TicketField(id=105, title='Region')])
+        with self.assertRaises(ZenpyException):
+            index.get(fetched_ticket(), 'Nope')
+
+    def test_mixed_fields(self):
+        with self.assertRaises(ZenpyException):
+            CustomFieldIndex([TicketField(id=1, title='A'), UserField(id=2, key='b', title='B')])
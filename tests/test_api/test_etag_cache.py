@@ -0,0 +1,82 @@
+"""
+Tests for conditional GET requests answered from the ETag cache.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.etag import ETagCache
+
+
+class TestETagCache(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('ticket_fields', 3, title='Field', type='text')
+        self.server.populate('tickets', 2)
+        self.zenpy_client = self.server.client(etag_cache=True)
+        self.etag_cache = self.zenpy_client.etag_cache
+
+    def ticket_field_titles(self):
+        return [field.title for field in self.zenpy_client.ticket_fields()]
+
+    def test_not_modified_served_from_cache(self):
+        first = self.ticket_field_titles()
+        self.assertEqual(self.etag_cache.stats()['hits'], 0)
+        self.assertEqual(len(self.etag_cache), 1)
+        self.assertEqual(self.ticket_field_titles(), first)
+        stats = self.etag_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertGreater(stats['bytes_saved'], 0)
+
+    def test_changed_response_replaces_entry(self):
+        self.ticket_field_titles()
+        self.server.populate('ticket_fields', 1, title='New field', type='text')
+        self.assertIn('New field', self.ticket_field_titles())
+        self.assertEqual(self.etag_cache.stats()['hits'], 0)
+        self.assertEqual(len(self.etag_cache), 1)
+
+    def test_single_object(self):
+        zenpy_client = self.server.client(etag_cache=self.etag_cache, disable_cache=True)
+        zenpy_client.ticket_fields(id=1)
+        self.assertEqual(zenpy_client.ticket_fields(id=1).title, 'Field')
+        self.assertEqual(self.etag_cache.stats()['hits'], 1)
+
+    def test_other_endpoints_not_cached(self):
+        list(self.zenpy_client.tickets(cursor_pagination=False))
+        list(self.zenpy_client.tickets(cursor_pagination=False))
+        self.assertEqual(len(self.etag_cache), 0)
+
+    def test_invalidate(self):
+        self.ticket_field_titles()
+        self.etag_cache.invalidate()
+        self.ticket_field_titles()
+        self.assertEqual(self.etag_cache.stats()['hits'], 0)
+
+    def test_persistent_store(self):
+        fd, path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.server.client(etag_cache=path).ticket_fields(id=2)
+        zenpy_client = self.server.client(etag_cache=path)
+        zenpy_client.ticket_fields(id=2)
+        self.assertEqual(zenpy_client.etag_cache.stats()['hits'], 1)
+
+
+class TestETagCacheUnit(TestCase):
+    def test_should_cache(self):
+        etag_cache = ETagCache()
+        self.assertTrue(etag_cache.should_cache('https://x.zendesk.com/api/v2/ticket_fields.json'))
+        self.assertTrue(etag_cache.should_cache('https://x.zendesk.com/api/v2/slas/policies.json'))
+        self.assertTrue(etag_cache.should_cache('https://x.zendesk.com/api/v2/brands/1.json'))
+        self.assertFalse(etag_cache.should_cache('https://x.zendesk.com/api/v2/tickets.json'))
+        self.assertTrue(ETagCache(endpoints=None).should_cache('https://x.zendesk.com/api/v2/tickets.json'))
+
+    def test_cache_key_orders_params(self):
+        url = 'https://x.zendesk.com/api/v2/groups.json'
+        self.assertEqual(ETagCache.cache_key(url), url)
+        self.assertEqual(ETagCache.cache_key(url, dict(page=2, per_page=10)),
+                         ETagCache.cache_key(url, dict(per_page=10, page=2)))
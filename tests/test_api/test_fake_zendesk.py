@@ -0,0 +1,130 @@
+"""
+Tests running Zenpy against the local FakeZendesk server.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api_objects import JobStatus, Ticket, User
+from zenpy.lib.exception import RateLimitError, RecordNotFoundException
+
+
+class FakeZendeskTestCase(TestCase):
+    server_kwargs = dict()
+
+    def setUp(self):
+        self.server = FakeZendesk(**self.server_kwargs)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.zenpy_client = self.server.client(disable_cache=True)
+
+    def requests_made(self, path):
+        return [entry for entry in self.server.request_log if entry[1].endswith(path)]
+
+
+class TestFakeZendeskPagination(FakeZendeskTestCase):
+    def setUp(self):
+        super(TestFakeZendeskPagination, self).setUp()
+        self.server.populate('tickets', 250)
+        self.server.populate('users', 25)
+
+    def test_offset_pagination(self):
+        tickets = list(self.zenpy_client.tickets(cursor_pagination=False))
+        self.assertEqual([t.id for t in tickets], list(range(1, 251)))
+        self.assertEqual(len(self.requests_made('/tickets.json')), 3)
+
+    def test_cursor_pagination(self):
+        tickets = list(self.zenpy_client.tickets(cursor_pagination=100))
+        self.assertEqual([t.id for t in tickets], list(range(1, 251)))
+        self.assertEqual(len(self.requests_made('/tickets.json')), 3)
+
+    def test_incremental_time_pagination(self):
+        users = list(self.zenpy_client.users.incremental(start_time=0, paginate_by_time=True,
+                                                         per_page=10))
+        self.assertEqual([u.id for u in users], list(range(1, 26)))
+        self.assertEqual(len(self.requests_made('/incremental/users.json')), 3)
+
+    def test_incremental_cursor_pagination(self):
+        tickets = list(self.zenpy_client.tickets.incremental(start_time=0, per_page=100))
+        self.assertEqual([t.id for t in tickets], list(range(1, 251)))
+        self.assertEqual(len(self.requests_made('/incremental/tickets/cursor.json')), 3)
+
+    def test_incremental_returns_updated_objects_last(self):
+        ticket = self.zenpy_client.tickets(id=5)
+        ticket.subject = 'Updated'
+        self.zenpy_client.tickets.update(ticket)
+        tickets = list(self.zenpy_client.tickets.incremental(start_time=0))
+        self.assertEqual(tickets[-1].id, 5)
+        self.assertEqual(tickets[-1].subject, 'Updated')
+
+    def test_show_many(self):
+        tickets = list(self.zenpy_client.tickets(ids=[3, 1, 400]))
+        self.assertEqual([t.id for t in tickets], [3, 1])
+
+    def test_record_not_found(self):
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.tickets(id=400)
+
+
+class TestFakeZendeskCreate(FakeZendeskTestCase):
+    server_kwargs = dict(job_polls=1)
+
+    def test_create(self):
+        audit = self.zenpy_client.tickets.create(Ticket(subject='Help'))
+        self.assertEqual(audit.ticket.subject, 'Help')
+        self.assertEqual(self.zenpy_client.tickets(id=audit.ticket.id).subject, 'Help')
+
+    def test_create_many_job_status(self):
+        job_status = self.zenpy_client.users.create([User(name='user {}'.format(i))
+                                                     for i in range(3)])
+        self.assertIsInstance(job_status, JobStatus)
+        self.assertEqual(job_status.status, 'queued')
+        self.assertEqual(self.zenpy_client.job_status(id=job_status.id).status, 'working')
+        completed = self.zenpy_client.job_status(id=job_status.id)
+        self.assertEqual(completed.status, 'completed')
+        self.assertEqual([result.id for result in completed.results], [1, 2, 3])
+        self.assertEqual([u.name for u in self.zenpy_client.users(ids=[1, 2, 3])],
+                         ['user 0', 'user 1', 'user 2'])
+
+    def test_delete(self):
+        ticket = self.zenpy_client.tickets.create(Ticket(subject='Help')).ticket
+        self.zenpy_client.tickets.delete(ticket)
+        self.assertEqual(self.server.objects('tickets'), [])
+
+
+class TestFakeZendeskRateLimit(FakeZendeskTestCase):
+    server_kwargs = dict(rate_limit=3)
+
+    def setUp(self):
+        super(TestFakeZendeskRateLimit, self).setUp()
+        self.server.populate('tickets', 1)
+
+    @patch('zenpy.lib.api.sleep')
+    def test_throttle_is_retried(self, sleep):
+        self.server.throttle(2, retry_after=1)
+        self.assertEqual(self.zenpy_client.tickets(id=1).id, 1)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_raise_on_ratelimit(self):
+        zenpy_client = self.server.client(disable_cache=True, raise_on_ratelimit=True)
+        self.server.throttle(1, retry_after=7)
+        with self.assertRaises(RateLimitError) as context:
+            zenpy_client.tickets(id=1)
+        self.assertEqual(context.exception.retry_after, 7)
+
+    def test_rate_limit_window(self):
+        zenpy_client = self.server.client(disable_cache=True, raise_on_ratelimit=True)
+        for _ in range(3):
+            zenpy_client.tickets(id=1)
+        with self.assertRaises(RateLimitError) as context:
+            zenpy_client.tickets(id=1)
+        response = context.exception.response
+        self.assertEqual(response.headers['X-Rate-Limit-Remaining'], '0')
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+
+    def test_remaining_header_feeds_callsafety(self):
+        zenpy_client = self.server.client(disable_cache=True, proactive_ratelimit=1)
+        zenpy_client.tickets(id=1)
+        self.assertEqual(zenpy_client.tickets.callsafety['lastlimitremaining'], 2)
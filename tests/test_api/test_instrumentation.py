@@ -0,0 +1,183 @@
+"""
+Tests for request lifecycle hooks and the collectors built on them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from zenpy.lib.api import Api
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.instrumentation import (Histogram, Hooks, MetricsCollector,
+                                       OpenTelemetryAdapter, endpoint_template)
+
+URL = 'https://test.zendesk.com/api/v2/tickets/12.json'
+
+
+def make_response(status_code=200, content=b'{"ticket": {"id": 12}}', headers=None):
+    response = MagicMock(status_code=status_code, content=content, headers=headers or {})
+    response.json.return_value = {'ticket': {'id': 12}}
+    response.url = URL
+    response.request.url = URL
+    return response
+
+
+def make_api(hooks, responses):
+    session = MagicMock()
+    session.get.side_effect = responses
+    session.get.__name__ = 'get'
+    config = dict(
+        domain="zendesk.com",
+        subdomain="test",
+        session=session,
+        timeout=60,
+        ratelimit=None,
+        ratelimit_budget=None,
+        ratelimit_request_interval=10,
+        cache=MagicMock(),
+        hooks=hooks,
+    )
+    return Api(config, object_type='ticket')
+
+
+class TestHooks(TestCase):
+    def setUp(self):
+        self.hooks = Hooks()
+        self.events = []
+        for event in ('before_request', 'after_response', 'on_retry',
+                      'on_ratelimit_wait', 'on_deserialize'):
+            self.hooks.register(event, lambda data, event=event: self.events.append((event, data)))
+
+    def event_names(self):
+        return [name for name, _ in self.events]
+
+    def test_request_events(self):
+        api = make_api(self.hooks, [make_response()])
+        ticket = api._get(URL)
+        self.assertEqual(ticket.id, 12)
+        self.assertEqual(self.event_names(),
+                         ['before_request', 'after_response', 'on_deserialize'])
+        after_response = self.events[1][1]
+        self.assertEqual(after_response['endpoint'], '/api/v2/tickets/{id}.json')
+        self.assertEqual(after_response['method'], 'GET')
+        self.assertEqual(after_response['status'], 200)
+        self.assertEqual(after_response['bytes'], len(b'{"ticket": {"id": 12}}'))
+        self.assertEqual(after_response['attempts'], 1)
+        self.assertEqual(self.events[2][1]['handler'], 'GenericZendeskResponseHandler')
+
+    def test_rate_limited_request_events(self):
+        api = make_api(self.hooks, [make_response(429, headers={'retry-after': '2'}),
+                                    make_response()])
+        with patch('zenpy.lib.api.sleep'):
+            api._call_api(api.session.get, URL)
+        self.assertEqual(self.event_names(),
+                         ['before_request', 'on_ratelimit_wait', 'on_retry', 'after_response'])
+        self.assertEqual(self.events[1][1]['seconds'], 2)
+        self.assertEqual(self.events[1][1]['reason'], 'retry-after')
+        self.assertEqual(self.events[3][1]['attempts'], 2)
+
+    def test_failing_hook_does_not_break_request(self):
+        hooks = Hooks()
+        hooks.register('after_response', lambda data: 1 / 0)
+        api = make_api(hooks, [make_response()])
+        self.assertEqual(api._get(URL).id, 12)
+
+    def test_listener_registered_during_request(self):
+        hooks = Hooks()
+        events = []
+
+        def respond(*args, **kwargs):
+            # Another thread starts listening while the request is in flight.
+            hooks.register('after_response', events.append)
+            return make_response()
+
+        api = make_api(hooks, respond)
+        self.assertEqual(api._get(URL).id, 12)
+        self.assertEqual(events, [])
+        api.session.get.side_effect = [make_response()]
+        api._get(URL)
+        self.assertEqual(len(events), 1)
+
+    def test_unregister_while_emitting(self):
+        hooks = Hooks()
+        calls = []
+
+        def once(data):
+            calls.append('once')
+            hooks.unregister('after_response', once)
+
+        hooks.register('after_response', once)
+        hooks.register('after_response', lambda data: calls.append('always'))
+        hooks.emit('after_response', {})
+        hooks.emit('after_response', {})
+        self.assertEqual(calls, ['once', 'always', 'always'])
+
+    def test_concurrent_registration(self):
+        hooks = Hooks()
+        callbacks = [lambda data: None for _ in range(200)]
+
+        def churn(callback):
+            hooks.register('after_response', callback)
+            hooks.emit('after_response', {})
+            hooks.unregister('after_response', callback)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(churn, callbacks))
+        self.assertFalse(hooks)
+        self.assertFalse(hooks.listening('after_response'))
+
+    def test_unknown_event_raises(self):
+        with self.assertRaises(ZenpyException):
+            self.hooks.register('on_everything', print)
+
+    def test_no_hooks_is_falsy(self):
+        self.assertFalse(Hooks())
+        self.assertTrue(self.hooks)
+
+
+class TestEndpointTemplate(TestCase):
+    def test_ids_and_query_removed(self):
+        self.assertEqual(
+            endpoint_template('https://x.zendesk.com/api/v2/tickets/1/comments.json?page=2'),
+            '/api/v2/tickets/{id}/comments.json')
+        self.assertEqual(endpoint_template('https://x.zendesk.com/api/v2/users/show_many.json?ids=1,2'),
+                         '/api/v2/users/show_many.json')
+
+
+class TestCollectors(TestCase):
+    def test_histogram_percentiles(self):
+        histogram = Histogram((1, 2, 5, 10))
+        for value in (0.5, 1.5, 1.5, 4, 20):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.percentile(50), 2)
+        self.assertEqual(histogram.percentile(100), 20)
+        self.assertEqual(histogram.min, 0.5)
+
+    def test_metrics_collector(self):
+        hooks = Hooks()
+        collector = MetricsCollector()
+        hooks.subscribe(collector)
+        api = make_api(hooks, [make_response(), make_response()])
+        api._get(URL)
+        api._get(URL)
+        summary = collector.summary()['/api/v2/tickets/{id}.json']
+        self.assertEqual(summary['latency']['count'], 2)
+        self.assertEqual(summary['deserialize']['count'], 2)
+        totals = collector.totals()
+        self.assertEqual(totals['requests'], 2)
+        self.assertEqual(totals['retries'], 0)
+
+    def test_open_telemetry_adapter(self):
+        meter = MagicMock()
+        meter.create_histogram.side_effect = lambda *args, **kwargs: MagicMock()
+        hooks = Hooks()
+        adapter = OpenTelemetryAdapter(meter=meter)
+        hooks.subscribe(adapter)
+        api = make_api(hooks, [make_response()])
+        api._get(URL)
+        attributes = adapter.request_duration.record.call_args[1]['attributes']
+        self.assertEqual(attributes, {'http.request.method': 'GET',
+                                      'url.template': '/api/v2/tickets/{id}.json',
+                                      'http.response.status_code': 200})
+        self.assertTrue(adapter.deserialize_duration.record.called)
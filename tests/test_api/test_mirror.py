@@ -0,0 +1,106 @@
+"""
+Tests for the local SQLite mirror fed by incremental exports.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api_objects import Ticket, User
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.mirror import Mirror
+
+
+class TestMirror(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None, incremental_page_size=10)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('users', 5)
+        self.server.populate('tickets', 25, requester_id=3)
+        self.server.populate('organizations', 4)
+        self.server.populate('groups', 3)
+        self.zenpy_client = self.server.client()
+        self.mirror = Mirror()
+
+    def update(self, resource, object_id, **fields):
+        self.server.dispatch('PUT', '/api/v2/{}/{}.json'.format(resource, object_id),
+                             {resource[:-1]: fields})
+
+    def test_sync_tickets(self):
+        stats = self.mirror.sync(self.zenpy_client, 'ticket')
+        self.assertEqual(stats, dict(pages=3, objects=25))
+        self.assertEqual(self.mirror.count('ticket'), 25)
+        self.assertEqual(self.mirror.get('ticket', 7)['subject'], 'Ticket 7')
+        self.assertIsNone(self.mirror.get('ticket', 99))
+
+    def test_incremental_resync(self):
+        self.mirror.sync(self.zenpy_client, 'ticket')
+        self.update('tickets', 7, subject='Changed')
+        self.server.populate('tickets', 1)
+        requests_before = self.server.request_count
+        stats = self.mirror.sync(self.zenpy_client, 'ticket')
+        self.assertEqual(stats['objects'], 2)
+        self.assertEqual(self.server.request_count - requests_before, 1)
+        self.assertEqual(self.mirror.get('ticket', 7)['subject'], 'Changed')
+        self.assertEqual(self.mirror.count('ticket'), 26)
+
+    def test_older_versions_ignored(self):
+        self.mirror.upsert('ticket', [dict(id=1, updated_at='2021-01-01T00:00:00Z', subject='new')])
+        self.mirror.upsert('ticket', [dict(id=1, updated_at='2020-01-01T00:00:00Z', subject='old')])
+        self.assertEqual(self.mirror.get('ticket', 1)['subject'], 'new')
+
+    def test_tombstones(self):
+        self.mirror.sync(self.zenpy_client, 'ticket')
+        self.mirror.sync(self.zenpy_client, 'user')
+        self.update('tickets', 4, status='deleted')
+        self.update('users', 2, active=False)
+        self.mirror.sync(self.zenpy_client, 'ticket')
+        self.mirror.sync(self.zenpy_client, 'user')
+        self.assertIsNone(self.mirror.get('ticket', 4))
+        self.assertTrue(self.mirror.is_deleted('ticket', 4))
+        self.assertFalse(self.mirror.is_deleted('ticket', 5))
+        self.assertTrue(self.mirror.is_deleted('user', 2))
+        self.assertEqual(self.mirror.count('ticket'), 24)
+        self.assertEqual(self.mirror.count('ticket', include_deleted=True), 25)
+
+    def test_time_based_sync(self):
+        self.mirror.sync(self.zenpy_client, 'organization')
+        self.assertEqual(self.mirror.count('organization'), 4)
+        self.assertIsNotNone(self.mirror.sync_state('organization')[1])
+
+    def test_group_refresh(self):
+        self.mirror.sync(self.zenpy_client, 'group')
+        self.server.dispatch('DELETE', '/api/v2/groups/2.json', None)
+        self.mirror.sync(self.zenpy_client, 'group')
+        self.assertEqual([g['id'] for g in self.mirror.objects('group')], [1, 3])
+        self.assertTrue(self.mirror.is_deleted('group', 2))
+
+    def test_resume_after_restart(self):
+        fd, path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        Mirror(path).sync(self.zenpy_client, 'ticket')
+        requests_before = self.server.request_count
+        stats = Mirror(path).sync(self.zenpy_client, 'ticket')
+        self.assertEqual(stats['objects'], 0)
+        self.assertEqual(self.server.request_count - requests_before, 1)
+
+    def test_attach_serves_cache_lookups(self):
+        self.mirror.sync(self.zenpy_client, 'ticket')
+        self.mirror.sync(self.zenpy_client, 'user')
+        zenpy_client = self.server.client()
+        self.mirror.attach(zenpy_client)
+        requests_before = self.server.request_count
+        ticket = zenpy_client.tickets(id=5)
+        self.assertIsInstance(ticket, Ticket)
+        self.assertIsInstance(ticket.requester, User)
+        self.assertEqual(ticket.requester.name, 'User 3')
+        self.assertEqual(self.server.request_count, requests_before)
+
+    def test_unknown_type(self):
+        with self.assertRaises(ZenpyException):
+            Mirror(object_types=('ticket', 'macro'))
+        with self.assertRaises(ZenpyException):
+            Mirror(object_types=('ticket',)).sync(self.zenpy_client, 'user')
@@ -0,0 +1,126 @@
+"""
+Tests for raw incremental pages and the NDJSON export sink.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipUnless
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.exception import RateLimitError, ZenpyException
+from zenpy.lib.ndjson import NDJSONSink, export_ndjson
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TestNDJSONExport(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None, incremental_page_size=10)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('tickets', 45)
+        self.server.populate('organizations', 12)
+        self.zenpy_client = self.server.client()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def read_gzip(self, paths):
+        records = []
+        for path in paths:
+            with gzip.open(path, 'rt') as f:
+                records.extend(json.loads(line) for line in f)
+        return records
+
+    def test_incremental_pages_are_raw(self):
+        pages = list(self.zenpy_client.tickets.incremental_pages(start_time=0))
+        self.assertEqual([len(page['tickets']) for page in pages], [10, 10, 10, 10, 5])
+        self.assertIsInstance(pages[0]['tickets'][0], dict)
+        self.assertEqual(len(self.zenpy_client.cache.mapping['ticket']), 0)
+
+    def test_incremental_pages_resume_from_cursor(self):
+        pages = list(self.zenpy_client.tickets.incremental_pages(start_time=0))
+        pages = list(self.zenpy_client.tickets.incremental_pages(cursor=pages[3]['after_cursor']))
+        self.assertEqual([t['id'] for t in pages[0]['tickets']], [41, 42, 43, 44, 45])
+
+    def test_incremental_pages_arguments(self):
+        with self.assertRaises(ValueError):
+            self.zenpy_client.tickets.incremental_pages()
+        with self.assertRaises(ValueError):
+            self.zenpy_client.tickets.incremental_pages(cursor='0_0', paginate_by_time=True)
+
+    def test_export_rotates_files(self):
+        with NDJSONSink(self.directory, 'tickets', max_records=20) as sink:
+            pages = self.zenpy_client.tickets.incremental_pages(start_time=0)
+            state = export_ndjson(pages, sink)
+        self.assertEqual(state['records'], 45)
+        self.assertEqual(state['pages'], 5)
+        self.assertEqual(list(self.zenpy_client.tickets.incremental_pages(
+            cursor=state['after_cursor']))[0]['tickets'], [])
+        self.assertEqual([os.path.basename(p) for p in sink.files],
+                         ['tickets-00001.ndjson.gz', 'tickets-00002.ndjson.gz',
+                          'tickets-00003.ndjson.gz'])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         [os.path.basename(p) for p in sink.files])
+        records = self.read_gzip(sink.files)
+        self.assertEqual([r['id'] for r in records], list(range(1, 46)))
+
+    def test_time_based_export(self):
+        with NDJSONSink(self.directory, 'organizations', compression=None, max_bytes=1) as sink:
+            state = export_ndjson(self.zenpy_client.organizations.incremental_pages(start_time=0),
+                                  sink)
+        self.assertEqual(state['records'], 12)
+        self.assertIsNotNone(state['end_time'])
+        self.assertEqual(len(sink.files), 12)
+
+    def test_fetch_errors_raised(self):
+        self.server.throttle(count=5)
+        zenpy_client = self.server.client(raise_on_ratelimit=True)
+        with NDJSONSink(self.directory, 'tickets') as sink:
+            with self.assertRaises(RateLimitError):
+                export_ndjson(zenpy_client.tickets.incremental_pages(start_time=0), sink)
+
+    def test_error_discards_incomplete_file(self):
+        with self.assertRaises(ValueError):
+            with NDJSONSink(self.directory, 'tickets', max_records=3) as sink:
+                for record_id in range(5):
+                    sink.write(dict(id=record_id))
+                raise ValueError('export failed')
+        self.assertEqual(os.listdir(self.directory), ['tickets-00001.ndjson.gz'])
+        self.assertEqual([r['id'] for r in self.read_gzip(sink.files)], [0, 1, 2])
+
+    def test_fetch_error_state_resumes_after_completed_files(self):
+        state = dict()
+        pages = self.zenpy_client.tickets.incremental_pages(start_time=0)
+
+        def failing_pages():
+            for number, page in enumerate(pages):
+                if number == 3:
+                    raise ValueError('fetch failed')
+                yield page
+
+        with self.assertRaises(ValueError):
+            with NDJSONSink(self.directory, 'tickets', max_records=20) as sink:
+                export_ndjson(failing_pages(), sink, state=state)
+        # 30 records were written, the file holding the last 10 is discarded.
+        self.assertEqual([r['id'] for r in self.read_gzip(sink.files)], list(range(1, 21)))
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith('.part')])
+        resumed = list(self.zenpy_client.tickets.incremental_pages(cursor=state['after_cursor']))
+        self.assertEqual(resumed[0]['tickets'][0]['id'], 21)
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ZenpyException):
+            NDJSONSink(self.directory, 'tickets', compression='lzma')
+
+    @skipUnless(zstandard, 'zstandard is not installed')
+    def test_zstd(self):
+        with NDJSONSink(self.directory, 'tickets', compression='zstd') as sink:
+            export_ndjson(self.zenpy_client.tickets.incremental_pages(start_time=0), sink)
+        with open(sink.files[0], 'rb') as f:
+            content = zstandard.ZstdDecompressor().stream_reader(f).read()
+        self.assertEqual(len(content.splitlines()), 45)
@@ -0,0 +1,74 @@
+"""
+Tests for remembering lookups that Zendesk answered with RecordNotFound.
+"""
+
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api_objects import User
+from zenpy.lib.exception import RecordNotFoundException
+
+
+class NegativeCacheTestCase(TestCase):
+    client_kwargs = dict()
+
+    def setUp(self):
+        self.server = FakeZendesk()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('users', 2)
+        self.server.populate('tickets', 3, assignee_id=404)
+        self.zenpy_client = self.server.client(**self.client_kwargs)
+
+    def user_requests(self, user_id):
+        return [entry for entry in self.server.request_log
+                if entry[1].endswith('/users/{}.json'.format(user_id))]
+
+
+class TestNegativeCache(NegativeCacheTestCase):
+    def test_deleted_reference_requested_once(self):
+        for ticket in self.zenpy_client.tickets():
+            with self.assertRaises(RecordNotFoundException):
+                ticket.assignee
+        self.assertEqual(len(self.user_requests(404)), 1)
+        stats = self.zenpy_client.cache.negative.stats()
+        self.assertEqual(stats['stored'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_existing_objects_unaffected(self):
+        self.assertEqual(self.zenpy_client.users(id=1).id, 1)
+        self.assertEqual(len(self.zenpy_client.cache.negative), 0)
+
+    def test_expires(self):
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.users(id=404)
+        self.zenpy_client.cache.negative.cache.expire(time=float('inf'))
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.users(id=404)
+        self.assertEqual(len(self.user_requests(404)), 2)
+
+    def test_cached_object_replaces_not_found(self):
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.users(id=404)
+        self.zenpy_client.cache.add(User(id=404, name='Restored'))
+        self.assertEqual(len(self.zenpy_client.cache.negative), 0)
+        self.assertEqual(self.zenpy_client.users(id=404).name, 'Restored')
+
+    def test_purge_cache_forgets_not_found(self):
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.users(id=404)
+        self.zenpy_client.cache.purge_cache('user')
+        with self.assertRaises(RecordNotFoundException):
+            self.zenpy_client.users(id=404)
+        self.assertEqual(len(self.user_requests(404)), 2)
+
+
+class TestNegativeCacheDisabled(NegativeCacheTestCase):
+    client_kwargs = dict(cache_policy={'negative_ttl': 0})
+
+    def test_every_lookup_requested(self):
+        self.assertIsNone(self.zenpy_client.cache.negative)
+        for _ in range(3):
+            with self.assertRaises(RecordNotFoundException):
+                self.zenpy_client.users(id=404)
+        self.assertEqual(len(self.user_requests(404)), 3)
@@ -0,0 +1,98 @@
+"""
+Tests for extracting columns from result pages without building objects.
+"""
+
+from array import array
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api_objects import TicketField
+from zenpy.lib.columnar import project
+from zenpy.lib.exception import ZenpyException
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PAGES = [
+    {'tickets': [
+        {'id': 1, 'status': 'open', 'assignee_id': 10, 'has_incidents': False,
+         'updated_at': '2024-03-01T10:00:00Z',
+         'custom_fields': [{'id': 7, 'value': '3'}, {'id': 8, 'value': 'x'}]},
+        {'id': 2, 'status': 'solved', 'assignee_id': 11, 'has_incidents': True,
+         'updated_at': '2024-03-01T11:00:00Z', 'custom_fields': [{'id': 7, 'value': None}]},
+    ]},
+    {'tickets': [
+        {'id': 3, 'status': 'new', 'assignee_id': None, 'updated_at': None},
+    ]},
+]
+
+
+class TestProject(TestCase):
+    def test_columns(self):
+        columns = project(PAGES, ['id', 'status', 'has_incidents'], 'ticket', use_numpy=False)
+        self.assertEqual(columns['id'], array('q', [1, 2, 3]))
+        self.assertEqual(columns['status'], ['open', 'solved', 'new'])
+        self.assertEqual(columns['has_incidents'].tolist()[:2], [0.0, 1.0])
+
+    def test_missing_values_widen_to_float(self):
+        columns = project(PAGES, ['assignee_id'], 'ticket', use_numpy=False)
+        self.assertEqual(columns['assignee_id'].typecode, 'd')
+        self.assertEqual(columns['assignee_id'][:2].tolist(), [10.0, 11.0])
+        self.assertNotEqual(columns['assignee_id'][2], columns['assignee_id'][2])
+
+    def test_timestamps_as_unix_seconds(self):
+        columns = project(PAGES, ['updated_at'], 'ticket', use_numpy=False)
+        self.assertEqual(columns['updated_at'][:2].tolist(), [1709287200.0, 1709290800.0])
+
+    def test_typed_custom_fields(self):
+        fields = [TicketField(id=7, type='integer'), TicketField(id=8, type='text')]
+        columns = project(PAGES, ['id'], 'ticket', custom_fields=fields, use_numpy=False)
+        self.assertEqual(columns['custom_field_7'][0], 3.0)
+        self.assertEqual(columns['custom_field_8'], ['x', None, None])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ZenpyException):
+            project(PAGES, ['not_a_field'], 'ticket')
+        columns = project(PAGES, [('not_a_field', 'string')], 'ticket', use_numpy=False)
+        self.assertEqual(columns['not_a_field'], [None, None, None])
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_numpy(self):
+        columns = project(PAGES, ['id', 'has_incidents', 'updated_at'], 'ticket')
+        self.assertEqual(columns['id'].dtype, numpy.int64)
+        self.assertEqual(columns['id'].tolist(), [1, 2, 3])
+        self.assertEqual(columns['updated_at'].dtype, numpy.dtype('datetime64[s]'))
+        self.assertEqual(str(columns['updated_at'][0]), '2024-03-01T10:00:00')
+        self.assertTrue(numpy.isnat(columns['updated_at'][2]))
+
+
+class TestGeneratorProject(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('tickets', 250, status='open')
+        self.zenpy_client = self.server.client()
+
+    def test_project_all_pages(self):
+        columns = self.zenpy_client.tickets().project(['id', 'status'], use_numpy=False)
+        self.assertEqual(columns['id'].tolist(), list(range(1, 251)))
+        self.assertEqual(set(columns['status']), {'open'})
+
+    def test_no_objects_built_after_first_page(self):
+        generator = self.zenpy_client.tickets()
+        mapping = self.zenpy_client.tickets._object_mapping
+        with patch.object(mapping, 'object_from_json', wraps=mapping.object_from_json) as build:
+            columns = generator.project(['id'], use_numpy=False)
+        self.assertEqual(len(columns['id']), 250)
+        self.assertEqual(build.call_count, 0)
+        self.assertEqual(list(generator), [])
+
+    def test_incremental_pages(self):
+        pages = self.zenpy_client.tickets.incremental_pages(start_time=0, per_page=100)
+        columns = project(pages, ['id', 'updated_at'], 'ticket', use_numpy=False)
+        self.assertEqual(len(columns['id']), 250)
+        self.assertEqual(len(columns['updated_at']), 250)
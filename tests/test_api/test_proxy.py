@@ -89,6 +89,62 @@ class TestProxyList(TestCase):
         item = self.proxy_list[0]
         self.assertTrue(callable(item._dirty_callback))
 
+    def test_read_not_dirty(self):
+        self.proxy_list.append({'id': 1})
+        self.proxy_list._clean_dirty()
+        self.test_object._clean_dirty()
+        self.proxy_list[-1]
+        list(self.proxy_list)
+        self.proxy_list[0:2]
+        self.assertFalse(self.proxy_list._dirty)
+        self.assertNotIn(self.attribute_name, self.test_object.to_dict(serialize=True))
+
+    def test_wrapped_once(self):
+        self.proxy_list.append({'id': 1})
+        first = self.proxy_list[-1]
+        self.assertIs(self.proxy_list[-1], first)
+        self.assertIs(list(self.proxy_list)[-1], first)
+
+    def test_slice_wrapped(self):
+        self.proxy_list.append([])
+        items = self.proxy_list[1:]
+        self.assertIsInstance(items[0], ProxyList)
+        items[0].append(1)
+        self._assert_dirty()
+
+    def test_nested_modification_after_iteration(self):
+        self.proxy_list.append({'source': {'from': {}}})
+        self.proxy_list._clean_dirty()
+        self.test_object._clean_dirty()
+        for item in self.proxy_list:
+            pass
+        self.proxy_list[-1]['source']['from']['name'] = 'changed'
+        self._assert_dirty()
+
+    def test_slice_returns_proxy(self):
+        self.proxy_list.append({'id': 1})
+        self.proxy_list._clean_dirty()
+        self.test_object._clean_dirty()
+        items = self.proxy_list[1:]
+        self.assertIsInstance(items, ProxyList)
+        items[0]['id'] = 2
+        self._assert_dirty()
+
+    def test_child_moved_between_objects(self):
+        first = Ticket(id=1, custom_fields=ProxyList([{'id': 5, 'value': 'a'}]))
+        second = Ticket(id=2, custom_fields=ProxyList([]))
+        for ticket in (first, second):
+            ticket._clean_dirty()
+            ticket.custom_fields._clean_dirty()
+        field = first.custom_fields[0]
+        second.custom_fields.append(field)
+        second._clean_dirty()
+        second.custom_fields._clean_dirty()
+        field['value'] = 'changed'
+        self.assertEqual(second.to_dict(serialize=True)['custom_fields'],
+                         [{'id': 5, 'value': 'changed'}])
+        self.assertNotIn('custom_fields', first.to_dict(serialize=True))
+
     def _assert_dirty(self):
         self.assertTrue(self.proxy_list._dirty)
         self.assertIn(self.attribute_name, self.test_object.to_dict(serialize=True))
@@ -144,6 +200,17 @@ class TestProxyDict(TestCase):
         comment = self.proxy_dict["comment"]
         self.assertTrue(callable(comment._dirty_callback))
 
+    def test_proxy_dict_read_not_dirty(self):
+        self.proxy_dict["list"]
+        self.proxy_dict["dict"]
+        self.assertFalse(self.proxy_dict._dirty)
+        self.assertNotIn(self.attribute_name, self.test_object.to_dict(serialize=True))
+
+    def test_proxy_dict_wrapped_once(self):
+        self.assertIs(self.proxy_dict["list"], self.proxy_dict["list"])
+        self.proxy_dict["list"].append(5)
+        self._assert_dirty()
+
     def _assert_dirty(self):
         self.assertTrue(self.proxy_dict._dirty)
         self.assertIn(self.attribute_name, self.test_object.to_dict(serialize=True))
@@ -0,0 +1,118 @@
+"""
+Tests for canonical URL building and coalescing of identical GET requests.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.coalesce import RequestCoalescer
+from zenpy.lib.endpoint import EndpointFactory, Url
+from zenpy.lib.util import canonical_url
+
+
+class TestCanonicalUrls(TestCase):
+    def test_params_sorted(self):
+        first = Url('api/v2/users.json', params=dict(role='agent', page=2, per_page=10))
+        second = Url('api/v2/users.json', params=dict(per_page=10, page=2, role='agent'))
+        first.netloc = second.netloc = 'x.zendesk.com'
+        self.assertEqual(first.build(), second.build())
+        self.assertEqual(first.build(),
+                         'https://x.zendesk.com/api/v2/users.json?page=2&per_page=10&role=agent')
+
+    def test_params_encoded(self):
+        url = Url('api/v2/users/search.json', params={'external_id': 'a b#1'}, netloc='x.zendesk.com')
+        self.assertEqual(url.build(),
+                         'https://x.zendesk.com/api/v2/users/search.json?external_id=a%20b%231')
+
+    def test_separators_in_values_encoded(self):
+        url = Url('x', params={'external_id': 'a b&c=d+e'})
+        self.assertEqual(url.query, 'external_id=a%20b%26c%3Dd%2Be')
+
+    def test_lists_joined_after_encoding(self):
+        endpoint = EndpointFactory('users')(external_ids=['a b&c', 'd,e=f+g'])
+        self.assertEqual(Url('x', params=endpoint.params).query,
+                         'external_ids=a%20b%26c,d%2Ce%3Df%2Bg')
+
+    def test_repeated_keys(self):
+        endpoint = EndpointFactory('users')(role=['admin', 'end user'])
+        self.assertEqual(Url('x', params=endpoint.params).query,
+                         'role[]=admin&role[]=end%20user')
+
+    def test_quoted_values_unchanged(self):
+        endpoint = EndpointFactory('search')(subject='some thing', type='ticket')
+        query = Url('x', params=endpoint.params).query
+        self.assertIn('query=subject%3A%22some%20thing%22%20type%3Aticket', query.split('&'))
+
+    def test_canonical_url(self):
+        url = 'https://x.zendesk.com/api/v2/tickets.json'
+        self.assertEqual(canonical_url(url), url)
+        self.assertEqual(canonical_url(url, dict(b=1, a=2)), url + '?a=2&b=1')
+
+
+class TestRequestCoalescer(TestCase):
+    def test_concurrent_calls_share_result(self):
+        coalescer = RequestCoalescer()
+        release = threading.Event()
+        calls = []
+
+        class Response(object):
+            content = b'{}'
+
+        def slow_call():
+            calls.append(1)
+            release.wait(5)
+            return Response()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(coalescer.call, 'key', slow_call) for _ in range(5)]
+            while coalescer.stats()['coalesced'] < 4:
+                threading.Event().wait(0.01)
+            release.set()
+            responses = [future.result() for future in futures]
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+        self.assertEqual(coalescer.stats(), dict(calls=1, coalesced=4, in_flight=0))
+
+    def test_error_shared_and_not_kept(self):
+        coalescer = RequestCoalescer()
+
+        def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            coalescer.call('key', fail)
+        self.assertEqual(coalescer.call('key', lambda: 'response'), 'response')
+        self.assertEqual(coalescer.stats()['calls'], 2)
+
+
+class TestClientCoalescing(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None, latency=0.2)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('users', 1)
+
+    def fetch_concurrently(self, zenpy_client, threads=8):
+        barrier = threading.Barrier(threads)
+
+        def fetch(_):
+            barrier.wait()
+            return zenpy_client.users(id=1)
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(fetch, range(threads)))
+
+    def test_identical_gets_coalesced(self):
+        zenpy_client = self.server.client(disable_cache=True, coalesce_requests=True)
+        users = self.fetch_concurrently(zenpy_client)
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(set(user.name for user in users), {'User 1'})
+        # Each caller gets its own object.
+        self.assertEqual(len(set(id(user) for user in users)), 8)
+
+    def test_disabled_by_default(self):
+        zenpy_client = self.server.client(disable_cache=True)
+        self.fetch_concurrently(zenpy_client, threads=3)
+        self.assertEqual(self.server.request_count, 3)
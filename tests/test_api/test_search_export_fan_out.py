@@ -0,0 +1,92 @@
+"""
+Tests for SearchExportApi.fan_out() and the helpers it is built on.
+"""
+
+from datetime import datetime, timedelta
+from itertools import islice
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytz
+
+from test_api.fixtures.api import make_api
+from zenpy.lib.api import SearchExportApi
+from zenpy.lib.api_objects import Group, Organization, Ticket, User
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import iterate_concurrently, split_time_window
+
+
+CLASSES = dict(ticket=Ticket, user=User, organization=Organization, group=Group)
+
+
+def fake_export(query, type, **kwargs):
+    return [CLASSES[type](id=i) for i in range(25)]
+
+
+class TestFanOut(TestCase):
+    def setUp(self):
+        self.api = make_api(SearchExportApi)
+
+    def test_merges_all_types(self):
+        with patch.object(SearchExportApi, '__call__', side_effect=fake_export):
+            results = list(self.api.fan_out('query'))
+        self.assertEqual(len(results), 100)
+        for zenpy_class in CLASSES.values():
+            self.assertEqual(
+                len([r for r in results if isinstance(r, zenpy_class)]), 25)
+
+    def test_sinks_receive_their_type(self):
+        received = dict((t, []) for t in CLASSES)
+        sinks = dict((t, received[t].append) for t in CLASSES)
+        with patch.object(SearchExportApi, '__call__', side_effect=fake_export):
+            counts = self.api.fan_out('query', sinks=sinks)
+        self.assertEqual(counts, dict((t, 25) for t in CLASSES))
+        for search_type, objects in received.items():
+            self.assertTrue(all(isinstance(o, CLASSES[search_type]) for o in objects))
+
+    def test_missing_sink_raises(self):
+        with self.assertRaises(ZenpyException):
+            self.api.fan_out('query', types=('ticket', 'user'), sinks={'ticket': print})
+
+    def test_partitions_split_each_type(self):
+        start = datetime(2020, 1, 1, tzinfo=pytz.utc)
+        with patch.object(SearchExportApi, '__call__', side_effect=fake_export) as call:
+            list(self.api.fan_out('query', types=('ticket',), partitions=4,
+                                  start_time=start, end_time=start + timedelta(days=4)))
+        windows = sorted(c[1]['created_between'] for c in call.call_args_list)
+        self.assertEqual(windows, [list(w) for w in split_time_window(
+            start, start + timedelta(days=4), 4)])
+
+
+class TestIterateConcurrently(TestCase):
+    def test_propagates_producer_errors(self):
+        def failing():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            list(iterate_concurrently([lambda: range(10), failing], max_workers=2))
+
+    def test_consumer_can_stop_early(self):
+        endless = [lambda: iter(int, 1) for _ in range(3)]
+        items = list(islice(iterate_concurrently(endless, 3, queue_size=5), 20))
+        self.assertEqual(len(items), 20)
+
+
+class TestSplitTimeWindow(TestCase):
+    def test_windows_cover_every_second_once(self):
+        start = datetime(2020, 1, 1)
+        end = start + timedelta(seconds=100)
+        windows = split_time_window(start, end, 3)
+        covered = []
+        for lo, hi in windows:
+            second = lo + timedelta(seconds=1)
+            while second < hi:
+                covered.append(second)
+                second += timedelta(seconds=1)
+        self.assertEqual(len(covered), len(set(covered)))
+        self.assertEqual(len(covered), 99)
+
+    def test_short_window_is_not_split(self):
+        start = datetime(2020, 1, 1)
+        self.assertEqual(split_time_window(start, start + timedelta(seconds=1), 4),
+                         [(start, start + timedelta(seconds=1))])
@@ -0,0 +1,87 @@
+"""
+Tests for SearchApi.partitioned().
+"""
+
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytz
+
+from test_api.fixtures.api import make_api
+from zenpy.lib.api import SearchApi
+from zenpy.lib.api_objects import Ticket
+from zenpy.lib.exception import ZenpyException
+
+
+class FakeSearch(object):
+    """ Answers count() and search calls from an in memory list of tickets. """
+
+    def __init__(self, tickets, limit):
+        self.tickets = tickets
+        self.limit = limit
+        self.searched_windows = []
+
+    def matching(self, kwargs):
+        start, end = kwargs['created_between']
+        return [t for t in self.tickets if start < t.created_at < end]
+
+    def count(self, query, **kwargs):
+        return len(self.matching(kwargs))
+
+    def search(self, query, **kwargs):
+        self.searched_windows.append(kwargs['created_between'])
+        return self.matching(kwargs)[:self.limit]
+
+
+class TestPartitionedSearch(TestCase):
+    def setUp(self):
+        self.api = make_api(SearchApi)
+        self.start = datetime(2020, 1, 1, tzinfo=pytz.utc)
+        self.tickets = [
+            Ticket(id=i, created_at=self.start + timedelta(seconds=i * 7))
+            for i in range(1, 501)
+        ]
+
+    def run_search(self, limit=50, **kwargs):
+        fake = FakeSearch(self.tickets, limit)
+        with patch.object(SearchApi, 'SEARCH_RESULT_LIMIT', limit), \
+                patch.object(SearchApi, 'count', side_effect=fake.count), \
+                patch.object(SearchApi, '__call__', side_effect=fake.search):
+            results = list(self.api.partitioned(
+                type='ticket',
+                start_time=self.start,
+                end_time=self.start + timedelta(days=1),
+                **kwargs))
+        return fake, results
+
+    def test_returns_all_results(self):
+        _, results = self.run_search()
+        self.assertEqual(sorted(t.id for t in results),
+                         [t.id for t in self.tickets])
+
+    def test_each_window_fits_the_limit(self):
+        fake, _ = self.run_search(limit=50)
+        for window in fake.searched_windows:
+            self.assertLessEqual(fake.count(None, created_between=window), 50)
+
+    def test_results_are_deduplicated(self):
+        self.tickets.extend(self.tickets[:10])
+        _, results = self.run_search(limit=1000)
+        self.assertEqual(len(results), 500)
+
+    def test_unsplittable_window_returns_what_it_can(self):
+        self.tickets = [
+            Ticket(id=i, created_at=self.start + timedelta(seconds=5))
+            for i in range(1, 21)
+        ]
+        _, results = self.run_search(limit=10)
+        self.assertEqual(len(results), 10)
+
+    def test_rejects_unknown_partition_attribute(self):
+        with self.assertRaises(ZenpyException):
+            list(self.api.partitioned(partition_by='solved'))
+
+    def test_rejects_between_kwarg(self):
+        with self.assertRaises(ZenpyException):
+            list(self.api.partitioned(created_between=[self.start, self.start]))
@@ -0,0 +1,88 @@
+"""
+Tests sharing a single Zenpy client between threads.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from test_api.fixtures.fake_zendesk import FakeZendesk
+from zenpy.lib.api import BaseApi
+from zenpy.lib.api_objects import Ticket
+
+
+def make_base_api(**kwargs):
+    config = dict(subdomain="test", session=MagicMock(), timeout=60, ratelimit=None,
+                  ratelimit_budget=None, ratelimit_request_interval=10,
+                  cache=MagicMock(), domain="zendesk.com")
+    config.update(kwargs)
+    return BaseApi(**config)
+
+
+class TestDirtyObjectPerThread(TestCase):
+    def test_dirty_object_is_not_shared(self):
+        api = make_base_api()
+        mine, theirs = Ticket(id=1), Ticket(id=2)
+        mine.subject = theirs.subject = 'changed'
+        serialized = threading.Event()
+        cleaned = threading.Event()
+
+        def other_thread():
+            api._serialize(theirs)
+            serialized.set()
+            cleaned.wait(5)
+            api._clean_dirty_objects()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        api._serialize(mine)
+        serialized.wait(5)
+        api._clean_dirty_objects()
+        self.assertFalse(mine._dirty_attributes)
+        self.assertTrue(theirs._dirty_attributes)
+        cleaned.set()
+        thread.join()
+        self.assertFalse(theirs._dirty_attributes)
+
+    def test_ratelimit_budget(self):
+        api = make_base_api(ratelimit_budget=10001)
+
+        def spend(_):
+            for _ in range(1000):
+                api.check_ratelimit_budget(1)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(spend, range(8)))
+        self.assertEqual(api.ratelimit_budget, 2001)
+
+
+class TestSharedClient(TestCase):
+    def setUp(self):
+        self.server = FakeZendesk(rate_limit=None)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.server.populate('tickets', 80)
+        self.zenpy_client = self.server.client(max_concurrency=8)
+
+    def test_concurrent_updates(self):
+        tickets = list(self.zenpy_client.tickets(cursor_pagination=100))
+
+        def update(ticket):
+            ticket.subject = 'Updated {}'.format(ticket.id)
+            self.zenpy_client.tickets.update(ticket)
+            return ticket
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            updated = list(executor.map(update, tickets))
+        self.assertTrue(all(not ticket._dirty_attributes for ticket in updated))
+        self.assertEqual([t['subject'] for t in self.server.objects('tickets')],
+                         ['Updated {}'.format(i) for i in range(1, 81)])
+
+    def test_concurrent_cached_reads(self):
+        def read(ticket_id):
+            return self.zenpy_client.tickets(id=ticket_id % 20 + 1).id
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(read, range(200)))
+        self.assertEqual(ids, [i % 20 + 1 for i in range(200)])
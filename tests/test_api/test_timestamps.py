@@ -0,0 +1,55 @@
+"""
+Tests for parsing the timestamps of Zenpy objects.
+"""
+
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+import dateutil.parser
+
+from zenpy.lib import util
+from zenpy.lib.api_objects import Ticket
+from zenpy.lib.util import parse_datetime
+
+
+class TestParseDatetime(TestCase):
+    def test_matches_dateutil(self):
+        for value in ('2024-03-01T10:20:30Z', '2024-03-01T10:20:30.123Z',
+                      '2024-03-01T10:20:30.12Z', '2024-03-01T10:20:30+10:00',
+                      '2024-03-01', 'March 1 2024 10:20'):
+            self.assertEqual(parse_datetime(value), dateutil.parser.parse(value), value)
+
+    def test_utc_is_timezone_aware(self):
+        parsed = parse_datetime('2024-03-01T10:20:30Z')
+        self.assertEqual(parsed.utcoffset().total_seconds(), 0)
+
+    def test_datetime_passed_through(self):
+        now = datetime.now()
+        self.assertIs(parse_datetime(now), now)
+
+
+class TestDateProperties(TestCase):
+    def test_parsed_once(self):
+        ticket = Ticket(updated_at='2024-03-01T10:20:30Z')
+        with patch('zenpy.lib.api_objects.parse_datetime', wraps=util.parse_datetime) as parse:
+            first = ticket.updated
+            self.assertIs(ticket.updated, first)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(first, datetime(2024, 3, 1, 10, 20, 30, tzinfo=first.tzinfo))
+
+    def test_reparsed_when_attribute_changes(self):
+        ticket = Ticket(updated_at='2024-03-01T10:20:30Z')
+        self.assertEqual(ticket.updated.day, 1)
+        ticket.updated_at = '2024-03-02T10:20:30Z'
+        self.assertEqual(ticket.updated.day, 2)
+
+    def test_unset(self):
+        self.assertIsNone(Ticket().due)
+
+    def test_not_serialized(self):
+        ticket = Ticket(id=1, created_at='2024-03-01T10:20:30Z')
+        ticket.created
+        self.assertNotIn('parsed_dates', ticket.to_dict())
+        self.assertNotIn('_parsed_dates', ticket.to_dict())
+        self.assertNotIn('parsed_dates', ticket.to_dict(serialize=True))
@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 
 from zenpy import ZenpyCache, ZenpyCacheManager
-from zenpy.lib.api_objects import Ticket
+from zenpy.lib.api_objects import Organization, Ticket, User
+from zenpy.lib.cache import CachePolicy, estimate_size, parse_size
 from zenpy.lib.exception import ZenpyCacheException
+from zenpy.lib.mapping import ZendeskObjectMapping
+from zenpy.lib.proxy import ProxyDict
 from zenpy.lib.util import get_object_type
 
 
@@ -39,6 +43,21 @@ class TestZenpyCache(TestCase):
         self.cache.set_maxsize(20)
         self.assertEqual(len(self.cache), num_objects)
 
+    def test_concurrent_access(self):
+        cache = ZenpyCache("TTLCache", 50, ttl=0.001)
+
+        def churn(offset):
+            for i in range(2000):
+                key = (offset + i) % 200
+                cache[key] = Ticket(id=key)
+                cache.get(key)
+                cache.pop(key + 1)
+                list(cache.items())
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(churn, range(8)))
+        self.assertLessEqual(len(cache), 50)
+
     def populate_cache(self, num_objects):
         for i in range(num_objects):
             self.cache[i] = Ticket(id=i)
@@ -66,7 +85,107 @@ class TestCacheManager(TestCase):
         self.cache.delete(zenpy_object)
         self.assertIs(self.cache.get(get_object_type(zenpy_object), cache_key), None)
 
+    def test_get_expired_object(self):
+        now = [0]
+        manager = ZenpyCacheManager()
+        manager.mapping['ticket'] = ZenpyCache('TTLCache', 10, ttl=30, timer=lambda: now[0])
+        manager.add(Ticket(id=1))
+        now[0] = 31
+        self.assertIsNone(manager.get('ticket', 1))
+
     def cache_item(self, zenpy_class=Ticket, **kwargs):
         zenpy_object = zenpy_class(**kwargs)
         self.cache.add(zenpy_object)
         return zenpy_object
+
+
+def make_user(user_id, notes_size):
+    return User(id=user_id, notes='x' * notes_size, user_fields=ProxyDict(plan='gold'))
+
+
+class TestEstimateSize(TestCase):
+    def test_grows_with_content(self):
+        small, large = make_user(1, 10), make_user(2, 10000)
+        self.assertGreater(estimate_size(large) - estimate_size(small), 9000)
+
+    def test_shared_api_not_counted(self):
+        user = make_user(1, 10)
+        size = estimate_size(user)
+        user.api = make_user(2, 100000)
+        self.assertEqual(estimate_size(user), size)
+
+
+class TestSizeAwareLRUCache(TestCase):
+    def test_evicts_largest_cold_item(self):
+        cache = ZenpyCache('SizeAwareLRUCache', 10, getsizeof=lambda user: len(user.notes), sample=3)
+        cache[1] = make_user(1, 2)
+        cache[2] = make_user(2, 6)
+        cache[3] = make_user(3, 1)
+        cache[4] = make_user(4, 3)
+        self.assertEqual(sorted(cache), [1, 3, 4])
+
+    def test_recently_used_kept(self):
+        cache = ZenpyCache('SizeAwareLRUCache', 3, sample=1)
+        for i in range(3):
+            cache[i] = make_user(i, 1)
+        cache.get(0)
+        cache[3] = make_user(3, 1)
+        self.assertEqual(sorted(cache), [0, 2, 3])
+
+
+class TestCachePolicy(TestCase):
+    def test_defaults_unchanged(self):
+        manager = ZenpyCacheManager(policy=CachePolicy())
+        self.assertEqual(manager.mapping['ticket'].impl_name, 'TTLCache')
+        self.assertEqual(manager.mapping['user'].maxsize, 10000)
+        self.assertFalse(manager.mapping['user'].measures_bytes)
+
+    def test_per_type_bytes(self):
+        policy = CachePolicy.from_dict({'user': {'max_bytes': '1K'}})
+        cache = ZenpyCacheManager(policy=policy).mapping['user']
+        self.assertEqual(cache.impl_name, 'SizeAwareLRUCache')
+        self.assertEqual(cache.maxsize, 1024)
+        self.assertTrue(cache.measures_bytes)
+
+    def test_from_env(self):
+        policy = CachePolicy.from_env({'ZENPY_CACHE_MAX_BYTES': '2M',
+                                       'ZENPY_CACHE_TICKET_FIELD_MAXSIZE': '50',
+                                       'ZENPY_CACHE_TICKET_TTL': '600',
+                                       'ZENPY_CACHE_USER_MAX_BYTES': '64KB'})
+        self.assertEqual(policy.max_bytes, 2 * 1024 * 1024)
+        self.assertEqual(policy.types['ticket_field']['maxsize'], 50)
+        self.assertEqual(policy.types['ticket']['ttl'], 600)
+        self.assertEqual(policy.types['user']['max_bytes'], 64 * 1024)
+
+    def test_negative_ttl_from_env(self):
+        policy = CachePolicy.from_env({'ZENPY_CACHE_NEGATIVE_TTL': '0'})
+        self.assertIsNone(policy.negative_ttl)
+        self.assertNotIn('negative', policy.types)
+        self.assertIsNone(ZenpyCacheManager(policy=policy).negative)
+        self.assertEqual(CachePolicy.from_env({}).negative_ttl, 30)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ZenpyCacheException):
+            parse_size('lots')
+
+    def test_global_budget_evicts_across_caches(self):
+        manager = ZenpyCacheManager(policy=CachePolicy(max_bytes=100000))
+        for i in range(5):
+            manager.add(make_user(i, 1000))
+        manager.add(Organization(id=1, notes='y' * 30000))
+        manager.add(make_user(5, 1000))
+        self.assertLessEqual(sum(manager.memory_usage().values()), 100000)
+        self.assertEqual(len(manager.mapping['user']), 6)
+        manager.add(make_user(6, 30000))
+        # The large cold organization goes before the small users.
+        self.assertIsNone(manager.get('organization', 1))
+        self.assertEqual(len(manager.mapping['user']), 7)
+
+    def test_object_larger_than_budget_not_cached(self):
+        manager = ZenpyCacheManager(policy=CachePolicy(max_bytes=10000))
+        manager.add(make_user(1, 10))
+        api = type('StubApi', (object,), dict(cache=manager))()
+        user = ZendeskObjectMapping(api).object_from_json(
+            'user', dict(id=1, notes='x' * 20000))
+        self.assertEqual(len(user.notes), 20000)
+        self.assertIsNone(manager.get('user', 1))
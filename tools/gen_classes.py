@@ -130,7 +130,7 @@ class Property(TemplateObject):
 
     DATE_TEMPLATE = """
         if self.{{object.attribute.key}}:
-            return dateutil.parser.parse(self.{{object.attribute.key}})
+            return self._parse_date('{{object.attribute.key}}')
     """
 
     PROPERTY_TEMPLATE = """
@@ -272,8 +272,7 @@ BASE_CLASS = '''
 ######################################################################
 
 import json
-import dateutil.parser
-from zenpy.lib.util import json_encode_for_printing, json_encode_for_zendesk
+from zenpy.lib.util import json_encode_for_printing, json_encode_for_zendesk, parse_datetime
 
 
 class BaseObject(object):
@@ -281,6 +280,10 @@ class BaseObject(object):
     Base for all Zenpy objects. Keeps track of which attributes have been modified.
     """
 
+    # Attributes Zenpy uses to track the object, which are never sent to Zendesk.
+    _internal_attributes = ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty',
+                            '_parsed_dates', '_custom_field_positions')
+
     def __new__(cls, *args, **kwargs):
         instance = super(BaseObject, cls).__new__(cls)
         instance.__dict__['_dirty_attributes'] = set()
@@ -312,11 +315,29 @@ class BaseObject(object):
         """ Recursively set self and all child objects _dirty flag. """
         obj = obj or self
         for key, value in vars(obj).items():
-            if key not in ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty'):
+            if key not in self._internal_attributes:
                 setattr(obj, key, value)
                 if isinstance(value, BaseObject):
                     self._set_dirty(value)
 
+    def _parse_date(self, key):
+        """
+        Return the timestamp in attribute key as a datetime. The result is
+        kept until the attribute changes, so repeated reads parse it once.
+        """
+        value = getattr(self, key)
+        if not value:
+            return None
+        parsed_dates = self.__dict__.get('_parsed_dates')
+        if parsed_dates is None:
+            parsed_dates = self.__dict__['_parsed_dates'] = dict()
+        cached = parsed_dates.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        parsed = parse_datetime(value)
+        parsed_dates[key] = (value, parsed)
+        return parsed
+
     def to_json(self, indent=2):
         """ Return self formatted as JSON. """
         return json.dumps(self, default=json_encode_for_printing, indent=indent)
@@ -355,7 +376,7 @@ class BaseObject(object):
                 continue
 
             # These are for internal tracking, so just delete.
-            elif key in ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty'):
+            elif key in self._internal_attributes:
                 del copy_dict[key]
 
             # If the attribute has not been modified, do not send it.
@@ -429,7 +450,7 @@ def process_specification_directory(glob_pattern, outfile_name, namespace, write
         if write_baseclass:
             header = BASE_CLASS
         else:
-            header = "from zenpy.lib.api_objects import BaseObject\nimport dateutil.parser"
+            header = "from zenpy.lib.api_objects import BaseObject"
 
         out_file.write("\n\n\n".join((header, formatted_code)))
 
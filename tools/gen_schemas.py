@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Generate zenpy/lib/columnar_schemas.py, the column types used by the columnar
+export sinks, from the sample objects in specification/zendesk and the
+attribute types in doc_dict.json.
+
+    python tools/gen_schemas.py --spec-path specification --doc-json tools/doc_dict.json
+"""
+import glob
+import json
+import os
+import re
+import sys
+from optparse import OptionParser
+
+__author__ = 'facetoe'
+
+HEADER = '''"""
+Column types of Zendesk objects, used by :mod:`zenpy.lib.columnar`.
+
+######################################################################
+#    Do not modify, this file is autogenerated by gen_schemas.py     #
+######################################################################
+"""
+
+SCHEMAS = {
+'''
+
+DOC_TYPES = {
+    'integer': 'int64',
+    'boolean': 'bool',
+    'date': 'timestamp',
+    'timestamp': 'timestamp',
+    'string': 'string',
+}
+
+TIMESTAMP_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+
+def infer_type(name, value, doc_type=None):
+    """ Return the column type for an attribute from its sample value and documented type. """
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'timestamp' if name.endswith('_at') else 'int64'
+    if isinstance(value, float):
+        return 'float64'
+    if isinstance(value, dict):
+        return 'json'
+    if isinstance(value, list):
+        if name.endswith('_ids') or (value and all(isinstance(v, int) for v in value)):
+            return 'list<int64>'
+        if name == 'tags' or (value and all(isinstance(v, str) for v in value)):
+            return 'list<string>'
+        return 'json'
+    if isinstance(value, str):
+        if name.endswith('_at') or TIMESTAMP_RE.match(value):
+            return 'timestamp'
+        return 'string'
+    # The sample value is null, fall back on the documentation and the name.
+    if doc_type in DOC_TYPES:
+        return DOC_TYPES[doc_type]
+    if name == 'id' or name.endswith('_id'):
+        return 'int64'
+    if name.endswith('_ids'):
+        return 'list<int64>'
+    if name.endswith('_at'):
+        return 'timestamp'
+    return 'string'
+
+
+def object_schema(path, doc_json):
+    object_type = os.path.basename(os.path.splitext(path)[0])
+    with open(path) as f:
+        sample = json.load(f)
+    if not isinstance(sample, dict):
+        return object_type, None
+    docs = doc_json.get(object_type + 's', {})
+    columns = []
+    for name, value in sorted(sample.items()):
+        if name.startswith('_'):
+            continue
+        doc_type = docs.get(name, {}).get('type')
+        columns.append((name, infer_type(name, value, doc_type)))
+    return object_type, columns
+
+
+def main():
+    parser = OptionParser()
+    parser.add_option("--spec-path", "-s", dest="spec_path", help="Location of .json spec")
+    parser.add_option("--doc-json", "-d", dest="doc_json_path",
+                      help="Location of .json documentation file")
+    parser.add_option("--out-file", "-o", dest="out_file",
+                      default=os.path.join('zenpy', 'lib', 'columnar_schemas.py'))
+    (options, args) = parser.parse_args()
+    if not options.spec_path or not os.path.isdir(options.spec_path):
+        print("--spec-path must be a directory!")
+        sys.exit(1)
+    if not options.doc_json_path:
+        print("--doc-json is required!")
+        sys.exit(1)
+
+    with open(options.doc_json_path) as f:
+        doc_json = json.load(f)['core']
+
+    lines = [HEADER]
+    for path in sorted(glob.glob(os.path.join(options.spec_path, 'zendesk', '*.json'))):
+        object_type, columns = object_schema(path, doc_json)
+        if not columns:
+            continue
+        lines.append("    '{}': (\n".format(object_type))
+        for name, column_type in columns:
+            lines.append("        ('{}', '{}'),\n".format(name, column_type))
+        lines.append("    ),\n")
+        print("Processed: %s" % os.path.basename(path))
+    lines.append("}\n")
+    with open(options.out_file, 'w') as out_file:
+        out_file.write(''.join(lines))
+
+
+if __name__ == '__main__':
+    main()
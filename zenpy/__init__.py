@@ -1,7 +1,7 @@
 import logging
 import requests
 import os
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE
 from requests.packages.urllib3 import Retry
 
 from zenpy.lib.api import (
@@ -50,10 +50,15 @@ from zenpy.lib.api import (
     EngagementApi
 )
 
-from zenpy.lib.cache import ZenpyCache, ZenpyCacheManager
+from zenpy.lib.cache import CachePolicy, ZenpyCache, ZenpyCacheManager
+from zenpy.lib.coalesce import RequestCoalescer
 from zenpy.lib.endpoint import EndpointFactory
+from zenpy.lib.etag import ETagCache
 from zenpy.lib.exception import ZenpyException
+from zenpy.lib.instrumentation import Hooks
 from zenpy.lib.mapping import ZendeskObjectMapping
+from zenpy.lib.pool import ZenpyHTTPAdapter, pool_size
+from zenpy.lib.transfer import UploadIndex
 
 debug_log = os.environ.get("DEBUG_LOG")
 if debug_log is not None:
@@ -85,7 +90,16 @@ class Zenpy(object):
         proactive_ratelimit_request_interval=10,
         disable_cache=False,
         raise_on_ratelimit=False,
-        password_treatment_level="warning"
+        password_treatment_level="warning",
+        upload_index=None,
+        max_concurrency=None,
+        pool_connections=None,
+        pool_maxsize=None,
+        pool_block=None,
+        keep_alive=True,
+        etag_cache=None,
+        coalesce_requests=False,
+        cache_policy=None
     ):
         """
         Python Wrapper for the Zendesk API.
@@ -114,6 +128,31 @@ class Zenpy(object):
         instead of sleeping and retrying. The exception carries
         ``retry_after`` and ``response`` so callers (e.g. Celery tasks)
         can reschedule the work themselves.
+        :param upload_index: path of a SQLite database, or an
+        :class:`~zenpy.lib.transfer.UploadIndex`, used to reuse upload tokens
+        instead of uploading identical files again.
+        :param max_concurrency: the most threads expected to share this client.
+        The connection pool is sized to match, so connections are reused
+        rather than opened and discarded for every request.
+        :param pool_connections: number of hosts to keep connection pools for.
+        :param pool_maxsize: connections kept per host, overrides the size
+        derived from max_concurrency.
+        :param pool_block: if True, wait for a free connection rather than
+        opening one the pool cannot keep.
+        :param keep_alive: if False, close connections after each request.
+        :param etag_cache: True, the path of a SQLite database, or an
+        :class:`~zenpy.lib.etag.ETagCache`, used to make conditional requests
+        for configuration endpoints and skip downloading unchanged responses.
+        :param coalesce_requests: if True, identical GET requests made by
+        several threads at the same time share a single request and response.
+        :param cache_policy: a :class:`~zenpy.lib.cache.CachePolicy`, or a dict
+        for :meth:`~zenpy.lib.cache.CachePolicy.from_dict`, setting the size
+        of each cache and an overall memory ceiling. By default the policy is
+        read from ZENPY_CACHE_* environment variables.
+
+        The pool options only apply to the session Zenpy creates. When passing
+        a session, mount a :class:`~zenpy.lib.pool.ZenpyHTTPAdapter` built
+        with :meth:`http_adapter_kwargs` on it instead.
         """
         if password_treatment_level == "warning":
             if password is not None:
@@ -124,12 +163,40 @@ class Zenpy(object):
                 log.error("ERROR **** PASSWORDS WILL BE DISABLED **** https://github.com/facetoe/zenpy/issues/651 https://support.zendesk.com/hc/en-us/articles/7386291855386-Announcing-the-deprecation-of-password-access-for-APIs")
                 raise ZenpyException("ERROR **** PASSWORDS WILL BE DISABLED **** https://github.com/facetoe/zenpy/issues/651 https://support.zendesk.com/hc/en-us/articles/7386291855386-Announcing-the-deprecation-of-password-access-for-APIs")
 
+        pool_options = dict(max_concurrency=max_concurrency,
+                            pool_connections=pool_connections,
+                            pool_maxsize=pool_maxsize,
+                            pool_block=pool_block)
+        if session is not None and any(v is not None for v in pool_options.values()):
+            raise ZenpyException(
+                "Connection pool options cannot be applied to an existing session, "
+                "mount a ZenpyHTTPAdapter with http_adapter_kwargs() on it instead!")
+        self.max_concurrency = max_concurrency
+
         session = self._init_session(email, token, oauth_token,
-                                     password, session, anonymous)
+                                     password, session, anonymous,
+                                     pool_options=pool_options)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
 
         timeout = timeout or self.DEFAULT_TIMEOUT
 
-        self.cache = ZenpyCacheManager(disable_cache)
+        if cache_policy is None:
+            cache_policy = CachePolicy.from_env()
+        elif not isinstance(cache_policy, CachePolicy):
+            cache_policy = CachePolicy.from_dict(cache_policy)
+        self.cache = ZenpyCacheManager(disable_cache, policy=cache_policy)
+        # Request lifecycle callbacks, see zenpy.lib.instrumentation.
+        self.hooks = Hooks()
+
+        if etag_cache is True:
+            etag_cache = ETagCache()
+        elif etag_cache is not None and not isinstance(etag_cache, ETagCache):
+            etag_cache = ETagCache(etag_cache)
+        self.etag_cache = etag_cache
+        self.coalescer = RequestCoalescer() if coalesce_requests else None
+        if upload_index is not None and not isinstance(upload_index, UploadIndex):
+            upload_index = UploadIndex(upload_index)
 
         config = dict(
             domain=domain,
@@ -145,6 +212,11 @@ class Zenpy(object):
             ratelimit_request_interval=int(proactive_ratelimit_request_interval),
             raise_on_ratelimit=raise_on_ratelimit,
             cache=self.cache,
+            hooks=self.hooks,
+            max_concurrency=max_concurrency,
+            etag_cache=etag_cache,
+            coalescer=self.coalescer,
+            upload_index=upload_index,
         )
 
         self.users = UserApi(config)
@@ -203,13 +275,19 @@ class Zenpy(object):
         self.engagements = EngagementApi(config)
 
     @staticmethod
-    def http_adapter_kwargs():
+    def http_adapter_kwargs(max_concurrency=None, pool_connections=None,
+                            pool_maxsize=None, pool_block=None):
         """
         Provides Zenpy's default HTTPAdapter args
         for those users providing their own adapter.
+
+        The pool is sized for max_concurrency threads unless pool_maxsize is given.
         """
 
         return dict(
+            pool_connections=pool_connections or DEFAULT_POOLSIZE,
+            pool_maxsize=pool_size(max_concurrency, pool_maxsize),
+            pool_block=bool(pool_block),
             # Transparently retry requests that are safe to retry, except 429.
             # This is handled in the Api._call_api() method.
             max_retries=Retry(
@@ -221,11 +299,15 @@ class Zenpy(object):
             )
         )
 
-    def _init_session(self, email, token, oath_token, password, session, anonymous):
+    def _init_session(self, email, token, oath_token, password, session, anonymous,
+                      pool_options=None):
         if not session:
             session = requests.Session()
             # Workaround for possible race condition - https://github.com/kennethreitz/requests/issues/3661
-            session.mount("https://", HTTPAdapter(**self.http_adapter_kwargs()))
+            adapter = ZenpyHTTPAdapter(**self.http_adapter_kwargs(**(pool_options or {})))
+            session.mount("https://", adapter)
+            # Only used when ZENPY_FORCE_SCHEME=http, eg against a local test server.
+            session.mount("http://", adapter)
 
         if (not hasattr(session, "authorized") or not session.authorized) and \
                 not anonymous:
@@ -254,6 +336,20 @@ class Zenpy(object):
             session.headers.update({"User-Agent": user_agent})
         return session
 
+    def pool_stats(self):
+        """
+        Returns the usage of the session's connection pools as a dict of
+        ``scheme://host:port`` to counters, see
+        :class:`~zenpy.lib.pool.ConnectionStats`. Pools of adapters other
+        than :class:`~zenpy.lib.pool.ZenpyHTTPAdapter` are not included.
+        """
+        session = self.users.session
+        stats = dict()
+        for adapter in set(session.adapters.values()):
+            if isinstance(adapter, ZenpyHTTPAdapter):
+                stats.update(adapter.pool_stats())
+        return stats
+
     def get_cache_names(self):
         """
         Returns a list of current caches
@@ -1,11 +1,18 @@
 # coding=utf-8
 
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
 from io import BytesIO
 import json
 import logging
 import os
-from time import sleep, time
-from zenpy.lib.util import get_endpoint_path
+import threading
+from time import perf_counter, sleep, time
+
+import pytz
+
+from zenpy.lib.util import canonical_url, get_endpoint_path
+from zenpy.lib.batch import BatchMixin, batchable
 from zenpy.lib.endpoint import EndpointFactory
 from zenpy.lib.generator import ZendeskResultGenerator
 from zenpy.lib.exception import ZenpyException, TooManyValuesException
@@ -46,11 +53,13 @@ from zenpy.lib.response import AccountResponseHandler, AgentResponseHandler, \
     WebhookInvocationsResponseHandler, \
     WebhooksResponseHandler, ZISIntegrationResponseHandler, \
     VoiceCommentResponseHandler
+from zenpy.lib.transfer import AttachmentDownloader, AttachmentUploader, upload_tokens
+from zenpy.lib.instrumentation import Hooks, TimedCall, endpoint_template
 
 from zenpy.lib.util import dict_clean, as_plural, extract_id, \
     is_iterable_but_not_string, json_encode_for_zendesk, \
     all_are_none, \
-    all_are_not_none
+    all_are_not_none, as_utc, split_time_window, iterate_concurrently
 
 try:
     from collections.abc import Iterable
@@ -70,7 +79,8 @@ class BaseApi(object):
 
     def __init__(self, subdomain, session, timeout, ratelimit,
                  ratelimit_budget, ratelimit_request_interval,
-                 raise_on_ratelimit=False, cache=None, domain=None):
+                 raise_on_ratelimit=False, cache=None, domain=None, hooks=None,
+                 max_concurrency=None, etag_cache=None, coalescer=None, upload_index=None):
         self.domain = domain
         self.subdomain = subdomain
         self.session = session
@@ -79,10 +89,20 @@ class BaseApi(object):
         self.ratelimit_budget = ratelimit_budget
         self.raise_on_ratelimit = raise_on_ratelimit
         self.cache = cache
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.max_concurrency = max_concurrency
+        self.etag_cache = etag_cache
+        self.coalescer = coalescer
+        # Optional UploadIndex used to avoid uploading identical files twice.
+        self.upload_index = upload_index
         self.protocol = 'https'
         self.api_prefix = 'api/v2'
         self._url_template = "%(protocol)s://%(subdomain)s.%(domain)s/%(api_prefix)s"
         self.callsafety = {'lastcalltime': None, 'lastlimitremaining': None}
+        # Guards callsafety and ratelimit_budget, which every thread sharing
+        # this Api updates.
+        self._ratelimit_lock = threading.Lock()
+        self._thread_state = threading.local()
         self.ratelimit_request_interval = ratelimit_request_interval
         self._response_handlers = (
             CountResponseHandler,
@@ -107,8 +127,17 @@ class BaseApi(object):
         # We want to ensure that it is successfully accepted by Zendesk
         # before cleaning it's dirty attributes, so we store it here until the response
         # is successfully processed, and then call the objects _clean_dirty() method.
+        # It is kept per thread, so concurrent updates only clean their own objects.
         self._dirty_object = None
 
+    @property
+    def _dirty_object(self):
+        return getattr(self._thread_state, 'dirty_object', None)
+
+    @_dirty_object.setter
+    def _dirty_object(self, zenpy_object):
+        self._thread_state.dirty_object = zenpy_object
+
     def supports_cbp(self):
         cbp_supported = ['activities',
                          'audits',
@@ -153,7 +182,7 @@ class BaseApi(object):
 
         response = self._call_api(self.session.post,
                                   url,
-                                  json=self._serialize(payload),
+                                  json=self._serialize_payload(payload),
                                   timeout=self.timeout,
                                   headers=headers,
                                   **kwargs)
@@ -162,14 +191,14 @@ class BaseApi(object):
     def _put(self, url, payload):
         response = self._call_api(self.session.put,
                                   url,
-                                  json=self._serialize(payload),
+                                  json=self._serialize_payload(payload),
                                   timeout=self.timeout)
         return self._process_response(response)
 
     def _patch(self, url, payload):
         response = self._call_api(self.session.patch,
                                   url,
-                                  json=self._serialize(payload),
+                                  json=self._serialize_payload(payload),
                                   timeout=self.timeout)
         return self._process_response(response)
 
@@ -180,16 +209,69 @@ class BaseApi(object):
                                   timeout=self.timeout)
         return self._process_response(response)
 
+    def _serialize_payload(self, payload):
+        """
+        Serialize the payload of a request. Upload tokens it attaches are
+        spent once sent, so they are no longer reused by the upload index.
+        """
+        payload = self._serialize(payload)
+        if self.upload_index is not None and payload:
+            self.upload_index.mark_used(upload_tokens(payload))
+        return payload
+
     def _get(self, url, raw_response=False, **kwargs):
-        response = self._call_api(self.session.get,
-                                  url,
-                                  timeout=self.timeout,
-                                  **kwargs)
+        coalescer = self.coalescer
+        if coalescer is not None and set(kwargs) <= {'params'}:
+            # Only plain GETs are shared, anything with headers or streaming
+            # may differ between callers.
+            response = coalescer.call(canonical_url(url, kwargs.get('params')),
+                                      lambda: self._fetch(url, **kwargs))
+        else:
+            response = self._fetch(url, **kwargs)
         if raw_response:
             return response
         else:
             return self._process_response(response)
 
+    def _fetch(self, url, **kwargs):
+        etag_cache = self.etag_cache
+        if etag_cache is not None and not kwargs.get('stream') \
+                and etag_cache.should_cache(url):
+            return self._conditional_get(etag_cache, url, **kwargs)
+        return self._call_api(self.session.get,
+                              url,
+                              timeout=self.timeout,
+                              **kwargs)
+
+    def _conditional_get(self, etag_cache, url, **kwargs):
+        """
+        GET url sending the validators of the response stored in etag_cache,
+        and return the stored response if Zendesk answers 304 Not Modified.
+        """
+        key = etag_cache.cache_key(url, kwargs.get('params'))
+        headers = etag_cache.validators(key)
+        if headers:
+            headers.update(kwargs.get('headers') or {})
+            kwargs['headers'] = headers
+        response = self._call_api(self.session.get,
+                                  url,
+                                  timeout=self.timeout,
+                                  **kwargs)
+        if response.status_code == 304:
+            cached = etag_cache.load(key, response)
+            if cached is not None:
+                log.debug("ETag cache HIT: %s", key)
+                return cached
+            # The entry was invalidated after the validators were read.
+            kwargs['headers'] = dict((name, value) for name, value in headers.items()
+                                     if not name.startswith('If-'))
+            response = self._call_api(self.session.get,
+                                      url,
+                                      timeout=self.timeout,
+                                      **kwargs)
+        etag_cache.store(key, response)
+        return response
+
     def _call_api(self, http_method, url, **kwargs):
         """
         Execute a call to the Zendesk API. Handles rate limiting, checking the response
@@ -200,8 +282,19 @@ class BaseApi(object):
         :param url: The url to pass to to the requests method.
         :param kwargs: Any additional kwargs to pass on to requests.
         """
-        log.debug("{}: {} - {}".format(http_method.__name__.upper(), url,
-                                       kwargs))
+        log.debug("%s: %s - %s", http_method.__name__.upper(), url, kwargs)
+        hooks = self.hooks
+        # Listeners registered by another thread while this request is in
+        # flight only see the requests that start after them.
+        instrumented = bool(hooks)
+        if instrumented:
+            request_info = dict(method=http_method.__name__.upper(),
+                                url=url,
+                                endpoint=endpoint_template(url))
+            hooks.emit('before_request', request_info)
+        started = perf_counter()
+        http_method = TimedCall(http_method)
+
         if self.ratelimit is not None:
             # This path indicates we're taking a proactive
             # approach to not hit the rate limit
@@ -229,6 +322,11 @@ class BaseApi(object):
                 log.warning(
                     "Waiting for requested retry-after period: %s seconds" %
                     retry_after_seconds)
+                if instrumented and hooks.listening('on_ratelimit_wait'):
+                    hooks.emit('on_ratelimit_wait',
+                               dict(request_info,
+                                    seconds=retry_after_seconds,
+                                    reason='retry-after'))
                 while retry_after_seconds > 0:
                     retry_after_seconds -= 1
                     self.check_ratelimit_budget(
@@ -236,21 +334,49 @@ class BaseApi(object):
                         retry_after=retry_after_seconds,
                         response=response,
                     )
-                    log.debug("    -> sleeping: %s more seconds" %
+                    log.debug("    -> sleeping: %s more seconds",
                               retry_after_seconds)
                     sleep(1)
+                if instrumented and hooks.listening('on_retry'):
+                    hooks.emit('on_retry',
+                               dict(request_info,
+                                    status=response.status_code,
+                                    attempt=http_method.calls + 1))
                 response = http_method(url, **kwargs)
 
+        if instrumented and hooks.listening('after_response'):
+            hooks.emit('after_response',
+                       dict(request_info,
+                            status=response.status_code,
+                            bytes=self._response_size(response, kwargs.get('stream')),
+                            latency=http_method.latency,
+                            ratelimit_wait=perf_counter() - started - http_method.elapsed,
+                            attempts=http_method.calls))
         self._check_response(response)
         self._update_callsafety(response)
         return response
 
+    @staticmethod
+    def _response_size(response, stream):
+        """
+        Size of the response body. Streamed bodies have not been read yet,
+        so rely on the Content-Length header for those.
+        """
+        if not stream:
+            return len(response.content or b'')
+        try:
+            return int(response.headers.get('Content-Length'))
+        except (ValueError, TypeError):
+            return None
+
     def check_ratelimit_budget(self, seconds_waited, retry_after=None,
                                response=None):
         """ If we have a ratelimit_budget, ensure it is not exceeded. """
         if self.ratelimit_budget is not None:
-            self.ratelimit_budget -= seconds_waited
-            if self.ratelimit_budget < 1:
+            with self._ratelimit_lock:
+                self.ratelimit_budget -= seconds_waited
+                exceeded = self.ratelimit_budget < 1
+            if exceeded:
                 raise RatelimitBudgetExceeded(
                     "Rate limit budget exceeded!",
                     retry_after=retry_after,
@@ -272,12 +398,14 @@ class BaseApi(object):
         """ Ensure we do not hit the rate limit. """
 
         def time_since_last_call():
-            if self.callsafety['lastcalltime'] is not None:
-                return int(time() - self.callsafety['lastcalltime'])
+            lastcalltime = self.callsafety['lastcalltime']
+            if lastcalltime is not None:
+                return int(time() - lastcalltime)
             else:
                 return None
 
-        lastlimitremaining = self.callsafety['lastlimitremaining']
+        with self._ratelimit_lock:
+            lastlimitremaining = self.callsafety['lastlimitremaining']
 
         if time_since_last_call() is None or \
                 time_since_last_call() >= self.ratelimit_request_interval or \
@@ -290,44 +418,67 @@ class BaseApi(object):
                 "Safety Limit Reached of %s remaining calls and "
                 "time since last call is under %s seconds"
                 % (self.ratelimit, self.ratelimit_request_interval))
+            if self.hooks.listening('on_ratelimit_wait'):
+                self.hooks.emit('on_ratelimit_wait',
+                                dict(method=http_method.__name__.upper(),
+                                     url=url,
+                                     endpoint=endpoint_template(url),
+                                     seconds=self.ratelimit_request_interval -
+                                     time_since_last_call(),
+                                     reason='proactive'))
             while time_since_last_call() < self.ratelimit_request_interval:
                 remaining_sleep = int(self.ratelimit_request_interval -
                                       time_since_last_call())
-                log.debug("  -> sleeping: %s more seconds" % remaining_sleep)
+                log.debug("  -> sleeping: %s more seconds", remaining_sleep)
                 self.check_ratelimit_budget(1)
                 sleep(1)
             response = http_method(url, **kwargs)
 
-        self.callsafety['lastcalltime'] = time()
-        self.callsafety['lastlimitremaining'] = int(
-            response.headers.get('X-Rate-Limit-Remaining', 0))
+        self._record_callsafety(response)
         return response
 
     def _update_callsafety(self, response):
         """ Update the callsafety data structure """
         if self.ratelimit is not None:
+            self._record_callsafety(response)
+
+    def _record_callsafety(self, response):
+        remaining = int(response.headers.get('X-Rate-Limit-Remaining', 0))
+        with self._ratelimit_lock:
             self.callsafety['lastcalltime'] = time()
-            self.callsafety['lastlimitremaining'] = int(
-                response.headers.get('X-Rate-Limit-Remaining', 0))
+            self.callsafety['lastlimitremaining'] = remaining
 
     def _process_response(self, response, object_mapping=None):
         """
         Attempt to find a ResponseHandler that knows how to process this response.
         If no handler can be found, raise an Exception.
         """
-        try:
-            pretty_response = response.json()
-        except ValueError:
-            pretty_response = response
         for handler in self._response_handlers:
             if handler.applies_to(self, response):
-                log.debug("{} matched: {}".format(handler.__name__,
-                                                  pretty_response))
+                # Decoding the response just to log it is expensive for large pages.
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("%s matched: %s", handler.__name__,
+                              self._pretty_response(response))
+                started = perf_counter()
                 r = handler(self, object_mapping).build(response)
+                if self.hooks.listening('on_deserialize'):
+                    url = getattr(response, 'url', None)
+                    self.hooks.emit('on_deserialize',
+                                    dict(url=url,
+                                         endpoint=endpoint_template(url),
+                                         handler=handler.__name__,
+                                         duration=perf_counter() - started))
                 self._clean_dirty_objects()
                 return r
         raise ZenpyException(
-            "Could not handle response: {}".format(pretty_response))
+            "Could not handle response: {}".format(self._pretty_response(response)))
+
+    @staticmethod
+    def _pretty_response(response):
+        try:
+            return response.json()
+        except ValueError:
+            return response
 
     def _clean_dirty_objects(self):
         """
@@ -339,7 +490,7 @@ class BaseApi(object):
         if not is_iterable_but_not_string(self._dirty_object):
             self._dirty_object = [self._dirty_object]
 
-        log.debug("Cleaning objects: {}".format(self._dirty_object))
+        log.debug("Cleaning objects: %s", self._dirty_object)
         for o in self._dirty_object:
             if isinstance(o, BaseObject):
                 o._clean_dirty()
@@ -349,7 +500,7 @@ class BaseApi(object):
         """ Serialize a Zenpy object to JSON """
         # If it's a dict this object has already been serialized.
         if not isinstance(zenpy_object, dict):
-            log.debug("Setting dirty object: {}".format(zenpy_object))
+            log.debug("Setting dirty object: %s", zenpy_object)
             self._dirty_object = zenpy_object
         return json.loads(
             json.dumps(zenpy_object, default=json_encode_for_zendesk),
@@ -377,12 +528,19 @@ class BaseApi(object):
             if item:
                 return item
             else:
+                not_found = self.cache.get_not_found(object_type, _id)
+                if not_found is not None:
+                    raise RecordNotFoundException(*not_found.args, response=not_found.response)
                 if self.supports_cbp() and \
                         endpoint.__class__.__name__ != 'IncrementalEndpoint' and \
                         'cursor_pagination' not in endpoint_kwargs.keys():
                     endpoint_kwargs['cursor_pagination'] = True
-                return self._get(url=self._build_url(
-                    endpoint(*endpoint_args, **endpoint_kwargs)))
+                try:
+                    return self._get(url=self._build_url(
+                        endpoint(*endpoint_args, **endpoint_kwargs)))
+                except RecordNotFoundException as e:
+                    self.cache.add_not_found(object_type, _id, e)
+                    raise
         elif 'ids' in endpoint_kwargs:
             cached_objects = []
             # Check to see if we have all objects in the cache.
@@ -415,8 +573,8 @@ class BaseApi(object):
         :param response: requests Response object.
         """
         if response.status_code > 299 or response.status_code < 200:
-            log.debug("Received response code [%s] - headers: %s" %
-                      (response.status_code, str(response.headers)))
+            log.debug("Received response code [%s] - headers: %s",
+                      response.status_code, response.headers)
             try:
                 _json = response.json()
                 err_type = _json.get("error", '')
@@ -459,7 +617,7 @@ class BaseApi(object):
             return self.domain
 
 
-class Api(BaseApi):
+class Api(BaseApi, BatchMixin):
     """
     Most general API class. It is callable, and is suitable for basic API endpoints.
 
@@ -478,6 +636,10 @@ class Api(BaseApi):
         return self._query_zendesk(self.endpoint, self.object_type, *args,
                                    **kwargs)
 
+    def _batch_call(self, item, **kwargs):
+        """ Called for each item by map() and batch(), eg tickets.map(ticket_ids). """
+        return self(id=item, **kwargs)
+
     def _get_user(self, user_id):
         if int(user_id) < 0:
             return None
@@ -796,6 +958,30 @@ class IncrementalApi(Api):
                                    start_time=start_time, include=include,
                                    per_page=per_page)
 
+    def incremental_pages(self, start_time, include=None, per_page=None):
+        """
+        Like :meth:`incremental`, but yield every page as the JSON dict
+        returned by Zendesk instead of yielding objects. Nothing is
+        deserialized or cached, so only one page is held in memory at a time.
+        """
+        url = self._build_url(self.endpoint.incremental(start_time=start_time,
+                                                        include=include,
+                                                        per_page=per_page))
+        return self._incremental_pages(url, 'next_page')
+
+    def _incremental_pages(self, url, next_page_attr):
+        while url:
+            page = self._get(url, raw_response=True).json()
+            yield page
+            if page.get('end_of_stream') is True:
+                return
+            end_time = page.get('end_time')
+            # Zendesk refuses start times less than 5 minutes in the past.
+            if end_time and (datetime.fromtimestamp(int(end_time)) +
+                             timedelta(minutes=5)) > datetime.now():
+                return
+            url = page.get(next_page_attr)
+
 
 class IncrementalCursorApi(IncrementalApi):
     def incremental(self,
@@ -864,6 +1050,40 @@ class IncrementalCursorApi(IncrementalApi):
             raise ValueError(
                 "Can't set cursor param and paginate_by_time=True")
 
+    def incremental_pages(self,
+                          start_time=None,
+                          paginate_by_time=False,
+                          cursor=None,
+                          include=None,
+                          per_page=None):
+        """
+        Like :meth:`incremental`, but yield every page as the JSON dict
+        returned by Zendesk instead of yielding objects. Nothing is
+        deserialized or cached, so only one page is held in memory at a time.
+        The ``after_cursor`` of the last page can be passed as cursor to
+        resume later.
+        """
+        if (all_are_none(start_time, cursor)
+                or all_are_not_none(start_time, cursor)):
+            raise ValueError(
+                'You must set either start_time or cursor but not both')
+
+        if paginate_by_time is True:
+            if cursor is not None:
+                raise ValueError(
+                    "Can't set cursor param and paginate_by_time=True")
+            return super(IncrementalCursorApi, self).incremental_pages(
+                start_time=start_time, include=include, per_page=per_page)
+        elif start_time is not None:
+            endpoint = self.endpoint.incremental.cursor_start(start_time=start_time,
+                                                              include=include,
+                                                              per_page=per_page)
+        else:
+            endpoint = self.endpoint.incremental.cursor(cursor=cursor,
+                                                        include=include,
+                                                        per_page=per_page)
+        return self._incremental_pages(self._build_url(endpoint), 'after_url')
+
 
 class ChatIncrementalApi(Api):
     """
@@ -1262,6 +1482,10 @@ class AttachmentApi(Api):
         """
         Upload a file to Zendesk.
 
+        If an :class:`~zenpy.lib.transfer.UploadIndex` is configured and no token
+        is passed, a previous upload with identical content and name is reused
+        while it is still valid instead of uploading the file again.
+
         :param fp: file object, StringIO instance, content, or file path to be
                    uploaded
         :param token: upload token for uploading multiple files
@@ -1269,11 +1493,49 @@ class AttachmentApi(Api):
         :return: :class:`Upload` object containing a token and other information see
             Zendesk API `Reference <https://developer.zendesk.com/rest_api/docs/core/attachments#uploading-files>`__.
         """
+        if self.upload_index is not None and token is None:
+            return self.upload_index.upload(self, fp,
+                                            target_name=target_name,
+                                            content_type=content_type)
+        return self._upload(fp,
+                            token=token,
+                            target_name=target_name,
+                            content_type=content_type)
+
+    def _upload(self, fp, token=None, target_name=None, content_type=None):
         return UploadRequest(self).post(fp,
                                         token=token,
                                         target_name=target_name,
                                         content_type=content_type)
 
+    def upload_many(self, files, token=None, max_workers=4,
+                    chunk_size=64 * 1024, progress_callback=None):
+        """
+        Upload many files concurrently under a single upload token.
+
+        Files are streamed in chunks of chunk_size bytes rather than read into
+        memory. See :class:`~zenpy.lib.transfer.AttachmentUploader`.
+
+        .. code-block:: python
+
+            uploads = zenpy_client.attachments.upload_many(['/tmp/a.pdf', '/tmp/b.png'])
+            ticket.comment = Comment(body='Files attached', uploads=[uploads[0].token])
+
+        :param files: file paths, file objects with a name, or
+            (file path or object, target name) tuples
+        :param token: existing upload token to add the files to
+        :param max_workers: number of files uploaded at the same time
+        :param chunk_size: number of bytes read from each file at a time
+        :param progress_callback: callable accepting the target name, bytes sent
+            and total bytes of a file
+        :return: list of :class:`Upload` objects sharing the same token
+        """
+        uploader = AttachmentUploader(self,
+                                      max_workers=max_workers,
+                                      chunk_size=chunk_size,
+                                      progress_callback=progress_callback)
+        return uploader.upload(files, token=token)
+
     def download(self, attachment_id, destination=None):
         """
         Download an attachment from Zendesk.
@@ -1295,6 +1557,33 @@ class AttachmentApi(Api):
             self._write_to_stream(attachment.content_url, f)
         return destination
 
+    def download_many(self, attachments, destination, max_workers=4,
+                      raise_on_error=True, overwrite=False):
+        """
+        Download many attachments concurrently.
+
+        Attachments are written to destination as ``<id>-<file_name>``. Each file
+        is downloaded to a ``.part`` file first and renamed once complete and
+        verified, interrupted downloads are resumed when called again.
+        See :class:`~zenpy.lib.transfer.AttachmentDownloader`.
+
+        .. code-block:: python
+
+            comments = zenpy_client.tickets.comments(ticket=1)
+            paths = zenpy_client.attachments.download_many(comments, '/tmp/ticket_1')
+
+        :param attachments: attachment ids, Attachment objects or Comment objects
+        :param destination: directory to write the attachments to
+        :param max_workers: number of attachments downloaded at the same time
+        :param raise_on_error: if False, errors are returned in place of the path
+        :param overwrite: download attachments again even if already present
+        :return: dict of attachment id to the path it was written to
+        """
+        downloader = AttachmentDownloader(self, destination,
+                                          max_workers=max_workers,
+                                          overwrite=overwrite)
+        return downloader.download(attachments, raise_on_error=raise_on_error)
+
     def delete(self, token_id):
         """
         Delete an attachment from Zendesk.
@@ -1318,7 +1607,8 @@ class AttachmentApi(Api):
         return self._put(url, payload={})
 
     def _write_to_stream(self, source_url, stream):
-        r = self.session.get(source_url, stream=True)
+        r = self._call_api(self.session.get, source_url, stream=True,
+                           timeout=self.timeout)
         for chunk in r.iter_content(chunk_size=None):
             if chunk:
                 stream.write(chunk)
@@ -1506,6 +1796,7 @@ class TicketApi(RateableApi, TaggableApi, IncrementalCursorApi, CRUDApi):
                                    id=None,
                                    include=include)
 
+    @batchable
     @extract_id(Ticket)
     def comments(self, ticket, include_inline_images=False):
         """
@@ -1602,6 +1893,7 @@ class TicketApi(RateableApi, TaggableApi, IncrementalCursorApi, CRUDApi):
                                    start_time=start_time, include=include,
                                    per_page=per_page)
 
+    @batchable
     @extract_id(Ticket)
     def audits(self, ticket=None, include=None, **kwargs):
         """
@@ -2941,6 +3233,11 @@ class CustomAgentRolesApi(CRUDApi):
 
 
 class SearchApi(Api):
+    # Zendesk stops paginating search results after this many results.
+    SEARCH_RESULT_LIMIT = 1000
+    # Nothing can have been created in Zendesk before this.
+    SEARCH_EPOCH = datetime(2007, 1, 1, tzinfo=pytz.utc)
+
     def __init__(self, config):
         super(SearchApi, self).__init__(config,
                                         object_type='results',
@@ -2958,6 +3255,102 @@ class SearchApi(Api):
         return self._query_zendesk(self.endpoint.count, 'search_count', *args,
                                    **kwargs)
 
+    def partitioned(self,
+                    query=None,
+                    partition_by='created',
+                    start_time=None,
+                    end_time=None,
+                    max_workers=4,
+                    **kwargs):
+        """
+        Search without being capped by the Zendesk search result limit.
+
+        The search is split into time windows on the ``created`` or ``updated``
+        attribute. Any window whose count() exceeds the result limit is halved
+        until every window fits, and the windows are then fetched concurrently.
+        Results are yielded as windows complete and are de-duplicated by id, so
+        the order of results is not defined.
+
+        Prefer :class:`SearchExportApi` when it supports the object type you are
+        searching for, it doesn't have a result limit.
+
+        .. code-block:: python
+
+            for ticket in zenpy_client.search.partitioned(type='ticket', status='open'):
+                print(ticket)
+
+        :param query: the query string, see :class:`SearchEndpoint`
+        :param partition_by: one of (created, updated)
+        :param start_time: only return results after this datetime,
+            defaults to the beginning of Zendesk
+        :param end_time: only return results before this datetime, defaults to now
+        :param max_workers: number of windows to count or fetch at the same time
+        :param kwargs: any other search parameters, see :class:`SearchEndpoint`
+        """
+        if partition_by not in ('created', 'updated'):
+            raise ZenpyException("partition_by must be one of (created, updated)")
+        between_key = '{}_between'.format(partition_by)
+        if between_key in kwargs:
+            raise ZenpyException(
+                "Use start_time and end_time instead of {}".format(between_key))
+
+        start_time = as_utc(start_time or self.SEARCH_EPOCH)
+        end_time = as_utc(end_time or datetime.now(pytz.utc))
+        if start_time >= end_time:
+            raise ZenpyException("start_time must be before end_time")
+
+        def count_window(window):
+            window_kwargs = dict(kwargs)
+            window_kwargs[between_key] = list(window)
+            return self.count(query, **window_kwargs)
+
+        def fetch_window(window):
+            window_kwargs = dict(kwargs)
+            window_kwargs[between_key] = list(window)
+            return list(self(query, **window_kwargs))
+
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            window = (start_time, end_time)
+            pending = {executor.submit(count_window, window): ('count', window)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, window = pending.pop(future)
+                        if kind == 'count':
+                            self._schedule_window(executor, pending, window,
+                                                  future.result(),
+                                                  count_window, fetch_window)
+                            continue
+                        for zenpy_object in future.result():
+                            key = (type(zenpy_object), getattr(zenpy_object, 'id', None))
+                            if key not in seen:
+                                seen.add(key)
+                                yield zenpy_object
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _schedule_window(self, executor, pending, window, window_count,
+                         count_window, fetch_window):
+        """
+        Fetch a window if all its results can be retrieved, otherwise split
+        it in two and count each half.
+        """
+        if window_count == 0:
+            return
+        start, end = window
+        if window_count <= self.SEARCH_RESULT_LIMIT or end - start <= timedelta(seconds=2):
+            if window_count > self.SEARCH_RESULT_LIMIT:
+                log.warning(
+                    "Search window %s - %s has %s results and cannot be split further. "
+                    "We will get what we can." % (start, end, window_count))
+            pending[executor.submit(fetch_window, window)] = ('fetch', window)
+            return
+        for half in split_time_window(start, end, 2):
+            pending[executor.submit(count_window, half)] = ('count', half)
+
 
 class SearchExportApi(Api):
     def __init__(self, config):
@@ -2970,6 +3363,83 @@ class SearchExportApi(Api):
         return self._query_zendesk(self.endpoint, self.object_type, *args,
                                    **kwargs)
 
+    def fan_out(self,
+                query=None,
+                types=('ticket', 'user', 'organization', 'group'),
+                partitions=1,
+                partition_by='created',
+                start_time=None,
+                end_time=None,
+                sinks=None,
+                max_workers=None,
+                queue_size=1000,
+                **kwargs):
+        """
+        Export the results of a search across several object types at once.
+
+        The export endpoint only accepts a single type per query, so one cursor
+        stream is started per type and they are consumed concurrently. Each
+        type can be split further into ``partitions`` time windows on the
+        ``created`` or ``updated`` attribute, each fetched as a separate stream.
+
+        Without ``sinks`` a single iterator over the merged results is returned.
+        With ``sinks``, a dict mapping each type to a callable, every result is
+        passed to the sink for its type and a dict of result counts per type is
+        returned. Sinks are always called from the calling thread.
+
+        .. code-block:: python
+
+            for obj in zenpy_client.search_export.fan_out('audit', types=('ticket', 'user')):
+                print(obj)
+
+        :param query: the query string, see :class:`SearchEndpoint`
+        :param types: the object types to search
+        :param partitions: number of time windows to split each type into
+        :param partition_by: one of (created, updated)
+        :param start_time: start of the windows, defaults to the beginning of Zendesk
+        :param end_time: end of the windows, defaults to now
+        :param sinks: dict of type to callable accepting a single result
+        :param max_workers: number of streams consumed at the same time,
+            defaults to one worker per stream
+        :param queue_size: maximum number of results buffered between the streams
+            and the consumer
+        :param kwargs: any other search parameters, see :class:`SearchEndpoint`
+        """
+        if partition_by not in ('created', 'updated'):
+            raise ZenpyException("partition_by must be one of (created, updated)")
+        if sinks is not None and set(types) - set(sinks):
+            raise ZenpyException("No sink provided for types: {}".format(
+                ", ".join(sorted(set(types) - set(sinks)))))
+
+        windows = [None]
+        if partitions > 1 or start_time or end_time:
+            windows = split_time_window(
+                as_utc(start_time or SearchApi.SEARCH_EPOCH),
+                as_utc(end_time or datetime.now(pytz.utc)), partitions)
+        between_key = '{}_between'.format(partition_by)
+
+        def stream(search_type, window):
+            def results():
+                stream_kwargs = dict(kwargs, type=search_type)
+                if window is not None:
+                    stream_kwargs[between_key] = list(window)
+                for zenpy_object in self(query, **stream_kwargs):
+                    yield search_type, zenpy_object
+            return results
+
+        streams = [stream(t, w) for t in types for w in windows]
+        merged = iterate_concurrently(streams,
+                                      max_workers=max_workers or len(streams),
+                                      queue_size=queue_size)
+        if sinks is None:
+            return (zenpy_object for _, zenpy_object in merged)
+
+        counts = {t: 0 for t in types}
+        for search_type, zenpy_object in merged:
+            sinks[search_type](zenpy_object)
+            counts[search_type] += 1
+        return counts
+
 
 class UserFieldsApi(CRUDApi):
     def __init__(self, config):
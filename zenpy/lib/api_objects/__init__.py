@@ -4,8 +4,7 @@
 ######################################################################
 
 import json
-import dateutil.parser
-from zenpy.lib.util import json_encode_for_printing, json_encode_for_zendesk
+from zenpy.lib.util import json_encode_for_printing, json_encode_for_zendesk, parse_datetime
 
 
 class BaseObject(object):
@@ -13,6 +12,10 @@ class BaseObject(object):
     Base for all Zenpy objects. Keeps track of which attributes have been modified.
     """
 
+    # Attributes Zenpy uses to track the object, which are never sent to Zendesk.
+    _internal_attributes = ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty',
+                            '_parsed_dates', '_custom_field_positions')
+
     def __new__(cls, *args, **kwargs):
         instance = super(BaseObject, cls).__new__(cls)
         instance.__dict__['_dirty_attributes'] = set()
@@ -44,11 +47,29 @@ class BaseObject(object):
         """ Recursively set self and all child objects _dirty flag. """
         obj = obj or self
         for key, value in vars(obj).items():
-            if key not in ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty'):
+            if key not in self._internal_attributes:
                 setattr(obj, key, value)
                 if isinstance(value, BaseObject):
                     self._set_dirty(value)
 
+    def _parse_date(self, key):
+        """
+        Return the timestamp in attribute key as a datetime. The result is
+        kept until the attribute changes, so repeated reads parse it once.
+        """
+        value = getattr(self, key)
+        if not value:
+            return None
+        parsed_dates = self.__dict__.get('_parsed_dates')
+        if parsed_dates is None:
+            parsed_dates = self.__dict__['_parsed_dates'] = dict()
+        cached = parsed_dates.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        parsed = parse_datetime(value)
+        parsed_dates[key] = (value, parsed)
+        return parsed
+
     def to_json(self, indent=2):
         """ Return self formatted as JSON. """
         return json.dumps(self, default=json_encode_for_printing, indent=indent)
@@ -87,7 +108,7 @@ class BaseObject(object):
                 continue
 
             # These are for internal tracking, so just delete.
-            elif key in ('api', '_dirty_attributes', '_always_dirty', '_dirty_callback', '_dirty'):
+            elif key in self._internal_attributes:
                 del copy_dict[key]
 
             # If the attribute has not been modified, do not send it.
@@ -157,7 +178,7 @@ class Activity(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -168,7 +189,7 @@ class Activity(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -335,7 +356,7 @@ class Audit(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -428,7 +449,7 @@ class Automation(BaseObject):
         |  Comment: The time the automation was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -441,7 +462,7 @@ class Automation(BaseObject):
         |  Comment: The time of the last update of the automation
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -569,7 +590,7 @@ class Brand(BaseObject):
         |  Comment: The time the brand was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -582,7 +603,7 @@ class Brand(BaseObject):
         |  Comment: The time of the last update of the brand
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -713,7 +734,7 @@ class Comment(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -862,7 +883,7 @@ class CustomAgentRole(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -873,7 +894,7 @@ class CustomAgentRole(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -998,7 +1019,7 @@ class CustomStatus(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1009,7 +1030,7 @@ class CustomStatus(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1297,7 +1318,7 @@ class Group(BaseObject):
         |  Comment: The time the group was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1310,7 +1331,7 @@ class Group(BaseObject):
         |  Comment: The time of the last update of the group
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1396,7 +1417,7 @@ class GroupMembership(BaseObject):
         |  Comment: The time the membership was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1423,7 +1444,7 @@ class GroupMembership(BaseObject):
         |  Comment: The time of the last update of the membership
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1494,7 +1515,7 @@ class Identity(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1505,7 +1526,7 @@ class Identity(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1560,7 +1581,7 @@ class Invocation(BaseObject):
     def latest_completed(self):
 
         if self.latest_completed_at:
-            return dateutil.parser.parse(self.latest_completed_at)
+            return self._parse_date('latest_completed_at')
 
     @latest_completed.setter
     def latest_completed(self, latest_completed):
@@ -1609,7 +1630,7 @@ class InvocationAttempt(BaseObject):
     def completed(self):
 
         if self.completed_at:
-            return dateutil.parser.parse(self.completed_at)
+            return self._parse_date('completed_at')
 
     @completed.setter
     def completed(self, completed):
@@ -1674,7 +1695,7 @@ class Item(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1697,7 +1718,7 @@ class Item(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1820,7 +1841,7 @@ class Link(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1843,7 +1864,7 @@ class Link(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1901,7 +1922,7 @@ class Locale(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1912,7 +1933,7 @@ class Locale(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2021,7 +2042,7 @@ class Macro(BaseObject):
         |  Comment: The time the macro was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2034,7 +2055,7 @@ class Macro(BaseObject):
         |  Comment: The time of the last update of the macro
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2252,7 +2273,7 @@ class Organization(BaseObject):
         |  Comment: The time the organization was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2279,7 +2300,7 @@ class Organization(BaseObject):
         |  Comment: The time of the last update of the organization
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2443,7 +2464,7 @@ class OrganizationField(BaseObject):
         |  Comment: The time the ticket field was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2456,7 +2477,7 @@ class OrganizationField(BaseObject):
         |  Comment: The time of the last update of the ticket field
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2542,7 +2563,7 @@ class OrganizationMembership(BaseObject):
         |  Comment: When this record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2569,7 +2590,7 @@ class OrganizationMembership(BaseObject):
         |  Comment: When this record last got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2702,7 +2723,7 @@ class Recipient(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2713,7 +2734,7 @@ class Recipient(BaseObject):
     def delivered(self):
 
         if self.delivered_at:
-            return dateutil.parser.parse(self.delivered_at)
+            return self._parse_date('delivered_at')
 
     @delivered.setter
     def delivered(self, delivered):
@@ -2748,7 +2769,7 @@ class Recipient(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -2825,7 +2846,7 @@ class RecipientAddress(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -2836,7 +2857,7 @@ class RecipientAddress(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3022,7 +3043,7 @@ class Request(BaseObject):
         |  Comment: When this record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3035,7 +3056,7 @@ class Request(BaseObject):
         |  Comment: When the task is due (only applies if the request is of type "task")
         """
         if self.due_at:
-            return dateutil.parser.parse(self.due_at)
+            return self._parse_date('due_at')
 
     @due.setter
     def due(self, due):
@@ -3076,7 +3097,7 @@ class Request(BaseObject):
         |  Comment: When this record last got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3135,7 +3156,7 @@ class Response(BaseObject):
     def delivered(self):
 
         if self.delivered_at:
-            return dateutil.parser.parse(self.delivered_at)
+            return self._parse_date('delivered_at')
 
     @delivered.setter
     def delivered(self, delivered):
@@ -3158,7 +3179,7 @@ class Response(BaseObject):
     def rated(self):
 
         if self.rated_at:
-            return dateutil.parser.parse(self.rated_at)
+            return self._parse_date('rated_at')
 
     @rated.setter
     def rated(self, rated):
@@ -3308,7 +3329,7 @@ class SatisfactionRating(BaseObject):
         |  Comment: The time the satisfaction rating got created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3363,7 +3384,7 @@ class SatisfactionRating(BaseObject):
         |  Comment: The time the satisfaction rating got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3478,7 +3499,7 @@ class Schedule(BaseObject):
         |  Comment: Time the schedule was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3491,7 +3512,7 @@ class Schedule(BaseObject):
         |  Comment: Time the schedule was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3563,7 +3584,7 @@ class SharingAgreement(BaseObject):
         |  Comment: The time the record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3612,7 +3633,7 @@ class Skip(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3623,7 +3644,7 @@ class Skip(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3688,7 +3709,7 @@ class SlaPolicy(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3699,7 +3720,7 @@ class SlaPolicy(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -3895,7 +3916,7 @@ class SuspendedTicket(BaseObject):
         |  Comment: When this record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -3922,7 +3943,7 @@ class SuspendedTicket(BaseObject):
         |  Comment: When this record last got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -4059,7 +4080,7 @@ class Target(BaseObject):
         |  Comment: The time the target was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -4370,7 +4391,7 @@ class Ticket(BaseObject):
         |  Comment: When this record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -4383,7 +4404,7 @@ class Ticket(BaseObject):
         |  Comment: If this is a ticket of type "task" it has a due date.  Due date format uses ISO 8601 format.
         """
         if self.due_at:
-            return dateutil.parser.parse(self.due_at)
+            return self._parse_date('due_at')
 
     @due.setter
     def due(self, due):
@@ -4494,7 +4515,7 @@ class Ticket(BaseObject):
         |  Comment: When this record last got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -4755,7 +4776,7 @@ class TicketField(BaseObject):
         |  Comment: The time the ticket field was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -4768,7 +4789,7 @@ class TicketField(BaseObject):
         |  Comment: The time of the last update of the ticket field
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -4892,7 +4913,7 @@ class TicketForm(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -4946,7 +4967,7 @@ class TicketForm(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -5125,7 +5146,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the ticket was last assigned
         """
         if self.assigned_at:
-            return dateutil.parser.parse(self.assigned_at)
+            return self._parse_date('assigned_at')
 
     @assigned.setter
     def assigned(self, assigned):
@@ -5138,7 +5159,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the assignee last updated the ticket
         """
         if self.assignee_updated_at:
-            return dateutil.parser.parse(self.assignee_updated_at)
+            return self._parse_date('assignee_updated_at')
 
     @assignee_updated.setter
     def assignee_updated(self, assignee_updated):
@@ -5151,7 +5172,7 @@ class TicketMetric(BaseObject):
         |  Comment: When this record was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -5164,7 +5185,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the ticket was initially assigned
         """
         if self.initially_assigned_at:
-            return dateutil.parser.parse(self.initially_assigned_at)
+            return self._parse_date('initially_assigned_at')
 
     @initially_assigned.setter
     def initially_assigned(self, initially_assigned):
@@ -5177,7 +5198,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the latest comment was added
         """
         if self.latest_comment_added_at:
-            return dateutil.parser.parse(self.latest_comment_added_at)
+            return self._parse_date('latest_comment_added_at')
 
     @latest_comment_added.setter
     def latest_comment_added(self, latest_comment_added):
@@ -5190,7 +5211,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the requester last updated the ticket
         """
         if self.requester_updated_at:
-            return dateutil.parser.parse(self.requester_updated_at)
+            return self._parse_date('requester_updated_at')
 
     @requester_updated.setter
     def requester_updated(self, requester_updated):
@@ -5203,7 +5224,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the ticket was solved
         """
         if self.solved_at:
-            return dateutil.parser.parse(self.solved_at)
+            return self._parse_date('solved_at')
 
     @solved.setter
     def solved(self, solved):
@@ -5216,7 +5237,7 @@ class TicketMetric(BaseObject):
         |  Comment: When the status was last updated
         """
         if self.status_updated_at:
-            return dateutil.parser.parse(self.status_updated_at)
+            return self._parse_date('status_updated_at')
 
     @status_updated.setter
     def status_updated(self, status_updated):
@@ -5243,7 +5264,7 @@ class TicketMetric(BaseObject):
         |  Comment: When this record last got updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -5450,7 +5471,7 @@ class Topic(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -5485,7 +5506,7 @@ class Topic(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -5633,7 +5654,7 @@ class Upload(BaseObject):
     def expires(self):
 
         if self.expires_at:
-            return dateutil.parser.parse(self.expires_at)
+            return self._parse_date('expires_at')
 
     @expires.setter
     def expires(self, expires):
@@ -5901,7 +5922,7 @@ class User(BaseObject):
         |  Comment: The time the user was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -5928,7 +5949,7 @@ class User(BaseObject):
         |  Comment: The last time the user signed in to Zendesk Support
         """
         if self.last_login_at:
-            return dateutil.parser.parse(self.last_login_at)
+            return self._parse_date('last_login_at')
 
     @last_login.setter
     def last_login(self, last_login):
@@ -5955,7 +5976,7 @@ class User(BaseObject):
         |  Comment: The time the user was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -6083,7 +6104,7 @@ class UserField(BaseObject):
         |  Comment: The time the ticket field was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -6096,7 +6117,7 @@ class UserField(BaseObject):
         |  Comment: The time of the last update of the ticket field
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -6193,7 +6214,7 @@ class Variant(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -6204,7 +6225,7 @@ class Variant(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -6324,7 +6345,7 @@ class View(BaseObject):
         |  Comment: The time the view was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -6349,7 +6370,7 @@ class View(BaseObject):
         |  Comment: The time of the last update of the view
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -6592,7 +6613,7 @@ class Webhook(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -6603,7 +6624,7 @@ class Webhook(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
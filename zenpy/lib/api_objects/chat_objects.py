@@ -1,5 +1,4 @@
 from zenpy.lib.api_objects import BaseObject
-import dateutil.parser
 
 
 class Account(BaseObject):
@@ -383,7 +382,7 @@ class Chat(BaseObject):
     def end_timestamp(self):
 
         if self._end_timestamp:
-            return dateutil.parser.parse(self._end_timestamp)
+            return self._parse_date('_end_timestamp')
 
     @end_timestamp.setter
     def end_timestamp(self, end_timestamp):
@@ -396,7 +395,7 @@ class Chat(BaseObject):
         |  Description: Timestamp for the chat
         """
         if self._timestamp:
-            return dateutil.parser.parse(self._timestamp)
+            return self._parse_date('_timestamp')
 
     @timestamp.setter
     def timestamp(self, timestamp):
@@ -711,7 +710,7 @@ class OfflineMessage(BaseObject):
     def timestamp(self):
 
         if self._timestamp:
-            return dateutil.parser.parse(self._timestamp)
+            return self._parse_date('_timestamp')
 
     @timestamp.setter
     def timestamp(self, timestamp):
@@ -909,7 +908,7 @@ class SearchResult(BaseObject):
     def timestamp(self):
 
         if self._timestamp:
-            return dateutil.parser.parse(self._timestamp)
+            return self._parse_date('_timestamp')
 
     @timestamp.setter
     def timestamp(self, timestamp):
@@ -1139,7 +1138,7 @@ class Webpath(BaseObject):
     def timestamp(self):
 
         if self._timestamp:
-            return dateutil.parser.parse(self._timestamp)
+            return self._parse_date('_timestamp')
 
     @timestamp.setter
     def timestamp(self, timestamp):
@@ -1,5 +1,4 @@
 from zenpy.lib.api_objects import BaseObject
-import dateutil.parser
 
 
 class AccessPolicy(BaseObject):
@@ -277,7 +276,7 @@ class Article(BaseObject):
         |  Comment: The time the article was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -318,7 +317,7 @@ class Article(BaseObject):
         |  Comment: The time the article was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -439,7 +438,7 @@ class ArticleAttachment(BaseObject):
         |  Comment: The time at which the article attachment was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -452,7 +451,7 @@ class ArticleAttachment(BaseObject):
         |  Comment: The time at which the article attachment was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -509,7 +508,7 @@ class Category(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -520,7 +519,7 @@ class Category(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -655,7 +654,7 @@ class Comment(BaseObject):
         |  Comment: The time at which the comment was created. Writable on create by Help Center managers -- see Create Comment
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -668,7 +667,7 @@ class Comment(BaseObject):
         |  Comment: The time at which the comment was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -711,7 +710,7 @@ class ContentTag(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -722,7 +721,7 @@ class ContentTag(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -794,7 +793,7 @@ class Label(BaseObject):
         |  Comment: The time at which the label was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -807,7 +806,7 @@ class Label(BaseObject):
         |  Comment: The time at which the label was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -856,7 +855,7 @@ class ManagementPermissionGroup(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -867,7 +866,7 @@ class ManagementPermissionGroup(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1037,7 +1036,7 @@ class Post(BaseObject):
         |  Comment: When the post was created. Writable on create by Help Center managers -- see Create Post
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1064,7 +1063,7 @@ class Post(BaseObject):
         |  Comment: When the post was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1229,7 +1228,7 @@ class Section(BaseObject):
         |  Comment: The time at which the section was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1256,7 +1255,7 @@ class Section(BaseObject):
         |  Comment: The time at which the section was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1356,7 +1355,7 @@ class Subscription(BaseObject):
         |  Comment: The time at which the subscription was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1369,7 +1368,7 @@ class Subscription(BaseObject):
         |  Comment: The time at which the subscription was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1492,7 +1491,7 @@ class Topic(BaseObject):
         |  Comment: When the topic was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1505,7 +1504,7 @@ class Topic(BaseObject):
         |  Comment: When the topic was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1656,7 +1655,7 @@ class Translation(BaseObject):
         |  Comment: The time at which the translation was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1683,7 +1682,7 @@ class Translation(BaseObject):
         |  Comment: The time at which the translation was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1797,7 +1796,7 @@ class UserSegment(BaseObject):
         |  Comment: When the user segment was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1838,7 +1837,7 @@ class UserSegment(BaseObject):
         |  Comment: When the user segment was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1931,7 +1930,7 @@ class Vote(BaseObject):
         |  Comment: The time at which the vote was created
         """
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -1944,7 +1943,7 @@ class Vote(BaseObject):
         |  Comment: The time at which the vote was last updated
         """
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -1,5 +1,4 @@
 from zenpy.lib.api_objects import BaseObject
-import dateutil.parser
 
 
 class AccountOverview(BaseObject):
@@ -347,7 +346,7 @@ class Call(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -393,7 +392,7 @@ class Call(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -562,7 +561,7 @@ class CallPe(BaseObject):
     def call_ended(self):
 
         if self.call_ended_at:
-            return dateutil.parser.parse(self.call_ended_at)
+            return self._parse_date('call_ended_at')
 
     @call_ended.setter
     def call_ended(self, call_ended):
@@ -573,7 +572,7 @@ class CallPe(BaseObject):
     def call_started(self):
 
         if self.call_started_at:
-            return dateutil.parser.parse(self.call_started_at)
+            return self._parse_date('call_started_at')
 
     @call_started.setter
     def call_started(self, call_started):
@@ -742,7 +741,7 @@ class Leg(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -753,7 +752,7 @@ class Leg(BaseObject):
     def updated(self):
 
         if self.updated_at:
-            return dateutil.parser.parse(self.updated_at)
+            return self._parse_date('updated_at')
 
     @updated.setter
     def updated(self, updated):
@@ -834,7 +833,7 @@ class PhoneNumbers(BaseObject):
     def created(self):
 
         if self.created_at:
-            return dateutil.parser.parse(self.created_at)
+            return self._parse_date('created_at')
 
     @created.setter
     def created(self, created):
@@ -0,0 +1,175 @@
+"""
+Helpers for making many calls to the same endpoint concurrently, eg fetching
+the comments of a list of tickets:
+
+.. code-block:: python
+
+    for result in zenpy_client.tickets.comments.map(ticket_ids, max_workers=8):
+        if result.error is None:
+            print(result.item, len(result.value))
+
+Calls run on a thread pool but go through the same Api, so they share the
+client's connection pool, caches and rate limiting.
+"""
+
+from abc import abstractmethod
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from zenpy.lib.generator import BaseResultGenerator
+
+__author__ = 'facetoe'
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class BatchResult(namedtuple('BatchResult', ['item', 'value', 'error'])):
+    """
+    The outcome of calling an endpoint for one item: the value returned, or
+    the exception raised, in which case value is None.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class BatchResults(list):
+    """ A list of :class:`BatchResult` in the order of the items passed in. """
+
+    @property
+    def values(self):
+        """ The values of the calls that succeeded. """
+        return [result.value for result in self if result.error is None]
+
+    @property
+    def errors(self):
+        """ The results of the calls that failed. """
+        return [result for result in self if result.error is not None]
+
+
+def map_concurrently(func, items, max_workers, ordered=True):
+    """
+    Call func with every item on a thread pool, yielding a
+    :class:`BatchResult` for each.
+
+    When ordered is True results are yielded in the order of items, as soon as
+    the result and every result before it are available. Otherwise they are
+    yielded as they complete. Exceptions are caught and returned in the result
+    rather than raised, so one failure does not lose the other results.
+    Result generators are consumed in the worker, so every page is fetched
+    concurrently too.
+
+    Only a few calls per worker are submitted at a time, so items can be a
+    long or lazy iterable. If the consumer stops early the remaining calls
+    are cancelled.
+    """
+
+    def call(item):
+        try:
+            value = func(item)
+            if isinstance(value, BaseResultGenerator):
+                value = list(value)
+            return BatchResult(item, value, None)
+        except Exception as e:
+            return BatchResult(item, None, e)
+
+    max_in_flight = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque() if ordered else set()
+        try:
+            for item in items:
+                future = executor.submit(call, item)
+                if ordered:
+                    pending.append(future)
+                    if len(pending) >= max_in_flight:
+                        yield pending.popleft().result()
+                else:
+                    pending.add(future)
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+            if ordered:
+                while pending:
+                    yield pending.popleft().result()
+            else:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class BatchMixin(object):
+    """
+    Adds :meth:`map` and :meth:`batch` to an object implementing _batch_call
+    and with a max_concurrency attribute.
+    """
+
+    @abstractmethod
+    def _batch_call(self, item, **kwargs):
+        """ Subclasses should make the call for item and return its result. """
+
+    def map(self, items, max_workers=None, ordered=True, **kwargs):
+        """
+        Make one call per item concurrently and yield a :class:`BatchResult`
+        for each, see :func:`map_concurrently`.
+
+        :param items: objects or ids to make the call for
+        :param max_workers: number of calls made at the same time, defaults
+            to the client's max_concurrency or 4
+        :param ordered: yield results in the order of items rather than as
+            they complete
+        :param kwargs: passed on to every call
+        """
+        max_workers = max_workers or self.max_concurrency or DEFAULT_MAX_WORKERS
+        return map_concurrently(lambda item: self._batch_call(item, **kwargs),
+                                items, max_workers, ordered=ordered)
+
+    def batch(self, items, max_workers=None, **kwargs):
+        """
+        Make one call per item concurrently and return :class:`BatchResults`
+        once all have finished.
+        """
+        return BatchResults(self.map(items, max_workers=max_workers, **kwargs))
+
+
+class BoundBatchable(BatchMixin):
+    """ A :func:`batchable` method bound to an Api. """
+
+    def __init__(self, api, method):
+        self.api = api
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    @property
+    def max_concurrency(self):
+        return self.api.max_concurrency
+
+    def __call__(self, *args, **kwargs):
+        return self.method(self.api, *args, **kwargs)
+
+    def _batch_call(self, item, **kwargs):
+        return self.method(self.api, item, **kwargs)
+
+
+class batchable(object):
+    """
+    Method decorator adding ``map`` and ``batch`` to an Api method taking the
+    object to query as its first argument, so that
+    ``zenpy_client.tickets.comments.map(ticket_ids)`` calls
+    ``zenpy_client.tickets.comments(ticket_id)`` for every id concurrently.
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    def __get__(self, api, owner=None):
+        if api is None:
+            return self
+        return BoundBatchable(api, self.method)
@@ -1,5 +1,10 @@
 import logging
-from threading import RLock
+import os
+import re
+import sys
+from collections import OrderedDict
+from itertools import islice
+from threading import Lock, RLock
 
 import cachetools
 
@@ -11,21 +16,107 @@ __author__ = 'facetoe'
 
 log = logging.getLogger(__name__)
 
+# Attributes of Zenpy objects that are shared rather than owned by the object.
+SHARED_ATTRIBUTES = ('api', '_dirty_callback')
+
+
+def estimate_size(obj):
+    """
+    Estimate the memory held by a Zenpy object, including the values,
+    lists, dicts and child objects it references, in bytes.
+    """
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, BaseObject):
+            stack.append(dict((k, v) for k, v in vars(item).items()
+                              if k not in SHARED_ATTRIBUTES))
+        elif isinstance(item, dict):
+            # dict methods, so proxies do not wrap the values they return.
+            stack.extend(dict.keys(item))
+            stack.extend(dict.values(item))
+        elif isinstance(item, list):
+            stack.extend(list.__iter__(item))
+        elif isinstance(item, (tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class SizeAwareLRUCache(cachetools.Cache):
+    """
+    LRU cache that, when full, evicts the largest of its few least recently
+    used items, so one large cold object goes before several small ones.
+    """
+
+    def __init__(self, maxsize, getsizeof=None, sample=8):
+        super(SizeAwareLRUCache, self).__init__(maxsize, getsizeof)
+        self.sample = sample
+        self._order = OrderedDict()
+
+    def __getitem__(self, key, cache_getitem=cachetools.Cache.__getitem__):
+        value = cache_getitem(self, key)
+        if key in self._order:
+            self._order.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value, cache_setitem=cachetools.Cache.__setitem__):
+        size = self.getsizeof(value)
+        cache_setitem(self, key, value)
+        self._order[key] = size
+        self._order.move_to_end(key)
+
+    def __delitem__(self, key, cache_delitem=cachetools.Cache.__delitem__):
+        cache_delitem(self, key)
+        del self._order[key]
+
+    def clear(self):
+        super(SizeAwareLRUCache, self).clear()
+        self._order.clear()
+
+    def coldest(self, count):
+        """
+        Return (key, size) of the count least recently used items, never
+        including the most recently used one unless it is the only item.
+        """
+        return list(islice(self._order.items(), min(count, max(len(self._order) - 1, 1))))
+
+    def popitem(self):
+        if not self._order:
+            raise KeyError('%s is empty' % type(self).__name__)
+        key = max(self.coldest(self.sample), key=lambda item: item[1])[0]
+        return key, self.pop(key)
+
+
+# Cache implementations provided by Zenpy rather than cachetools.
+ZENPY_CACHES = {'SizeAwareLRUCache': SizeAwareLRUCache}
+
 
 class ZenpyCache(object):
     """
     Wrapper class for the various cachetools caches.
     Adds ability to change cache implementations
     on the fly and change the maxsize setting.
+
+    The cachetools caches are not thread safe, even reads reorder LRU caches
+    and expire TTL caches, so every access goes through a lock.
     """
 
     AVAILABLE_CACHES = [
         c for c in dir(cachetools) if c.endswith('Cache') and c != 'Cache'
-    ]
+    ] + sorted(ZENPY_CACHES)
 
     def __init__(self, cache_impl, maxsize, **kwargs):
         self.cache = self._get_cache_impl(cache_impl, maxsize, **kwargs)
-        self.purge_lock = RLock()
+        self._cache_kwargs = kwargs
+        self.lock = RLock()
+        # Kept for backwards compatibility, purge() used to be the only locked operation.
+        self.purge_lock = self.lock
 
     def set_cache_impl(self, cache_impl, maxsize, **kwargs):
         """
@@ -35,14 +126,22 @@ class ZenpyCache(object):
         :param cache_impl: Name of cache implementation, must exist in AVAILABLE_CACHES
         """
         new_cache = self._get_cache_impl(cache_impl, maxsize, **kwargs)
-        self._populate_new_cache(new_cache)
-        self.cache = new_cache
+        with self.lock:
+            self._populate_new_cache(new_cache)
+            self.cache = new_cache
+            self._cache_kwargs = kwargs
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.cache.get(key, default)
 
     def pop(self, key, default=None):
-        return self.cache.pop(key, default)
+        with self.lock:
+            return self.cache.pop(key, default)
 
     def items(self):
-        return self.cache.items()
+        with self.lock:
+            return list(self.cache.items())
 
     @property
     def impl_name(self):
@@ -61,19 +160,48 @@ class ZenpyCache(object):
     def set_maxsize(self, maxsize, **kwargs):
         """
         Set maxsize. This involves creating a new cache and transferring the items.
+        Without kwargs, those the cache was created with are used again.
         """
+        kwargs = kwargs or self._cache_kwargs
         new_cache = self._get_cache_impl(self.impl_name, maxsize, **kwargs)
-        self._populate_new_cache(new_cache)
-        self.cache = new_cache
+        with self.lock:
+            self._populate_new_cache(new_cache)
+            self.cache = new_cache
+            self._cache_kwargs = kwargs
+
+    @property
+    def measures_bytes(self):
+        """ True if maxsize and size_bytes are in bytes rather than entries. """
+        return self._cache_kwargs.get('getsizeof') is estimate_size
+
+    @property
+    def size_bytes(self):
+        """ Estimated bytes held, or None when the cache only counts entries. """
+        if not self.measures_bytes:
+            return None
+        with self.lock:
+            return self.cache.currsize
+
+    def coldest(self, count):
+        """
+        Return (key, size) of up to count items that are next in line for
+        eviction.
+        """
+        with self.lock:
+            if hasattr(self.cache, 'coldest'):
+                return self.cache.coldest(count)
+            count = min(count, max(len(self.cache) - 1, 1))
+            return [(key, self.cache.getsizeof(cachetools.Cache.__getitem__(self.cache, key)))
+                    for key in islice(iter(self.cache), count)]
 
     def purge(self):
         """ Purge the cache of all items. """
-        with self.purge_lock:
+        with self.lock:
             self.cache.clear()
 
     @property
     def currsize(self):
-        return len(self.cache)
+        return len(self)
 
     def _populate_new_cache(self, new_cache):
         for key, value in self.cache.items():
@@ -84,51 +212,235 @@ class ZenpyCache(object):
             raise ZenpyCacheException(
                 "No such cache: %s, available caches: %s" %
                 (cache_impl, str(self.AVAILABLE_CACHES)))
+        if cache_impl in ZENPY_CACHES:
+            return ZENPY_CACHES[cache_impl](maxsize, **kwargs)
         return getattr(cachetools, cache_impl)(maxsize, **kwargs)
 
     def __iter__(self):
-        return self.cache.__iter__()
+        with self.lock:
+            return iter(list(self.cache))
 
     def __getitem__(self, item):
-        return self.cache[item]
+        with self.lock:
+            return self.cache[item]
 
     def __setitem__(self, key, value):
         if not issubclass(type(value), BaseObject):
             raise ZenpyCacheException(
                 "{} is not a subclass of BaseObject!".format(type(value)))
-        self.cache[key] = value
+        with self.lock:
+            self.cache[key] = value
 
     def __delitem__(self, key):
-        del self.cache[key]
+        with self.lock:
+            del self.cache[key]
 
     def __contains__(self, item):
-        return item in self.cache
+        with self.lock:
+            return item in self.cache
 
     def __len__(self):
-        return len(self.cache)
+        with self.lock:
+            return len(self.cache)
+
+
+class NegativeCache(object):
+    """
+    Remembers the (object_type, id) lookups Zendesk answered with
+    RecordNotFound for ttl seconds, so references to deleted objects, eg
+    ``ticket.assignee``, do not request them again on every access.
+    """
+
+    def __init__(self, ttl=30, maxsize=10000):
+        self.ttl = ttl
+        self.cache = cachetools.TTLCache(maxsize, ttl)
+        self.lock = Lock()
+        self.hits = 0
+        self.stored = 0
+
+    def get(self, object_type, cache_key):
+        """ Return the RecordNotFoundException stored for the lookup, or None. """
+        with self.lock:
+            exception = self.cache.get((object_type, cache_key))
+            if exception is not None:
+                self.hits += 1
+            return exception
+
+    def add(self, object_type, cache_key, exception):
+        with self.lock:
+            self.cache[(object_type, cache_key)] = exception
+            self.stored += 1
+
+    def discard(self, object_type, cache_key):
+        with self.lock:
+            self.cache.pop((object_type, cache_key), None)
+
+    def purge(self, object_type=None):
+        """ Forget every lookup, or those of object_type. """
+        with self.lock:
+            if object_type is None:
+                self.cache.clear()
+            else:
+                for key in [k for k in self.cache if k[0] == object_type]:
+                    self.cache.pop(key, None)
+
+    def stats(self):
+        """ Requests avoided, lookups stored and lookups currently remembered. """
+        with self.lock:
+            return dict(hits=self.hits, stored=self.stored, size=len(self.cache))
+
+    def __len__(self):
+        with self.lock:
+            return len(self.cache)
+
+
+def parse_size(value):
+    """ Parse a size in bytes, eg 1024, '512K', '64MB' or '2G'. """
+    if isinstance(value, int):
+        return value
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$', str(value), re.IGNORECASE)
+    if match is None:
+        raise ZenpyCacheException("Invalid size: %s" % value)
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** ' KMG'.index(unit.upper() or ' '))
+
+
+class CachePolicy(object):
+    """
+    The cache settings of every object type, plus an optional ceiling on the
+    memory used by all caches together.
+
+    The settings of an object type may contain:
+
+    * ``impl``: name of the cache implementation, see ZenpyCache.AVAILABLE_CACHES
+    * ``maxsize``: most entries kept
+    * ``max_bytes``: most memory kept, measured with :func:`estimate_size`.
+      Replaces maxsize, and an LRUCache becomes a SizeAwareLRUCache.
+    * ``ttl``: seconds entries are kept for, defaults impl to TTLCache
+
+    negative_ttl is how long a lookup by id that raised RecordNotFound is
+    remembered, 0 or None turns this off.
+
+    When max_bytes is set for the policy, every cache is measured in bytes.
+    Once the caches hold more than max_bytes together, the largest of the
+    least recently used entries across all caches are evicted.
+    """
+
+    DEFAULTS = {
+        'user': dict(impl='LRUCache', maxsize=10000),
+        'organization': dict(impl='LRUCache', maxsize=10000),
+        'group': dict(impl='LRUCache', maxsize=10000),
+        'brand': dict(impl='LRUCache', maxsize=10000),
+        # Tickets change often, so they expire quickly unless kept fresh
+        # by a zenpy.lib.refresher.CacheRefresher.
+        'ticket': dict(impl='TTLCache', maxsize=10000, ttl=30),
+        'request': dict(impl='LRUCache', maxsize=10000),
+        'ticket_field': dict(impl='LRUCache', maxsize=10000),
+        'sharing_agreement': dict(impl='TTLCache', maxsize=10000, ttl=6000),
+        'identity': dict(impl='LRUCache', maxsize=10000),
+        'custom_status': dict(impl='LRUCache', maxsize=1000),
+    }
+
+    ENV_PREFIX = 'ZENPY_CACHE_'
+    ENV_SETTINGS = (('MAX_BYTES', 'max_bytes', parse_size), ('MAXSIZE', 'maxsize', int),
+                    ('TTL', 'ttl', float), ('IMPL', 'impl', str))
+
+    def __init__(self, types=None, max_bytes=None, negative_ttl=30):
+        """
+        :param types: dict of object type to settings, merged over DEFAULTS
+        :param max_bytes: ceiling on the memory used by all caches together
+        :param negative_ttl: seconds a RecordNotFound lookup is remembered
+        """
+        self.types = dict((object_type, dict(settings))
+                          for object_type, settings in self.DEFAULTS.items())
+        for object_type, settings in (types or {}).items():
+            self.types.setdefault(object_type, {}).update(settings)
+        self.max_bytes = parse_size(max_bytes) if max_bytes is not None else None
+        self.negative_ttl = float(negative_ttl) if negative_ttl else None
+
+    @classmethod
+    def from_dict(cls, config):
+        """
+        Build a policy from a dict such as
+        ``{'max_bytes': '512M', 'negative_ttl': 60, 'user': {'max_bytes': '64M'}}``.
+        """
+        config = dict(config)
+        max_bytes = config.pop('max_bytes', None)
+        negative_ttl = config.pop('negative_ttl', 30)
+        return cls(types=config, max_bytes=max_bytes, negative_ttl=negative_ttl)
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """
+        Build a policy from environment variables: ZENPY_CACHE_MAX_BYTES
+        for the ceiling, and ZENPY_CACHE_<TYPE>_MAX_BYTES, _MAXSIZE, _TTL
+        and _IMPL for the settings of an object type, eg
+        ZENPY_CACHE_USER_MAX_BYTES=64M. ZENPY_CACHE_NEGATIVE_TTL sets
+        negative_ttl.
+        """
+        environ = os.environ if environ is None else environ
+        max_bytes = environ.get(cls.ENV_PREFIX + 'MAX_BYTES')
+        negative_ttl = environ.get(cls.ENV_PREFIX + 'NEGATIVE_TTL', 30)
+        global_names = (cls.ENV_PREFIX + 'MAX_BYTES', cls.ENV_PREFIX + 'NEGATIVE_TTL')
+        types = dict()
+        for name, value in environ.items():
+            if not name.startswith(cls.ENV_PREFIX) or name in global_names:
+                continue
+            for suffix, setting, parse in cls.ENV_SETTINGS:
+                if name.endswith('_' + suffix):
+                    object_type = name[len(cls.ENV_PREFIX):-len(suffix) - 1].lower()
+                    types.setdefault(object_type, {})[setting] = parse(value)
+                    break
+        return cls(types=types, max_bytes=max_bytes, negative_ttl=float(negative_ttl))
+
+    def cache_args(self, object_type):
+        """ Return the (impl, maxsize, kwargs) to create the cache of object_type with. """
+        settings = self.types[object_type]
+        kwargs = dict()
+        if settings.get('ttl') is not None:
+            kwargs['ttl'] = settings['ttl']
+        max_bytes = settings.get('max_bytes')
+        if max_bytes is None and self.max_bytes is not None:
+            max_bytes = self.max_bytes
+        if max_bytes is not None:
+            default_impl = 'TTLCache' if 'ttl' in kwargs else 'SizeAwareLRUCache'
+            impl = settings.get('impl', default_impl)
+            if impl == 'LRUCache':
+                # Measured in bytes, so prefer evicting large cold objects.
+                impl = 'SizeAwareLRUCache'
+            kwargs['getsizeof'] = estimate_size
+            return impl, parse_size(max_bytes), kwargs
+        impl = settings.get('impl', 'TTLCache' if 'ttl' in kwargs else 'LRUCache')
+        return impl, settings.get('maxsize', 10000), kwargs
+
+    def build_caches(self):
+        """ Return a dict of object type to ZenpyCache. """
+        caches = dict()
+        for object_type in self.types:
+            impl, maxsize, kwargs = self.cache_args(object_type)
+            caches[object_type] = ZenpyCache(impl, maxsize, **kwargs)
+        return caches
 
 
 class ZenpyCacheManager:
     """
     Interface to the various caches.
     """
-    def __init__(self, disabled=False):
+    # Entries per cache considered when evicting to stay under max_bytes.
+    EVICTION_SAMPLE = 8
+
+    def __init__(self, disabled=False, policy=None):
         self.disabled = disabled
-        self.mapping = {
-            'user': ZenpyCache('LRUCache', maxsize=10000),
-            'organization': ZenpyCache('LRUCache', maxsize=10000),
-            'group': ZenpyCache('LRUCache', maxsize=10000),
-            'brand': ZenpyCache('LRUCache', maxsize=10000),
-            # TESTING_CHANGE NOT OK TO KEEP
-            'ticket': ZenpyCache('TTLCache', maxsize=10000, ttl=30),
-            'request': ZenpyCache('LRUCache', maxsize=10000),
-            'ticket_field': ZenpyCache('LRUCache', maxsize=10000),
-            'sharing_agreement': ZenpyCache('TTLCache',
-                                            maxsize=10000,
-                                            ttl=6000),
-            'identity': ZenpyCache('LRUCache', maxsize=10000),
-            'custom_status': ZenpyCache('LRUCache', maxsize=1000)
-        }
+        # Consulted when an object is not in memory, eg a
+        # zenpy.lib.mirror.MirrorCacheStore. It must provide
+        # lookup(object_type, cache_key) returning an object or None.
+        self.backing_store = None
+        self.policy = policy if policy is not None else CachePolicy()
+        self.max_bytes = self.policy.max_bytes
+        self._budget_lock = Lock()
+        self.mapping = self.policy.build_caches()
+        # Lookups by id that Zendesk answered with RecordNotFound.
+        self.negative = NegativeCache(self.policy.negative_ttl) if self.policy.negative_ttl else None
 
     def add(self, zenpy_object):
         """ Add a Zenpy object to the relevant cache.
@@ -138,9 +450,66 @@ class ZenpyCacheManager:
             return
         attr_name = self._cache_key_attribute(object_type)
         cache_key = getattr(zenpy_object, attr_name)
-        log.debug("Caching: [{}({}={})]".format(
-            zenpy_object.__class__.__name__, attr_name, cache_key))
-        self.mapping[object_type][cache_key] = zenpy_object
+        log.debug("Caching: [%s(%s=%s)]",
+                  zenpy_object.__class__.__name__, attr_name, cache_key)
+        cache = self.mapping[object_type]
+        try:
+            cache[cache_key] = zenpy_object
+        except ValueError:
+            # Larger than the whole cache, so it is not cached and an older
+            # copy must not be returned in its place.
+            cache.pop(cache_key, None)
+            log.debug("Not caching: [%s(%s=%s)] is larger than the cache",
+                      zenpy_object.__class__.__name__, attr_name, cache_key)
+            return
+        if self.negative is not None and len(self.negative):
+            self.negative.discard(object_type, cache_key)
+        if self.max_bytes is not None:
+            self._enforce_budget()
+
+    def get_not_found(self, object_type, cache_key):
+        """
+        Return the RecordNotFoundException raised by a recent lookup of
+        cache_key, or None if the object has not been looked up or exists.
+        """
+        if self.negative is None or self.disabled:
+            return None
+        return self.negative.get(object_type, cache_key)
+
+    def add_not_found(self, object_type, cache_key, exception):
+        """ Remember that looking up cache_key raised exception. """
+        if self.negative is None or self.disabled:
+            return
+        log.debug("Caching not found: [%s %s]", object_type.capitalize(), cache_key)
+        self.negative.add(object_type, cache_key, exception)
+
+    def memory_usage(self):
+        """ Return the estimated bytes held by each cache measured in bytes. """
+        return dict((object_type, cache.size_bytes)
+                    for object_type, cache in list(self.mapping.items())
+                    if cache.measures_bytes)
+
+    def _enforce_budget(self):
+        """
+        Evict entries until all caches together hold at most max_bytes,
+        taking the largest of the least recently used entries of each cache.
+        """
+        with self._budget_lock:
+            total = sum(self.memory_usage().values())
+            while total > self.max_bytes:
+                victim = None
+                for cache in list(self.mapping.values()):
+                    if not cache.measures_bytes:
+                        continue
+                    for key, size in cache.coldest(self.EVICTION_SAMPLE):
+                        if victim is None or size > victim[2]:
+                            victim = (cache, key, size)
+                if victim is None:
+                    return
+                cache, key, size = victim
+                cache.pop(key)
+                total -= size
+                log.debug("Cache budget evicted: [%s] (%s bytes)", key, size)
 
     def delete(self, to_delete):
         """ Purge one or more items from the relevant caches """
@@ -152,21 +521,22 @@ class ZenpyCacheManager:
             if object_cache:
                 removed_object = object_cache.pop(zenpy_object.id, None)
                 if removed_object:
-                    log.debug("Cache RM: [%s %s]" %
-                              (object_type.capitalize(), zenpy_object.id))
+                    log.debug("Cache RM: [%s %s]",
+                              object_type.capitalize(), zenpy_object.id)
 
     def get(self, object_type, cache_key):
         """ Query the cache for a Zenpy object """
         if object_type not in self.mapping or self.disabled:
             return None
-        cache = self.mapping[object_type]
-        if cache_key in cache:
-            log.debug("Cache HIT: [%s %s]" %
-                      (object_type.capitalize(), cache_key))
-            return cache[cache_key]
-        else:
-            log.debug('Cache MISS: [%s %s]' %
-                      (object_type.capitalize(), cache_key))
+        # A single lookup, so the item cannot expire or be evicted by another
+        # thread between checking for it and returning it.
+        zenpy_object = self.mapping[object_type].get(cache_key)
+        if zenpy_object is None and self.backing_store is not None:
+            zenpy_object = self.backing_store.lookup(object_type, cache_key)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Cache %s: [%s %s]", 'MISS' if zenpy_object is None else 'HIT',
+                      object_type.capitalize(), cache_key)
+        return zenpy_object
 
     def query_cache_by_object(self, zenpy_object):
         """ Convenience method for testing. Given an object,
@@ -180,9 +550,10 @@ class ZenpyCacheManager:
         If no cache exists for object_type, nothing is done """
         if object_type in self.mapping:
             cache = self.mapping[object_type]
-            log.debug("Purging [{}] cache of {} values.".format(
-                object_type, len(cache)))
+            log.debug("Purging [%s] cache of %s values.", object_type, len(cache))
             cache.purge()
+        if self.negative is not None:
+            self.negative.purge(object_type)
 
     def in_cache(self, zenpy_object):
         """ Determine whether or not this object is in the cache """
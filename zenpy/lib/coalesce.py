@@ -0,0 +1,80 @@
+"""
+Sharing of identical GET requests made at the same time.
+
+When many threads resolve the same object, eg the requester of a batch of
+tickets, they would each make the same request. With a
+:class:`RequestCoalescer` the first thread makes the request and the others
+wait for and share its response.
+"""
+
+import logging
+from threading import Event, Lock
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+
+class _InflightCall(object):
+    __slots__ = ('done', 'response', 'error')
+
+    def __init__(self):
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+
+class RequestCoalescer(object):
+    """
+    Runs at most one call per key at a time. Callers arriving while a call
+    for their key is in flight receive its result, or its exception, rather
+    than making the call again.
+
+    Only the in-flight call is shared, nothing is kept once it completes.
+    Only share calls returning responses that were read in full, ie not
+    streamed, so every caller can deserialize its own objects from them.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._inflight = dict()
+        self.calls = 0
+        self.coalesced = 0
+
+    def call(self, key, func):
+        """
+        Return func(), or the result of the call already in flight for key.
+        """
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = _InflightCall()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            log.debug("Coalesced request: %s", key)
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.response
+
+        try:
+            inflight.response = func()
+            return inflight.response
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            inflight.done.set()
+
+    def stats(self):
+        """ Return the number of calls made and the number of calls avoided. """
+        with self._lock:
+            return dict(calls=self.calls, coalesced=self.coalesced,
+                        in_flight=len(self._inflight))
@@ -0,0 +1,450 @@
+"""
+Columnar export of Zenpy objects to Arrow record batches and Parquet files.
+
+Rows are read straight from the attributes of each object rather than through
+``to_dict()``, converted to the column types in
+:mod:`zenpy.lib.columnar_schemas` and buffered per column. Every
+``batch_size`` rows the buffer is turned into a record batch or Parquet row
+group and released, so memory is bounded by the batch size rather than the
+size of the export:
+
+.. code-block:: python
+
+    schema = ColumnarSchema('ticket', custom_fields=zenpy_client.ticket_fields())
+    with ParquetSink('tickets.parquet', schema) as sink:
+        sink.write_all(zenpy_client.tickets.incremental(start_time=start))
+
+Custom fields are flattened into one column each, named
+``custom_field_<id>`` for ticket fields and ``user_field_<key>`` or
+``organization_field_<key>`` for user and organization fields.
+
+Arrow and Parquet output require the ``pyarrow`` package.
+
+:func:`project` extracts a few columns straight from the JSON of result pages
+into compact arrays, without building objects:
+
+.. code-block:: python
+
+    columns = project(zenpy_client.tickets.incremental_pages(start_time=start),
+                      ['id', 'status', 'updated_at'], 'ticket')
+
+The columns are NumPy arrays when NumPy is installed.
+"""
+
+import json
+from array import array
+from datetime import datetime
+
+import dateutil.parser
+import pytz
+
+from zenpy.lib.columnar_schemas import SCHEMAS
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import as_plural, json_encode_for_printing
+
+__author__ = 'facetoe'
+
+ISO_8601_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Column types of custom fields by Zendesk field type, anything else is a string.
+CUSTOM_FIELD_TYPES = {
+    'checkbox': 'bool',
+    'date': 'string',
+    'decimal': 'float64',
+    'integer': 'int64',
+    'multiselect': 'list<string>',
+}
+
+# The attribute holding custom field values, and the column name prefix they
+# are flattened to, for objects whose custom fields are keyed by field key.
+KEYED_CUSTOM_FIELDS = {
+    'user': ('user_fields', 'user_field_'),
+    'organization': ('organization_fields', 'organization_field_'),
+}
+
+# array typecodes of the column types projected into arrays. Timestamps are
+# held as unix seconds.
+ARRAY_TYPECODES = {
+    'bool': 'b',
+    'float64': 'd',
+    'int64': 'q',
+    'timestamp': 'd',
+}
+
+NAN = float('nan')
+
+
+def _to_json(value):
+    return json.dumps(value, default=json_encode_for_printing, sort_keys=True)
+
+
+def _to_string(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)) or hasattr(value, '__dict__'):
+        return _to_json(value)
+    return str(value)
+
+
+def _to_timestamp(value):
+    if isinstance(value, datetime):
+        return value if value.tzinfo else pytz.utc.localize(value)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, pytz.utc)
+    try:
+        return datetime.strptime(value, ISO_8601_FORMAT).replace(tzinfo=pytz.utc)
+    except ValueError:
+        parsed = dateutil.parser.parse(value)
+        return parsed if parsed.tzinfo else pytz.utc.localize(parsed)
+
+
+def _to_list(convert):
+    def to_list(value):
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        return [convert(v) if v is not None else None for v in value]
+    return to_list
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+CONVERTERS = {
+    'bool': _to_bool,
+    'float64': float,
+    'int64': int,
+    'json': _to_json,
+    'list<int64>': _to_list(int),
+    'list<string>': _to_list(_to_string),
+    'string': _to_string,
+    'timestamp': _to_timestamp,
+}
+
+
+class ColumnarSchema(object):
+    """
+    The columns exported for an object type: the attributes from the
+    generated schema followed by one column per custom field.
+    """
+
+    def __init__(self, object_type, custom_fields=None, columns=None, exclude=()):
+        """
+        :param object_type: object type, eg ``ticket`` or ``user``
+        :param custom_fields: ticket, user or organization field objects, or
+            the ids (keys for user and organization fields) of custom fields
+            to flatten into string columns
+        :param columns: (name, type) pairs to use instead of the generated schema
+        :param exclude: names of columns to leave out
+        """
+        if columns is None:
+            if object_type not in SCHEMAS:
+                raise ZenpyException("No columnar schema for object type: {}".format(object_type))
+            columns = SCHEMAS[object_type]
+        self.object_type = object_type
+        self.columns = [(name, column_type) for name, column_type in columns
+                        if name not in exclude]
+        for name, column_type in self.columns:
+            if column_type not in CONVERTERS:
+                raise ZenpyException("Unknown column type: {}".format(column_type))
+        self.custom_field_attr, self.custom_field_prefix = KEYED_CUSTOM_FIELDS.get(
+            object_type, ('custom_fields', 'custom_field_'))
+        self.custom_fields = []
+        for field in custom_fields or ():
+            if isinstance(field, (int, str)):
+                field_id, column_type = field, 'string'
+            elif object_type in KEYED_CUSTOM_FIELDS:
+                field_id, column_type = field.key, CUSTOM_FIELD_TYPES.get(field.type, 'string')
+            else:
+                field_id, column_type = field.id, CUSTOM_FIELD_TYPES.get(field.type, 'string')
+            self.custom_fields.append(
+                (field_id, self.custom_field_prefix + str(field_id), column_type))
+
+    @property
+    def names(self):
+        return [name for name, _ in self.columns] + [name for _, name, _ in self.custom_fields]
+
+    @property
+    def types(self):
+        return [t for _, t in self.columns] + [t for _, _, t in self.custom_fields]
+
+    def arrow_schema(self):
+        """ Return the schema as a pyarrow.Schema. """
+        pa = _import_pyarrow()
+        return pa.schema([pa.field(name, _arrow_type(pa, column_type))
+                          for name, column_type in zip(self.names, self.types)])
+
+
+class ColumnBuffer(object):
+    """
+    Buffers converted rows per column until they are taken as a batch.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._converters = [(name, CONVERTERS[column_type])
+                            for name, column_type in schema.columns]
+        self._custom_converters = [(field_id, CONVERTERS[column_type])
+                                   for field_id, _, column_type in schema.custom_fields]
+        self._columns = None
+        self._rows = 0
+        self._reset()
+
+    def _reset(self):
+        self._columns = [[] for _ in self.schema.names]
+        self._rows = 0
+
+    def append(self, obj):
+        """ Add a row for obj, a Zenpy object or a dict as returned by Zendesk. """
+        # Read attributes directly, so proxies are not created and nothing is marked dirty.
+        values = obj if isinstance(obj, dict) else vars(obj)
+        columns = self._columns
+        for index, (name, convert) in enumerate(self._converters):
+            value = values.get(name)
+            columns[index].append(convert(value) if value is not None else None)
+        if self._custom_converters:
+            custom_values = self._custom_field_values(values)
+            offset = len(self._converters)
+            for index, (field_id, convert) in enumerate(self._custom_converters):
+                value = custom_values.get(field_id)
+                columns[offset + index].append(convert(value) if value is not None else None)
+        self._rows += 1
+
+    def _custom_field_values(self, values):
+        fields = values.get(self.schema.custom_field_attr)
+        if not fields:
+            return {}
+        if isinstance(fields, dict):
+            return fields
+        custom_values = {}
+        for field in fields:
+            # Raw dicts from Zendesk, or CustomField objects built from them.
+            if isinstance(field, dict):
+                custom_values[dict.get(field, 'id')] = dict.get(field, 'value')
+            else:
+                custom_values[getattr(field, 'id', None)] = getattr(field, 'value', None)
+        return custom_values
+
+    def take(self):
+        """ Return the buffered columns as a dict of lists and empty the buffer. """
+        columns = dict(zip(self.schema.names, self._columns))
+        self._reset()
+        return columns
+
+    def __len__(self):
+        return self._rows
+
+
+def column_batches(objects, schema, batch_size=10000):
+    """
+    Yield dicts mapping column name to a list of at most batch_size values.
+    """
+    buffer = ColumnBuffer(schema)
+    for obj in objects:
+        buffer.append(obj)
+        if len(buffer) >= batch_size:
+            yield buffer.take()
+    if len(buffer):
+        yield buffer.take()
+
+
+def record_batches(objects, schema, batch_size=10000):
+    """
+    Yield pyarrow.RecordBatch objects of at most batch_size rows.
+    """
+    pa = _import_pyarrow()
+    arrow_schema = schema.arrow_schema()
+    for columns in column_batches(objects, schema, batch_size):
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(columns[name], type=field.type)
+             for name, field in zip(schema.names, arrow_schema)],
+            schema=arrow_schema)
+
+
+def project(pages, fields, object_type, custom_fields=None, key=None, use_numpy=None):
+    """
+    Extract columns from the records of result pages without building objects.
+
+    Integer, float and boolean columns are held in arrays, with columns that
+    have missing values widened to float64 with NaN for the missing values.
+    Timestamps are held as unix seconds. Other columns are lists.
+
+    :param pages: iterable of pages as returned by Zendesk, eg from ``incremental_pages()``
+    :param fields: attribute names, typed by the generated schema, or
+        (name, column type) pairs for attributes the schema does not have
+    :param object_type: object type of the records, eg ``ticket``
+    :param custom_fields: custom fields to add as typed columns, as for
+        :class:`ColumnarSchema`
+    :param key: key holding the records of a page, by default the plural of
+        object_type or ``results``
+    :param use_numpy: return NumPy arrays, by default when NumPy is installed.
+        Timestamps become datetime64 arrays.
+    :return: a dict of column name to column
+    """
+    schema = ColumnarSchema(object_type, custom_fields=custom_fields,
+                            columns=_projected_columns(object_type, fields))
+    buffer = ColumnBuffer(schema)
+    columns = [ProjectedColumn(column_type) for column_type in schema.types]
+    plural = as_plural(object_type)
+    for page in pages:
+        records = page.get(key) if key else page.get(plural, page.get('results'))
+        for record in records or ():
+            buffer.append(record)
+        for column, values in zip(columns, buffer.take().values()):
+            column.extend(values)
+
+    if use_numpy is None:
+        use_numpy = _import_numpy(required=False) is not None
+    if use_numpy:
+        return dict((name, column.to_numpy()) for name, column in zip(schema.names, columns))
+    return dict((name, column.values) for name, column in zip(schema.names, columns))
+
+
+class ProjectedColumn(object):
+    """
+    A column of :func:`project`, held in an array for numeric types.
+    """
+
+    def __init__(self, column_type):
+        self.column_type = column_type
+        typecode = ARRAY_TYPECODES.get(column_type)
+        self.values = array(typecode) if typecode else []
+
+    def extend(self, values):
+        if not isinstance(self.values, array):
+            self.values.extend(values)
+            return
+        if self.column_type == 'timestamp':
+            values = [value.timestamp() if value is not None else NAN for value in values]
+        elif None in values:
+            if self.values.typecode != 'd':
+                self.values = array('d', self.values)
+            values = [value if value is not None else NAN for value in values]
+        elif self.values.typecode == 'd':
+            values = [float(value) for value in values]
+        self.values.extend(values)
+
+    def to_numpy(self):
+        numpy = _import_numpy()
+        if not isinstance(self.values, array):
+            return numpy.array(self.values, dtype=object)
+        values = numpy.frombuffer(self.values, dtype=self.values.typecode).copy()
+        if self.column_type == 'timestamp':
+            result = numpy.full(len(values), numpy.datetime64('NaT'), dtype='datetime64[s]')
+            present = ~numpy.isnan(values)
+            result[present] = values[present].astype('int64')
+            return result
+        if self.values.typecode == 'b':
+            return values.astype(bool)
+        return values
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _projected_columns(object_type, fields):
+    known = dict(SCHEMAS.get(object_type, ()))
+    columns = []
+    for field in fields:
+        if isinstance(field, tuple):
+            columns.append(field)
+        elif field in known:
+            columns.append((field, known[field]))
+        else:
+            raise ZenpyException("No column type for {}.{}, pass (name, type)".format(
+                object_type, field))
+    return columns
+
+
+class ParquetSink(object):
+    """
+    Writes objects to a Parquet file, one row group per batch_size rows.
+    """
+
+    def __init__(self, path, schema, batch_size=10000, **writer_kwargs):
+        """
+        :param path: path or file object to write to
+        :param schema: the :class:`ColumnarSchema` of the objects written
+        :param batch_size: rows per row group
+        :param writer_kwargs: passed on to pyarrow.parquet.ParquetWriter,
+            eg compression
+        """
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows = 0
+        self.row_groups = 0
+        self._arrow_schema = schema.arrow_schema()
+        self._buffer = ColumnBuffer(schema)
+        self._writer = pq.ParquetWriter(path, self._arrow_schema, **writer_kwargs)
+
+    def write(self, obj):
+        self._buffer.append(obj)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, objects):
+        for obj in objects:
+            self.write(obj)
+
+    def flush(self):
+        """ Write the buffered rows as a row group. """
+        rows = len(self._buffer)
+        if not rows:
+            return
+        columns = self._buffer.take()
+        pa = self._pa
+        table = pa.Table.from_arrays(
+            [pa.array(columns[field.name], type=field.type) for field in self._arrow_schema],
+            schema=self._arrow_schema)
+        self._writer.write_table(table, row_group_size=rows)
+        self.rows += rows
+        self.row_groups += 1
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _arrow_type(pa, column_type):
+    if column_type == 'bool':
+        return pa.bool_()
+    if column_type == 'float64':
+        return pa.float64()
+    if column_type == 'int64':
+        return pa.int64()
+    if column_type == 'timestamp':
+        return pa.timestamp('s', tz='UTC')
+    if column_type == 'list<int64>':
+        return pa.list_(pa.int64())
+    if column_type == 'list<string>':
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def _import_numpy(required=True):
+    try:
+        import numpy
+    except ImportError:
+        if required:
+            raise ZenpyException("NumPy output requires the numpy package")
+        return None
+    return numpy
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ZenpyException("Arrow and Parquet export require the pyarrow package")
+    return pyarrow
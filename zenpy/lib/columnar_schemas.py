@@ -0,0 +1,858 @@
+"""
+Column types of Zendesk objects, used by :mod:`zenpy.lib.columnar`.
+
+######################################################################
+#    Do not modify, this file is autogenerated by gen_schemas.py     #
+######################################################################
+"""
+
+SCHEMAS = {
+    'activity': (
+        ('actor', 'string'),
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('title', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('user', 'string'),
+        ('verb', 'string'),
+    ),
+    'agent_macro_reference': (
+        ('id', 'int64'),
+        ('macro_id', 'string'),
+        ('macro_title', 'string'),
+        ('type', 'string'),
+        ('via', 'json'),
+    ),
+    'attachment': (
+        ('content_type', 'string'),
+        ('content_url', 'string'),
+        ('file_name', 'string'),
+        ('id', 'int64'),
+        ('size', 'int64'),
+        ('thumbnails', 'json'),
+    ),
+    'audit': (
+        ('author_id', 'int64'),
+        ('created_at', 'timestamp'),
+        ('events', 'json'),
+        ('id', 'int64'),
+        ('metadata', 'json'),
+        ('ticket_id', 'int64'),
+        ('via', 'json'),
+    ),
+    'automation': (
+        ('actions', 'json'),
+        ('active', 'bool'),
+        ('conditions', 'json'),
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('position', 'int64'),
+        ('raw_title', 'string'),
+        ('title', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'brand': (
+        ('active', 'bool'),
+        ('brand_url', 'string'),
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('has_help_center', 'bool'),
+        ('help_center_state', 'string'),
+        ('host_mapping', 'string'),
+        ('id', 'int64'),
+        ('logo', 'json'),
+        ('name', 'string'),
+        ('subdomain', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'cc_event': (
+        ('id', 'int64'),
+        ('recipients', 'list<int64>'),
+        ('type', 'string'),
+        ('via', 'json'),
+    ),
+    'change_event': (
+        ('field_name', 'string'),
+        ('id', 'int64'),
+        ('previous_value', 'string'),
+        ('type', 'string'),
+        ('value', 'string'),
+    ),
+    'comment': (
+        ('attachments', 'json'),
+        ('author_id', 'int64'),
+        ('body', 'string'),
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('metadata', 'json'),
+        ('public', 'bool'),
+        ('type', 'string'),
+        ('via', 'json'),
+    ),
+    'comment_privacy_change_event': (
+        ('comment_id', 'int64'),
+        ('id', 'int64'),
+        ('public', 'bool'),
+        ('type', 'string'),
+    ),
+    'conditions': (
+        ('all', 'json'),
+        ('any', 'json'),
+    ),
+    'create_event': (
+        ('field_name', 'string'),
+        ('id', 'int64'),
+        ('type', 'string'),
+        ('value', 'string'),
+    ),
+    'custom_agent_role': (
+        ('configuration', 'json'),
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('role_type', 'int64'),
+        ('updated_at', 'timestamp'),
+    ),
+    'custom_field': (
+        ('id', 'int64'),
+        ('value', 'string'),
+    ),
+    'custom_field_option': (
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('position', 'int64'),
+        ('raw_name', 'string'),
+        ('url', 'string'),
+        ('value', 'string'),
+    ),
+    'custom_status': (
+        ('active', 'bool'),
+        ('agent_label', 'string'),
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('description', 'string'),
+        ('end_user_description', 'string'),
+        ('end_user_label', 'string'),
+        ('id', 'int64'),
+        ('raw_agent_label', 'string'),
+        ('raw_description', 'string'),
+        ('raw_end_user_description', 'string'),
+        ('raw_end_user_label', 'string'),
+        ('status_category', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'definitions': (
+        ('all', 'json'),
+        ('any', 'json'),
+    ),
+    'error_event': (
+        ('id', 'int64'),
+        ('message', 'int64'),
+        ('type', 'string'),
+    ),
+    'export': (
+        ('status', 'string'),
+        ('view_id', 'int64'),
+    ),
+    'external_event': (
+        ('body', 'string'),
+        ('id', 'int64'),
+        ('resource', 'int64'),
+        ('type', 'string'),
+    ),
+    'facebook_comment_event': (
+        ('attachments', 'json'),
+        ('author_id', 'int64'),
+        ('body', 'string'),
+        ('data', 'json'),
+        ('graph_object_id', 'string'),
+        ('html_body', 'string'),
+        ('id', 'int64'),
+        ('public', 'bool'),
+        ('trusted', 'bool'),
+        ('type', 'string'),
+    ),
+    'facebook_event': (
+        ('body', 'string'),
+        ('communication', 'int64'),
+        ('id', 'int64'),
+        ('page', 'json'),
+        ('ticket_via', 'string'),
+        ('type', 'string'),
+    ),
+    'group': (
+        ('created_at', 'timestamp'),
+        ('deleted', 'bool'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'group_membership': (
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('group_id', 'int64'),
+        ('id', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('user_id', 'int64'),
+    ),
+    'identity': (
+        ('created_at', 'timestamp'),
+        ('deliverable_state', 'string'),
+        ('id', 'int64'),
+        ('primary', 'bool'),
+        ('type', 'string'),
+        ('undeliverable_count', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('user_id', 'int64'),
+        ('value', 'string'),
+        ('verified', 'bool'),
+    ),
+    'invocation': (
+        ('id', 'string'),
+        ('latest_completed_at', 'timestamp'),
+        ('status', 'string'),
+        ('status_code', 'int64'),
+    ),
+    'invocation_attempt': (
+        ('completed_at', 'timestamp'),
+        ('id', 'string'),
+        ('invocation_id', 'string'),
+        ('request', 'json'),
+        ('response', 'json'),
+        ('status', 'string'),
+        ('status_code', 'int64'),
+    ),
+    'item': (
+        ('created_at', 'timestamp'),
+        ('default_locale_id', 'int64'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('outdated', 'bool'),
+        ('placeholder', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('variants', 'json'),
+    ),
+    'job_status': (
+        ('id', 'string'),
+        ('message', 'string'),
+        ('progress', 'int64'),
+        ('results', 'json'),
+        ('status', 'string'),
+        ('total', 'int64'),
+        ('url', 'string'),
+    ),
+    'job_status_result': (
+        ('action', 'string'),
+        ('errors', 'string'),
+        ('id', 'int64'),
+        ('status', 'string'),
+        ('success', 'bool'),
+        ('title', 'string'),
+    ),
+    'link': (
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('issue_id', 'string'),
+        ('issue_key', 'string'),
+        ('ticket_id', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'locale': (
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('id', 'int64'),
+        ('locale', 'string'),
+        ('name', 'string'),
+        ('native_name', 'string'),
+        ('presentation_name', 'string'),
+        ('rtl', 'bool'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'logmein_transcript_event': (
+        ('body', 'string'),
+        ('id', 'int64'),
+        ('type', 'string'),
+    ),
+    'macro': (
+        ('actions', 'json'),
+        ('active', 'bool'),
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('id', 'int64'),
+        ('position', 'int64'),
+        ('restriction', 'string'),
+        ('title', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'macro_result': (
+        ('ticket', 'json'),
+    ),
+    'metadata': (
+        ('custom', 'json'),
+        ('system', 'json'),
+    ),
+    'notification_event': (
+        ('body', 'string'),
+        ('id', 'int64'),
+        ('recipients', 'list<int64>'),
+        ('subject', 'string'),
+        ('type', 'string'),
+        ('via', 'json'),
+    ),
+    'organization': (
+        ('created_at', 'timestamp'),
+        ('details', 'string'),
+        ('domain_names', 'json'),
+        ('external_id', 'string'),
+        ('group_id', 'int64'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('notes', 'string'),
+        ('organization_fields', 'json'),
+        ('shared_comments', 'bool'),
+        ('shared_tickets', 'bool'),
+        ('tags', 'list<string>'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'organization_activity_event': (
+        ('body', 'string'),
+        ('id', 'int64'),
+        ('recipients', 'list<int64>'),
+        ('subject', 'string'),
+        ('type', 'string'),
+        ('via', 'json'),
+    ),
+    'organization_field': (
+        ('active', 'bool'),
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('id', 'int64'),
+        ('key', 'string'),
+        ('position', 'int64'),
+        ('raw_description', 'string'),
+        ('raw_title', 'string'),
+        ('regexp_for_validation', 'string'),
+        ('title', 'string'),
+        ('type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'organization_membership': (
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('id', 'int64'),
+        ('organization_id', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('user_id', 'int64'),
+    ),
+    'policy_metric': (
+        ('business_hours', 'bool'),
+        ('metric', 'string'),
+        ('priority', 'string'),
+        ('target', 'int64'),
+    ),
+    'push_event': (
+        ('id', 'int64'),
+        ('type', 'string'),
+        ('value', 'string'),
+        ('value_reference', 'string'),
+    ),
+    'recipient': (
+        ('created_at', 'timestamp'),
+        ('delivered_at', 'timestamp'),
+        ('delivery_id', 'int64'),
+        ('id', 'int64'),
+        ('survey_id', 'int64'),
+        ('survey_name', 'string'),
+        ('updated_at', 'timestamp'),
+        ('user_email', 'string'),
+        ('user_id', 'int64'),
+        ('user_name', 'string'),
+    ),
+    'recipient_address': (
+        ('brand_id', 'int64'),
+        ('created_at', 'timestamp'),
+        ('default', 'string'),
+        ('email', 'string'),
+        ('forwarding_status', 'string'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('spf_status', 'string'),
+        ('updated_at', 'timestamp'),
+    ),
+    'request': (
+        ('assignee_id', 'int64'),
+        ('can_be_solved_by_me', 'bool'),
+        ('collaborator_ids', 'list<int64>'),
+        ('created_at', 'timestamp'),
+        ('custom_fields', 'json'),
+        ('description', 'string'),
+        ('due_at', 'timestamp'),
+        ('fields', 'json'),
+        ('id', 'int64'),
+        ('organization_id', 'int64'),
+        ('priority', 'string'),
+        ('requester_id', 'int64'),
+        ('status', 'string'),
+        ('subject', 'string'),
+        ('type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('via', 'json'),
+    ),
+    'response': (
+        ('comment', 'string'),
+        ('delivered_at', 'timestamp'),
+        ('delivery_id', 'int64'),
+        ('id', 'int64'),
+        ('rated_at', 'timestamp'),
+        ('rating', 'int64'),
+        ('recipient_id', 'int64'),
+        ('survey_id', 'int64'),
+        ('survey_name', 'string'),
+        ('user_email', 'string'),
+        ('user_id', 'int64'),
+        ('user_name', 'string'),
+    ),
+    'satisfaction_rating': (
+        ('assignee_id', 'int64'),
+        ('created_at', 'timestamp'),
+        ('group_id', 'int64'),
+        ('id', 'int64'),
+        ('requester_id', 'int64'),
+        ('score', 'string'),
+        ('ticket_id', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'satisfaction_rating_event': (
+        ('assignee_id', 'int64'),
+        ('body', 'string'),
+        ('id', 'int64'),
+        ('score', 'string'),
+        ('type', 'string'),
+    ),
+    'schedule': (
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('intervals', 'json'),
+        ('name', 'string'),
+        ('time_zone', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'sharing_agreement': (
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('name', 'string'),
+        ('partner_name', 'string'),
+        ('remote_subdomain', 'string'),
+        ('status', 'string'),
+        ('type', 'string'),
+    ),
+    'skip': (
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('reason', 'string'),
+        ('ticket', 'json'),
+        ('ticket_id', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('user_id', 'int64'),
+    ),
+    'sla_policy': (
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('filter', 'json'),
+        ('id', 'int64'),
+        ('policy_metrics', 'json'),
+        ('position', 'int64'),
+        ('title', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'source': (
+        ('from', 'json'),
+        ('rel', 'string'),
+        ('to', 'json'),
+    ),
+    'status': (
+        ('action', 'string'),
+        ('errors', 'string'),
+        ('id', 'int64'),
+        ('status', 'string'),
+        ('success', 'bool'),
+        ('title', 'string'),
+    ),
+    'suspended_ticket': (
+        ('author', 'json'),
+        ('brand_id', 'int64'),
+        ('cause', 'string'),
+        ('content', 'string'),
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('recipient', 'string'),
+        ('subject', 'string'),
+        ('ticket_id', 'int64'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('via', 'json'),
+    ),
+    'system': (
+        ('client', 'string'),
+        ('ip_address', 'string'),
+        ('latitude', 'float64'),
+        ('location', 'string'),
+        ('longitude', 'float64'),
+    ),
+    'tag': (
+        ('count', 'int64'),
+        ('name', 'string'),
+    ),
+    'target': (
+        ('active', 'bool'),
+        ('content_type', 'string'),
+        ('created_at', 'timestamp'),
+        ('id', 'int64'),
+        ('method', 'string'),
+        ('password', 'string'),
+        ('target_url', 'string'),
+        ('title', 'string'),
+        ('type', 'string'),
+        ('url', 'string'),
+        ('username', 'string'),
+    ),
+    'thumbnail': (
+        ('content_type', 'string'),
+        ('content_url', 'string'),
+        ('file_name', 'string'),
+        ('id', 'int64'),
+        ('size', 'int64'),
+    ),
+    'ticket': (
+        ('assignee_id', 'int64'),
+        ('brand_id', 'int64'),
+        ('collaborator_ids', 'list<int64>'),
+        ('created_at', 'timestamp'),
+        ('custom_fields', 'json'),
+        ('description', 'string'),
+        ('due_at', 'timestamp'),
+        ('external_id', 'string'),
+        ('fields', 'json'),
+        ('forum_topic_id', 'int64'),
+        ('group_id', 'int64'),
+        ('has_incidents', 'bool'),
+        ('id', 'int64'),
+        ('organization_id', 'int64'),
+        ('priority', 'string'),
+        ('problem_id', 'int64'),
+        ('raw_subject', 'string'),
+        ('recipient', 'string'),
+        ('requester_id', 'int64'),
+        ('satisfaction_rating', 'json'),
+        ('sharing_agreement_ids', 'list<int64>'),
+        ('status', 'string'),
+        ('subject', 'string'),
+        ('submitter_id', 'int64'),
+        ('tags', 'list<string>'),
+        ('type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('via', 'json'),
+    ),
+    'ticket_audit': (
+        ('audit', 'json'),
+        ('ticket', 'json'),
+    ),
+    'ticket_event': (
+        ('child_events', 'json'),
+        ('id', 'int64'),
+        ('ticket_id', 'int64'),
+        ('timestamp', 'int64'),
+        ('updater_id', 'int64'),
+        ('via', 'string'),
+    ),
+    'ticket_field': (
+        ('active', 'bool'),
+        ('collapsed_for_agents', 'bool'),
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('editable_in_portal', 'bool'),
+        ('id', 'int64'),
+        ('position', 'int64'),
+        ('raw_description', 'string'),
+        ('raw_title', 'string'),
+        ('raw_title_in_portal', 'string'),
+        ('regexp_for_validation', 'string'),
+        ('required', 'bool'),
+        ('required_in_portal', 'bool'),
+        ('tag', 'string'),
+        ('title', 'string'),
+        ('title_in_portal', 'string'),
+        ('type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('visible_in_portal', 'bool'),
+    ),
+    'ticket_form': (
+        ('active', 'bool'),
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('display_name', 'string'),
+        ('end_user_visible', 'bool'),
+        ('id', 'int64'),
+        ('in_all_brands', 'bool'),
+        ('in_all_organizations', 'bool'),
+        ('name', 'string'),
+        ('position', 'int64'),
+        ('raw_display_name', 'string'),
+        ('raw_name', 'string'),
+        ('restricted_brand_ids', 'list<int64>'),
+        ('restricted_organization_ids', 'list<int64>'),
+        ('ticket_field_ids', 'list<int64>'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'ticket_metric': (
+        ('agent_wait_time_in_minutes', 'json'),
+        ('assigned_at', 'timestamp'),
+        ('assignee_stations', 'int64'),
+        ('assignee_updated_at', 'timestamp'),
+        ('created_at', 'timestamp'),
+        ('first_resolution_time_in_minutes', 'json'),
+        ('full_resolution_time_in_minutes', 'json'),
+        ('group_stations', 'int64'),
+        ('id', 'int64'),
+        ('initially_assigned_at', 'timestamp'),
+        ('latest_comment_added_at', 'timestamp'),
+        ('on_hold_time_in_minutes', 'json'),
+        ('reopens', 'int64'),
+        ('replies', 'int64'),
+        ('reply_time_in_minutes', 'json'),
+        ('requester_updated_at', 'timestamp'),
+        ('requester_wait_time_in_minutes', 'json'),
+        ('solved_at', 'timestamp'),
+        ('status_updated_at', 'timestamp'),
+        ('ticket_id', 'int64'),
+        ('updated_at', 'timestamp'),
+    ),
+    'ticket_metric_event': (
+        ('deleted', 'bool'),
+        ('id', 'int64'),
+        ('instance_id', 'int64'),
+        ('metric', 'string'),
+        ('sla', 'json'),
+        ('status', 'json'),
+        ('ticket_id', 'int64'),
+        ('time', 'timestamp'),
+        ('type', 'string'),
+    ),
+    'ticket_metric_item': (
+        ('business', 'int64'),
+        ('calendar', 'int64'),
+    ),
+    'ticket_sharing_event': (
+        ('action', 'string'),
+        ('agreement_id', 'int64'),
+        ('id', 'int64'),
+        ('type', 'string'),
+    ),
+    'topic': (
+        ('body', 'string'),
+        ('created_at', 'timestamp'),
+        ('forum_id', 'int64'),
+        ('id', 'int64'),
+        ('locked', 'bool'),
+        ('pinned', 'bool'),
+        ('position', 'int64'),
+        ('search_phrases', 'list<string>'),
+        ('submitter_id', 'int64'),
+        ('tags', 'list<string>'),
+        ('title', 'string'),
+        ('topic_type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('updater_id', 'int64'),
+        ('url', 'string'),
+    ),
+    'trigger': (
+        ('actions', 'json'),
+        ('active', 'bool'),
+        ('conditions', 'json'),
+        ('description', 'string'),
+        ('id', 'int64'),
+        ('position', 'int64'),
+        ('title', 'string'),
+    ),
+    'tweet_event': (
+        ('body', 'string'),
+        ('direct_message', 'bool'),
+        ('id', 'int64'),
+        ('recipients', 'list<int64>'),
+        ('type', 'string'),
+    ),
+    'upload': (
+        ('attachment', 'json'),
+        ('attachments', 'json'),
+        ('expires_at', 'timestamp'),
+        ('token', 'string'),
+    ),
+    'user': (
+        ('active', 'bool'),
+        ('alias', 'string'),
+        ('chat_only', 'bool'),
+        ('created_at', 'timestamp'),
+        ('custom_role_id', 'int64'),
+        ('details', 'string'),
+        ('email', 'string'),
+        ('external_id', 'string'),
+        ('id', 'int64'),
+        ('last_login_at', 'timestamp'),
+        ('locale', 'string'),
+        ('locale_id', 'int64'),
+        ('moderator', 'bool'),
+        ('name', 'string'),
+        ('notes', 'string'),
+        ('only_private_comments', 'bool'),
+        ('organization_id', 'int64'),
+        ('phone', 'string'),
+        ('photo', 'string'),
+        ('restricted_agent', 'bool'),
+        ('role', 'string'),
+        ('shared', 'bool'),
+        ('shared_agent', 'bool'),
+        ('signature', 'string'),
+        ('suspended', 'bool'),
+        ('tags', 'list<string>'),
+        ('ticket_restriction', 'string'),
+        ('time_zone', 'string'),
+        ('two_factor_auth_enabled', 'bool'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+        ('user_fields', 'json'),
+        ('verified', 'bool'),
+    ),
+    'user_field': (
+        ('active', 'bool'),
+        ('created_at', 'timestamp'),
+        ('description', 'string'),
+        ('id', 'int64'),
+        ('key', 'string'),
+        ('position', 'int64'),
+        ('raw_description', 'string'),
+        ('raw_title', 'string'),
+        ('regexp_for_validation', 'string'),
+        ('title', 'string'),
+        ('type', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'user_related': (
+        ('assigned_tickets', 'int64'),
+        ('ccd_tickets', 'int64'),
+        ('entry_subscriptions', 'int64'),
+        ('forum_subscriptions', 'int64'),
+        ('organization_subscriptions', 'int64'),
+        ('requested_tickets', 'int64'),
+        ('subscriptions', 'int64'),
+        ('topic_comments', 'int64'),
+        ('topics', 'int64'),
+        ('votes', 'int64'),
+    ),
+    'variant': (
+        ('active', 'bool'),
+        ('content', 'string'),
+        ('created_at', 'timestamp'),
+        ('default', 'bool'),
+        ('id', 'int64'),
+        ('locale_id', 'int64'),
+        ('outdated', 'bool'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'via': (
+        ('source', 'json'),
+    ),
+    'view': (
+        ('active', 'bool'),
+        ('conditions', 'json'),
+        ('created_at', 'timestamp'),
+        ('execution', 'json'),
+        ('id', 'int64'),
+        ('position', 'int64'),
+        ('raw_title', 'string'),
+        ('restriction', 'string'),
+        ('sla_id', 'int64'),
+        ('title', 'string'),
+        ('updated_at', 'timestamp'),
+        ('url', 'string'),
+    ),
+    'view_count': (
+        ('channel', 'string'),
+        ('fresh', 'bool'),
+        ('poll_wait', 'int64'),
+        ('pretty', 'string'),
+        ('refresh', 'string'),
+        ('url', 'string'),
+        ('value', 'int64'),
+        ('view_id', 'int64'),
+    ),
+    'view_row': (
+        ('created', 'timestamp'),
+        ('custom_fields', 'json'),
+        ('fields', 'json'),
+        ('group_id', 'int64'),
+        ('priority', 'string'),
+        ('requester_id', 'int64'),
+        ('score', 'int64'),
+        ('subject', 'string'),
+        ('ticket', 'json'),
+    ),
+    'voice_comment_event': (
+        ('attachments', 'json'),
+        ('author_id', 'int64'),
+        ('body', 'string'),
+        ('data', 'json'),
+        ('formatted_from', 'string'),
+        ('formatted_to', 'string'),
+        ('html_body', 'string'),
+        ('id', 'int64'),
+        ('public', 'bool'),
+        ('transcription_visible', 'bool'),
+        ('trusted', 'bool'),
+        ('type', 'string'),
+    ),
+    'webhook': (
+        ('authentication', 'json'),
+        ('created_at', 'timestamp'),
+        ('created_by', 'string'),
+        ('description', 'string'),
+        ('endpoint', 'string'),
+        ('external_source', 'json'),
+        ('http_method', 'string'),
+        ('id', 'string'),
+        ('name', 'string'),
+        ('request_format', 'string'),
+        ('signing_secret', 'json'),
+        ('status', 'string'),
+        ('subscriptions', 'list<string>'),
+        ('updated_at', 'timestamp'),
+        ('updated_by', 'string'),
+    ),
+    'webhook_secret': (
+        ('algorithm', 'string'),
+        ('secret', 'string'),
+    ),
+}
@@ -0,0 +1,179 @@
+"""
+Fast access to the custom field values of tickets, users and organizations.
+
+Ticket custom fields are a list of ``{id, value}`` dicts, so finding one
+value means scanning the list. :func:`get_custom_field` builds an index of
+field id to position the first time a fetched ticket is read, kept until
+the list changes, and reads values without wrapping them in proxies. A :class:`CustomFieldIndex` also looks up
+fields by title, from the field definitions fetched once:
+
+.. code-block:: python
+
+    fields = CustomFieldIndex(zenpy_client.ticket_fields())
+    for ticket in zenpy_client.tickets.incremental(start_time=start):
+        if fields.get(ticket, 'Region') == 'EMEA':
+            fields.set(ticket, 'Queue', 'emea_tier_1')
+            zenpy_client.tickets.update(ticket)
+
+User and organization fields are dicts keyed by field key, so they are read
+directly. Values are set through the proxies, so changed fields are sent to
+Zendesk by ``update()``.
+"""
+
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import get_object_type
+
+__author__ = 'facetoe'
+
+# The attribute holding the custom field values of objects whose fields are
+# keyed by field key rather than listed by id.
+KEYED_FIELDS = {
+    'user': 'user_fields',
+    'organization': 'organization_fields',
+}
+
+# The object type whose fields each type of field definition describes.
+FIELD_OWNERS = {
+    'ticket_field': 'ticket',
+    'user_field': 'user',
+    'organization_field': 'organization',
+}
+
+
+def get_custom_field(obj, field, default=None):
+    """
+    Return the value of a custom field of obj, or default if obj does not
+    have the field.
+
+    :param obj: a Ticket, User or Organization
+    :param field: the field id for tickets, or the field key for users and organizations
+    """
+    attr = KEYED_FIELDS.get(get_object_type(obj))
+    values = vars(obj).get(attr or 'custom_fields')
+    if not values:
+        return default
+    if attr is not None:
+        return dict.get(values, field, default)
+    position = _position(obj, values, field)
+    if position is None:
+        return default
+    return _field_attr(list.__getitem__(values, position), 'value')
+
+
+def set_custom_field(obj, field, value):
+    """
+    Set the value of a custom field of obj, adding the field if obj does
+    not have it yet. The change is sent to Zendesk when obj is updated.
+
+    :param obj: a Ticket, User or Organization
+    :param field: the field id for tickets, or the field key for users and organizations
+    """
+    attr = KEYED_FIELDS.get(get_object_type(obj))
+    values = vars(obj).get(attr or 'custom_fields')
+    if attr is not None:
+        if values is None:
+            setattr(obj, attr, {field: value})
+        else:
+            values[field] = value
+        return
+    if values is None:
+        obj.custom_fields = [dict(id=field, value=value)]
+        return
+    position = _position(obj, values, field)
+    if position is None:
+        position = len(values)
+        values.append(dict(id=field, value=value))
+    else:
+        element = list.__getitem__(values, position)
+        if isinstance(element, dict):
+            element = dict(element, value=value)
+        else:
+            element.value = value
+        # Replaced through the list, so a ProxyList is marked as modified.
+        values[position] = element
+    _index_changed(obj, values, field, position)
+
+
+def _position(obj, fields, field_id):
+    """
+    Return the position of field_id in the custom fields list of obj, or
+    None. The index is rebuilt when the list is replaced or changed, which
+    a ProxyList records in its _version. Plain lists can change without
+    notice, so they are scanned instead.
+    """
+    version = getattr(fields, '_version', None)
+    if version is None:
+        for position, element in enumerate(fields):
+            if _field_attr(element, 'id') == field_id:
+                return position
+        return None
+    cached = obj.__dict__.get('_custom_field_positions')
+    if cached is not None and cached[0] is fields and cached[1] == version:
+        return cached[2].get(field_id)
+    positions = dict((_field_attr(element, 'id'), position)
+                     for position, element in enumerate(list.__iter__(fields)))
+    obj.__dict__['_custom_field_positions'] = (fields, version, positions)
+    return positions.get(field_id)
+
+
+def _index_changed(obj, fields, field_id, position):
+    """
+    Keep the index of a ProxyList current after set_custom_field changed
+    the field at position, so the next read does not rebuild it.
+    """
+    cached = obj.__dict__.get('_custom_field_positions')
+    version = getattr(fields, '_version', None)
+    if cached is not None and cached[0] is fields and version is not None:
+        cached[2][field_id] = position
+        obj.__dict__['_custom_field_positions'] = (fields, version, cached[2])
+
+
+def _field_attr(element, name):
+    if isinstance(element, dict):
+        return dict.get(element, name)
+    return getattr(element, name, None)
+
+
+class CustomFieldIndex(object):
+    """
+    Looks up custom field values by field title, id or key, using field
+    definitions fetched once, eg from ``zenpy_client.ticket_fields()``.
+    """
+
+    def __init__(self, fields):
+        """
+        :param fields: TicketField, UserField or OrganizationField objects
+        """
+        self.object_type = None
+        self.ids = dict()
+        self.fields = dict()
+        for field in fields:
+            object_type = FIELD_OWNERS.get(get_object_type(field))
+            if object_type is None or self.object_type not in (None, object_type):
+                raise ZenpyException("Cannot index field: {}".format(field))
+            self.object_type = object_type
+            # Tickets list values by field id, users and organizations by key.
+            target = field.key if object_type in KEYED_FIELDS else field.id
+            self.fields[target] = field
+            for name in (field.id, getattr(field, 'key', None), field.title):
+                if name is not None:
+                    self.ids.setdefault(name, target)
+
+    def field_id(self, name):
+        """ Return the id, or key for user and organization fields, of a field title, id or key. """
+        try:
+            return self.ids[name]
+        except KeyError:
+            raise ZenpyException("No such {} field: {}".format(self.object_type, name))
+
+    def get(self, obj, name, default=None):
+        """ Return the value of the field with title, id or key name. """
+        return get_custom_field(obj, self.field_id(name), default)
+
+    def set(self, obj, name, value):
+        """ Set the value of the field with title, id or key name. """
+        set_custom_field(obj, self.field_id(name), value)
+
+    def values(self, obj, names):
+        """ Return a dict of the values of each field in names. """
+        return dict((name, self.get(obj, name)) for name in names)
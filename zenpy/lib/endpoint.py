@@ -31,6 +31,12 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Characters left as they are in query keys, eg page[size], and in values.
+# Everything else in a value is escaped, including & = + and , so a value
+# can never split into further parameters or list items.
+QUERY_KEY_SAFE_CHARS = "[]"
+QUERY_VALUE_SAFE_CHARS = "/"
+
 
 class Url(object):
     def __init__(self, path, params=None, netloc=None):
@@ -40,24 +46,47 @@ class Url(object):
         self.netloc = netloc
 
     def build(self):
-        query = "&".join(
-            {"{}={}".format(k, v)
-             for k, v in self.params.items()})
+        """
+        Build the URL. Parameters are sorted by name so the same request
+        always produces the same URL, which lets it be used as a cache key.
+        """
         return urlunsplit(
             SplitResult(scheme=self.scheme,
                         netloc=self.netloc,
                         path=self.path,
-                        query=query,
+                        query=self.query,
                         fragment=None))
 
+    @property
+    def query(self):
+        """
+        Lists are sent comma separated, except under keys ending in ``[]``
+        such as ``role[]``, which are repeated once per item.
+        """
+        pairs = []
+        for key, value in sorted(self.params.items()):
+            key = quote(unicode(key), safe=QUERY_KEY_SAFE_CHARS)
+            if not isinstance(value, (list, tuple)):
+                pairs.append("{}={}".format(key, self._quote_value(value)))
+            elif key.endswith('[]'):
+                pairs.extend("{}={}".format(key, self._quote_value(item)) for item in value)
+            else:
+                pairs.append("{}={}".format(key, ",".join(self._quote_value(item)
+                                                          for item in value)))
+        return "&".join(pairs)
+
+    @staticmethod
+    def _quote_value(value):
+        return quote(unicode(value), safe=QUERY_VALUE_SAFE_CHARS)
+
     def prefix_path(self, prefix):
         self.path = "{}/{}".format(prefix, self.path)
 
     def __str__(self):
         return "{}({})".format(
             type(self).__name__,
-            ", ".join({"{}={}".format(k, v)
-                       for k, v in vars(self).items()}))
+            ", ".join("{}={}".format(k, v)
+                      for k, v in sorted(vars(self).items())))
 
 
 class BaseEndpoint(object):
@@ -81,25 +110,25 @@ class PrimaryEndpoint(BaseEndpoint):
                 path += "/{}.json".format(value)
             elif key == 'ids':
                 path += '/show_many.json'
-                parameters[key] = ",".join(map(str, value))
+                parameters[key] = list(map(str, value))
             elif key == 'destroy_ids':
                 path += '/destroy_many.json'
-                parameters['ids'] = ",".join(map(str, value))
+                parameters['ids'] = list(map(str, value))
             elif key == 'create_many':
                 path += '/create_many.json'
             elif key == '/create_or_update_many':
                 path = self.endpoint
             elif key == 'recover_ids':
                 path += '/recover_many.json'
-                parameters['ids'] = ",".join(map(str, value))
+                parameters['ids'] = list(map(str, value))
             elif key == 'restore_ids':
                 path += '/restore_many.json'
-                parameters['ids'] = ",".join(map(str, value))
+                parameters['ids'] = list(map(str, value))
             elif key == 'update_many':
                 path += '/update_many.json'
             elif key == 'count_many':
                 path += '/count_many.json'
-                parameters[key] = ",".join(map(str, value))
+                parameters[key] = list(map(str, value))
             elif key == 'external_id' and path == 'tickets':
                 parameters[key] = value
             elif key in ('external_id', 'external_ids'):
@@ -107,15 +136,15 @@ class PrimaryEndpoint(BaseEndpoint):
                     value
                 ] if not is_iterable_but_not_string(value) else value
                 path += '/show_many.json'
-                parameters['external_ids'] = ",".join(external_ids)
+                parameters['external_ids'] = list(external_ids)
             elif key == 'update_many_external':
                 path += '/update_many.json'
-                parameters['external_ids'] = ",".join(map(str, value))
+                parameters['external_ids'] = list(map(str, value))
             elif key == 'destroy_many_external':
                 path += '/destroy_many.json'
-                parameters['external_ids'] = ",".join(map(str, value))
+                parameters['external_ids'] = list(map(str, value))
             elif key == 'label_names':
-                parameters[key] = ",".join(value)
+                parameters[key] = list(value)
             elif key in (
                     'sort_by',
                     'sort_order',
@@ -132,7 +161,7 @@ class PrimaryEndpoint(BaseEndpoint):
                 parameters[key] = str(value).lower()
             elif key == 'include':
                 if is_iterable_but_not_string(value):
-                    parameters[key] = ",".join(value)
+                    parameters[key] = list(value)
                 elif value:
                     parameters[key] = value
             elif key in ('since_id', 'ticket_id',
@@ -141,14 +170,13 @@ class PrimaryEndpoint(BaseEndpoint):
 
             # this is a bit of a hack
             elif key == 'role':
-                if isinstance(value, basestring) or len(value) == 1:
+                if isinstance(value, basestring):
                     parameters['role[]'] = value
                 else:
-                    parameters['role[]'] = value[0] + '&' + "&".join(
-                        ('role[]={}'.format(role) for role in value[1:]))
+                    parameters['role[]'] = list(value)
             elif key.endswith('ids'):
                 # if it looks like a type of unknown id, send it through as such
-                parameters[key] = ",".join(map(str, value))
+                parameters[key] = list(map(str, value))
             elif key == 'cursor_pagination' and value:
                 if value is True:
                     cursor_pagination_value_requested = 100
@@ -224,7 +252,7 @@ class IncrementalEndpoint(BaseEndpoint):
             params["per_page"] = per_page
         if include is not None:
             if is_iterable_but_not_string(include):
-                params.update(dict(include=",".join(include)))
+                params.update(dict(include=list(include)))
             else:
                 params.update(dict(include=include))
         return Url(self.endpoint, params=params)
@@ -368,7 +396,7 @@ class SearchEndpoint(BaseEndpoint):
         search_query.extend(modifiers)
         if query is not None:
             search_query.insert(0, query)
-        params['query'] = quote(' '.join(search_query))
+        params['query'] = ' '.join(search_query)
         return Url(self.endpoint, params)
 
     def format_between(self, key, values):
@@ -425,7 +453,7 @@ class HelpDeskSearchEndpoint(BaseEndpoint):
                 processed_kwargs[key] = value.strftime(
                     self.ZENDESK_DATE_FORMAT)
             elif is_iterable_but_not_string(value):
-                processed_kwargs[key] = ",".join(value)
+                processed_kwargs[key] = list(value)
             else:
                 processed_kwargs[key] = value
         processed_kwargs['query'] = query
@@ -482,7 +510,7 @@ class MacroEndpoint(BaseEndpoint):
                 path += "/{}.json".format(value)
             elif key == 'destroy_ids':
                 path += '/destroy_many.json'
-                params['ids'] = ",".join(map(str, value))
+                params['ids'] = list(map(str, value))
             elif key == 'cursor_pagination' and value:
                 if value is True:
                     params['page[size]'] = 100
@@ -512,7 +540,7 @@ class ChatEndpoint(BaseEndpoint):
         params = dict()
         if 'ids' in kwargs:
             endpoint_path = self.endpoint
-            params['ids'] = ','.join(kwargs['ids'])
+            params['ids'] = list(kwargs['ids'])
         else:
             for key, value in kwargs.items():
                 if key == 'email':
@@ -0,0 +1,179 @@
+"""
+HTTP response cache for conditional GET requests.
+
+Configuration endpoints such as ticket fields, brands and groups are read
+often and rarely change. With an :class:`ETagCache` configured, responses from
+those endpoints are stored together with their ``ETag`` and ``Last-Modified``
+headers. Later requests for the same URL send ``If-None-Match`` and
+``If-Modified-Since``. If Zendesk answers ``304 Not Modified``, the stored body
+is used instead of transferring it again.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from threading import Lock
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from zenpy.lib.util import canonical_url
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+# The first path segment, after the api prefix, of endpoints cached by default.
+DEFAULT_ENDPOINTS = frozenset((
+    'brands',
+    'custom_statuses',
+    'groups',
+    'locales',
+    'macros',
+    'organization_fields',
+    'slas',
+    'ticket_fields',
+    'ticket_forms',
+    'user_fields',
+    'views',
+))
+
+# Headers describing the encoding of the body on the wire, which do not apply
+# to the decoded body that is stored.
+ENCODING_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+class ETagCache(object):
+    """
+    Stores GET responses that carry an ``ETag`` or ``Last-Modified`` header,
+    and answers ``304 Not Modified`` responses from the store.
+
+    The store is SQLite, so passing a file path keeps it across runs and
+    shares it between processes. The default keeps it in memory.
+    """
+
+    def __init__(self, path=':memory:', endpoints=DEFAULT_ENDPOINTS, api_prefix='api/v2'):
+        """
+        :param path: path of the SQLite database, or ``:memory:``
+        :param endpoints: first path segments of the endpoints to cache, eg
+            ``ticket_fields``, or None to cache every GET
+        :param api_prefix: path prefix stripped before matching endpoints
+        """
+        self.path = path
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.api_prefix = '/{}/'.format(api_prefix.strip('/'))
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT NOT NULL,
+                    encoding TEXT,
+                    content BLOB NOT NULL,
+                    stored REAL NOT NULL
+                )""")
+
+    @staticmethod
+    def cache_key(url, params=None):
+        """ The URL with params merged into its query string in sorted order. """
+        return canonical_url(url, params)
+
+    def should_cache(self, url):
+        """ Return True if responses from url are cached. """
+        if self.endpoints is None:
+            return True
+        path = urlparse(url).path
+        if path.startswith(self.api_prefix):
+            path = path[len(self.api_prefix):]
+        return path.lstrip('/').split('/', 1)[0].split('.', 1)[0] in self.endpoints
+
+    def validators(self, key):
+        """
+        Return the conditional request headers for a stored response, or an
+        empty dict if there is none.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (key,)).fetchone()
+        headers = dict()
+        if row is not None:
+            if row[0]:
+                headers['If-None-Match'] = row[0]
+            if row[1]:
+                headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def store(self, key, response):
+        """
+        Store a successful response if it carries a validator. Returns True
+        if it was stored.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+        headers = dict((name, value) for name, value in response.headers.items()
+                       if name.lower() not in ENCODING_HEADERS)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), response.encoding,
+                 sqlite3.Binary(response.content), time.time()))
+        return True
+
+    def load(self, key, not_modified):
+        """
+        Return the stored response for key in place of the 304 response
+        not_modified, or None if nothing is stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT headers, encoding, content FROM responses WHERE url = ?",
+                (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += len(row[2])
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(json.loads(row[0]))
+        response.encoding = row[1]
+        response._content = bytes(row[2])
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def invalidate(self, key=None):
+        """ Forget the response stored for key, or every response. """
+        with self._lock, self._connection:
+            if key is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute("DELETE FROM responses WHERE url = ?", (key,))
+
+    def stats(self):
+        """
+        Return the number of responses served from the store, the number of
+        304 responses nothing was stored for, and the bytes not transferred.
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, bytes_saved=self.bytes_saved)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -4,8 +4,9 @@ import re
 from abc import abstractmethod
 from datetime import datetime, timedelta
 
+from zenpy.lib import columnar
 from zenpy.lib.util import as_plural, as_singular
-from zenpy.lib.exception import SearchResponseLimitExceeded
+from zenpy.lib.exception import SearchResponseLimitExceeded, ZenpyException
 
 try:
     from collections.abc import Iterable
@@ -89,6 +90,35 @@ class BaseResultGenerator(Iterable):
             params['per_page'] = page_size
         return params, url
 
+    def pages(self):
+        """
+        Yield the JSON of the current and remaining pages as returned by
+        Zendesk, without building objects. This consumes the generator.
+        """
+        page = self._response_json
+        while True:
+            yield page
+            try:
+                page = self.get_next_page(page_num=None, page_size=None)
+            except StopIteration:
+                break
+            self._response_json = page
+            self.update_attrs()
+        self.values = []
+        self.position = 0
+
+    def project(self, fields, object_type=None, custom_fields=None, use_numpy=None):
+        """
+        Extract fields from the current and remaining pages into a dict of
+        column name to column, without building objects. See
+        :func:`zenpy.lib.columnar.project`. This consumes the generator.
+        """
+        object_type = object_type or getattr(self, 'object_type', None)
+        if object_type is None:
+            raise ZenpyException("Cannot tell the object type of the results, pass object_type")
+        return columnar.project(self.pages(), fields, object_type,
+                                custom_fields=custom_fields, use_numpy=use_numpy)
+
     def __getitem__(self, item):
         if isinstance(item, slice):
             return self._handle_slice(item)
@@ -240,7 +270,7 @@ class CursorResultsGenerator(BaseResultGenerator):
         meta = self._response_json.get('meta')
         if meta and meta.get('has_more'):
             url = self._response_json.get('links').get('next')
-            log.debug('There are more results via url={}, retrieving'.format(url))
+            log.debug('There are more results via url=%s, retrieving', url)
             response = self.response_handler.api._get(url, raw_response=True)
             new_json = response.json()
             if hasattr(self, 'object_type')\
@@ -440,7 +470,7 @@ class EngagementResultGenerator(BaseResultGenerator):
         """ Retrieve the next page of results using the `next_page_url` key. """
         url = self._response_json.get("next_page_url")
         if url:
-            log.debug(f"There are more results via url={url}, retrieving")
+            log.debug("There are more results via url=%s, retrieving", url)
             response = self.response_handler.api._get(url, raw_response=True)
             return response.json()
         else:
@@ -0,0 +1,335 @@
+"""
+Hooks into the lifecycle of every request Zenpy makes, and collectors that
+turn those events into metrics.
+
+Every request goes through :meth:`BaseApi._call_api`, which emits the
+following events to the callbacks registered on :attr:`Zenpy.hooks`:
+
+* ``before_request``: method, url, endpoint
+* ``after_response``: method, url, endpoint, status, bytes, latency,
+  ratelimit_wait, attempts
+* ``on_retry``: method, url, endpoint, status, attempt
+* ``on_ratelimit_wait``: method, url, endpoint, seconds, reason
+* ``on_deserialize``: url, endpoint, handler, duration
+
+Each callback receives a single dict. ``endpoint`` is the URL path with ids
+replaced by ``{id}``, so it can be used to group requests. Times are in seconds.
+"""
+
+import bisect
+import logging
+import re
+from collections import defaultdict
+from threading import Lock
+from time import perf_counter
+
+from zenpy.lib.exception import ZenpyException
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+EVENTS = ('before_request', 'after_response', 'on_retry', 'on_ratelimit_wait',
+          'on_deserialize')
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|\.json|$)')
+
+
+def endpoint_template(url):
+    """
+    Return the path of url with numeric ids replaced by ``{id}`` and the query
+    string removed, eg https://x.zendesk.com/api/v2/tickets/1/comments.json?page=2
+    becomes /api/v2/tickets/{id}/comments.json
+    """
+    if url is None:
+        return None
+    path = url.split('?', 1)[0]
+    scheme_end = path.find('://')
+    if scheme_end != -1:
+        host_end = path.find('/', scheme_end + 3)
+        path = path[host_end:] if host_end != -1 else '/'
+    return _ID_SEGMENT.sub('/{id}', path)
+
+
+class Hooks(object):
+    """
+    Registry of callbacks for request lifecycle events. Callbacks are called
+    synchronously on the thread making the request; exceptions they raise are
+    logged and otherwise ignored so instrumentation can never break a request.
+
+    Callbacks can be registered while other threads make requests. Each
+    change swaps in a new tuple of callbacks, so emitting never takes the
+    lock and always sees a complete set.
+    """
+
+    def __init__(self):
+        self._callbacks = dict((event, ()) for event in EVENTS)
+        self._registered = 0
+        self._lock = Lock()
+
+    def register(self, event, callback):
+        """
+        Call callback with a dict describing every occurrence of event.
+        """
+        if event not in self._callbacks:
+            raise ZenpyException(
+                "Unknown event {}, must be one of {}".format(event, ", ".join(EVENTS)))
+        with self._lock:
+            self._callbacks[event] += (callback,)
+            self._registered += 1
+
+    def unregister(self, event, callback):
+        """ Stop calling callback for event. """
+        with self._lock:
+            callbacks = self._callbacks.get(event, ())
+            if callback in callbacks:
+                position = callbacks.index(callback)
+                self._callbacks[event] = callbacks[:position] + callbacks[position + 1:]
+                self._registered -= 1
+
+    def subscribe(self, listener):
+        """
+        Register every method of listener that is named after an event, eg a
+        :class:`MetricsCollector` or :class:`OpenTelemetryAdapter`.
+        """
+        for event in EVENTS:
+            callback = getattr(listener, event, None)
+            if callable(callback):
+                self.register(event, callback)
+
+    def unsubscribe(self, listener):
+        """ Unregister every method registered by :meth:`subscribe`. """
+        for event in EVENTS:
+            callback = getattr(listener, event, None)
+            if callable(callback):
+                self.unregister(event, callback)
+
+    def listening(self, event):
+        """ Return True if any callbacks are registered for event. """
+        return bool(self._callbacks[event])
+
+    def emit(self, event, data):
+        for callback in self._callbacks[event]:
+            try:
+                callback(data)
+            except Exception:
+                log.warning("Hook %r for %s failed", callback, event, exc_info=True)
+
+    def __bool__(self):
+        return self._registered > 0
+
+    __nonzero__ = __bool__
+
+
+class TimedCall(object):
+    """
+    Wraps a requests method, recording the time spent in it and the number
+    of times it was called, so that time waiting on rate limits can be
+    separated from time spent on the network.
+    """
+
+    def __init__(self, http_method):
+        self.http_method = http_method
+        self.__name__ = getattr(http_method, '__name__', 'request')
+        self.calls = 0
+        self.elapsed = 0.0
+        self.latency = 0.0
+
+    def __call__(self, url, **kwargs):
+        started = perf_counter()
+        try:
+            return self.http_method(url, **kwargs)
+        finally:
+            self.latency = perf_counter() - started
+            self.elapsed += self.latency
+            self.calls += 1
+
+
+class Histogram(object):
+    """
+    Fixed bucket histogram. Percentiles are estimated as the upper bound of
+    the bucket they fall in, which keeps memory use constant however many
+    values are recorded.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, percentile):
+        """ Estimate the value below which percentile percent of values fall. """
+        if not self.count:
+            return None
+        target = self.count * percentile / 100.0
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self):
+        return dict(count=self.count,
+                    sum=self.sum,
+                    mean=self.mean,
+                    min=self.min,
+                    max=self.max,
+                    p50=self.percentile(50),
+                    p90=self.percentile(90),
+                    p99=self.percentile(99))
+
+
+class MetricsCollector(object):
+    """
+    Collects in memory histograms of latency, response size, rate limit waits
+    and deserialization time per endpoint.
+
+    .. code-block:: python
+
+        collector = MetricsCollector()
+        zenpy_client.hooks.subscribe(collector)
+        ...
+        print(collector.totals())
+    """
+
+    TIME_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1, 2.5, 5, 10, 30, 60, 120)
+    SIZE_BOUNDS = tuple(1024 * 4 ** i for i in range(10))
+
+    def __init__(self):
+        self._lock = Lock()
+        self.histograms = dict()
+        self.statuses = defaultdict(int)
+        self.retries = defaultdict(int)
+
+    def after_response(self, event):
+        endpoint = event['endpoint']
+        with self._lock:
+            self.statuses[(endpoint, event['status'])] += 1
+            self._record(endpoint, 'latency', event['latency'], self.TIME_BOUNDS)
+            self._record(endpoint, 'ratelimit_wait', event['ratelimit_wait'],
+                         self.TIME_BOUNDS)
+            if event['bytes'] is not None:
+                self._record(endpoint, 'bytes', event['bytes'], self.SIZE_BOUNDS)
+
+    def on_retry(self, event):
+        with self._lock:
+            self.retries[event['endpoint']] += 1
+
+    def on_deserialize(self, event):
+        with self._lock:
+            self._record(event['endpoint'], 'deserialize', event['duration'],
+                         self.TIME_BOUNDS)
+
+    def histogram(self, endpoint, metric):
+        """ Return the :class:`Histogram` of metric for endpoint, or None. """
+        return self.histograms.get((endpoint, metric))
+
+    def summary(self):
+        """
+        Return a dict of endpoint to a dict of metric to histogram summary.
+        """
+        result = defaultdict(dict)
+        with self._lock:
+            for (endpoint, metric), histogram in self.histograms.items():
+                result[endpoint][metric] = histogram.summary()
+        return dict(result)
+
+    def totals(self):
+        """
+        Return the total number of requests and retries, and the total seconds
+        spent on the network, waiting on rate limits and deserializing responses.
+        """
+        totals = dict(requests=0, retries=0, latency=0.0, ratelimit_wait=0.0,
+                      deserialize=0.0)
+        with self._lock:
+            for (endpoint, metric), histogram in self.histograms.items():
+                if metric == 'latency':
+                    totals['requests'] += histogram.count
+                if metric in totals:
+                    totals[metric] += histogram.sum
+            totals['retries'] = sum(self.retries.values())
+        return totals
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.statuses.clear()
+            self.retries.clear()
+
+    def _record(self, endpoint, metric, value, bounds):
+        key = (endpoint, metric)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(bounds)
+        histogram.record(value)
+
+
+class OpenTelemetryAdapter(object):
+    """
+    Records request events as OpenTelemetry metrics. Requires the
+    ``opentelemetry-api`` package unless a meter is passed in.
+
+    .. code-block:: python
+
+        zenpy_client.hooks.subscribe(OpenTelemetryAdapter())
+    """
+
+    def __init__(self, meter=None, prefix='zenpy'):
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError:
+                raise ZenpyException(
+                    "OpenTelemetryAdapter requires the opentelemetry-api package")
+            meter = metrics.get_meter('zenpy')
+        self.meter = meter
+        self.request_duration = meter.create_histogram(
+            prefix + '.request.duration', unit='s',
+            description='Time spent waiting for Zendesk to respond')
+        self.response_size = meter.create_histogram(
+            prefix + '.response.size', unit='By',
+            description='Size of Zendesk response bodies')
+        self.ratelimit_wait = meter.create_histogram(
+            prefix + '.ratelimit.wait', unit='s',
+            description='Time spent waiting on rate limits per request')
+        self.deserialize_duration = meter.create_histogram(
+            prefix + '.deserialize.duration', unit='s',
+            description='Time spent deserializing responses')
+        self.retries = meter.create_counter(
+            prefix + '.request.retries', unit='{retry}',
+            description='Requests retried after being rate limited')
+
+    def after_response(self, event):
+        attributes = {
+            'http.request.method': event['method'],
+            'url.template': event['endpoint'],
+            'http.response.status_code': event['status'],
+        }
+        self.request_duration.record(event['latency'], attributes=attributes)
+        self.ratelimit_wait.record(event['ratelimit_wait'], attributes=attributes)
+        if event['bytes'] is not None:
+            self.response_size.record(event['bytes'], attributes=attributes)
+
+    def on_retry(self, event):
+        self.retries.add(1, attributes={'http.request.method': event['method'],
+                                        'url.template': event['endpoint']})
+
+    def on_deserialize(self, event):
+        self.deserialize_duration.record(
+            event['duration'], attributes={'url.template': event['endpoint']})
@@ -0,0 +1,264 @@
+"""
+A local SQLite replica of tickets, users, organizations and groups.
+
+The mirror is filled from the incremental exports and keeps the newest
+version of every object by id and ``updated_at``. Deleted objects are kept as
+tombstones rather than removed, so a lookup can tell "deleted" from "never
+seen". The sync position is stored with the objects, so every sync carries
+on where the last one stopped:
+
+.. code-block:: python
+
+    mirror = Mirror('zendesk.sqlite')
+    mirror.sync(zenpy_client, 'ticket')     # cheap after the first run
+    ticket = mirror.get('ticket', 1234)     # the JSON returned by Zendesk
+
+    # Serve object lookups, eg ticket.requester, from the mirror.
+    mirror.attach(zenpy_client)
+
+Objects are stored as JSON, so they can be queried with SQLite's JSON
+functions, eg ``json_extract(data, '$.status')``.
+"""
+
+import json
+import logging
+import sqlite3
+from threading import Lock
+
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import as_plural
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+
+def _ticket_deleted(ticket):
+    return ticket.get('status') == 'deleted'
+
+
+def _user_deleted(user):
+    return user.get('active') is False
+
+
+def _deleted(obj):
+    return bool(obj.get('deleted') or obj.get('deleted_at'))
+
+
+# How to tell a tombstone from a live object, per object type.
+TOMBSTONES = {
+    'ticket': _ticket_deleted,
+    'user': _user_deleted,
+    'organization': _deleted,
+    'group': _deleted,
+}
+
+# Object types synced with cursor based incremental exports. Other types with
+# an incremental export use time based pagination, the rest are listed in full.
+CURSOR_TYPES = ('ticket', 'user')
+TIME_TYPES = ('organization',)
+
+
+class Mirror(object):
+    """
+    SQLite store of Zendesk objects kept up to date with incremental exports.
+    """
+
+    def __init__(self, path=':memory:', object_types=tuple(TOMBSTONES)):
+        """
+        :param path: path of the SQLite database, or ``:memory:``
+        :param object_types: the object types that can be synced and looked up
+        """
+        unknown = set(object_types) - set(TOMBSTONES)
+        if unknown:
+            raise ZenpyException("Cannot mirror object types: {}".format(', '.join(sorted(unknown))))
+        self.path = path
+        self.object_types = tuple(object_types)
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS objects (
+                    object_type TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    updated_at TEXT,
+                    deleted INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (object_type, id)
+                )""")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    object_type TEXT PRIMARY KEY,
+                    cursor TEXT,
+                    end_time INTEGER
+                )""")
+
+    def upsert(self, object_type, objects):
+        """
+        Store objects, dicts as returned by Zendesk, replacing stored versions
+        that are not newer. Returns the number of objects written.
+        """
+        with self._lock, self._connection:
+            return self._upsert(object_type, objects)
+
+    def _upsert(self, object_type, objects):
+        is_deleted = TOMBSTONES[object_type]
+        rows = [(object_type, obj['id'], obj.get('updated_at'), int(is_deleted(obj)),
+                 json.dumps(obj, separators=(',', ':')))
+                for obj in objects]
+        self._connection.executemany("""
+            INSERT INTO objects (object_type, id, updated_at, deleted, data)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (object_type, id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                deleted = excluded.deleted,
+                data = excluded.data
+            WHERE objects.updated_at IS NULL
+                OR excluded.updated_at >= objects.updated_at""", rows)
+        return len(rows)
+
+    def delete(self, object_type, object_id):
+        """ Mark an object as deleted. """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE objects SET deleted = 1 WHERE object_type = ? AND id = ?",
+                (object_type, object_id))
+
+    def get(self, object_type, object_id):
+        """ Return the stored JSON of an object, or None if unknown or deleted. """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM objects WHERE object_type = ? AND id = ? AND deleted = 0",
+                (object_type, object_id)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def is_deleted(self, object_type, object_id):
+        """ Return True if the object is stored as a tombstone. """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT deleted FROM objects WHERE object_type = ? AND id = ?",
+                (object_type, object_id)).fetchone()
+        return bool(row and row[0])
+
+    def objects(self, object_type, include_deleted=False):
+        """ Yield the stored JSON of every object of object_type, ordered by id. """
+        query = "SELECT data FROM objects WHERE object_type = ?"
+        if not include_deleted:
+            query += " AND deleted = 0"
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY id", (object_type,)).fetchall()
+        for row in rows:
+            yield json.loads(row[0])
+
+    def count(self, object_type, include_deleted=False):
+        query = "SELECT COUNT(*) FROM objects WHERE object_type = ?"
+        if not include_deleted:
+            query += " AND deleted = 0"
+        with self._lock:
+            return self._connection.execute(query, (object_type,)).fetchone()[0]
+
+    def sync_state(self, object_type):
+        """ Return the (cursor, end_time) the next sync of object_type starts from. """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT cursor, end_time FROM sync_state WHERE object_type = ?",
+                (object_type,)).fetchone()
+        return row if row is not None else (None, None)
+
+    def sync(self, zenpy_client, object_type, start_time=0, per_page=None):
+        """
+        Bring object_type up to date. Tickets and users are fetched with the
+        cursor based incremental export and organizations with the time based
+        one, starting from where the previous sync stopped or start_time on
+        the first sync. Groups have no incremental export and are listed in
+        full, with groups no longer listed marked as deleted.
+
+        :return: a dict with the number of pages fetched and objects written
+        """
+        if object_type not in self.object_types:
+            raise ZenpyException("Not mirroring object type: {}".format(object_type))
+        api = getattr(zenpy_client, as_plural(object_type))
+        cursor, end_time = self.sync_state(object_type)
+        if object_type in CURSOR_TYPES:
+            if cursor is not None:
+                pages = api.incremental_pages(cursor=cursor, per_page=per_page)
+            else:
+                pages = api.incremental_pages(start_time=start_time, per_page=per_page)
+        elif object_type in TIME_TYPES:
+            pages = api.incremental_pages(start_time=end_time or start_time, per_page=per_page)
+        else:
+            return self._refresh(api, object_type)
+
+        stats = dict(pages=0, objects=0)
+        key = as_plural(object_type)
+        for page in pages:
+            with self._lock, self._connection:
+                stats['objects'] += self._upsert(object_type, page.get(key) or ())
+                # Saved with the objects, so an interrupted sync resumes after
+                # the last page it stored.
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                    (object_type, page.get('after_cursor', cursor),
+                     page.get('end_time', end_time)))
+            stats['pages'] += 1
+        log.debug("Synced %s %s from %s pages", stats['objects'], key, stats['pages'])
+        return stats
+
+    def _refresh(self, api, object_type):
+        stats = dict(pages=0, objects=0)
+        key = as_plural(object_type)
+        seen = []
+        for page in _list_pages(api):
+            objects = page.get(key) or ()
+            seen.extend(obj['id'] for obj in objects)
+            stats['objects'] += self.upsert(object_type, objects)
+            stats['pages'] += 1
+        with self._lock, self._connection:
+            self._connection.execute("""
+                UPDATE objects SET deleted = 1
+                WHERE object_type = ? AND id NOT IN (SELECT value FROM json_each(?))""",
+                                     (object_type, json.dumps(seen)))
+        return stats
+
+    def attach(self, zenpy_client):
+        """
+        Serve object lookups that miss the client's in-memory caches from
+        the mirror, eg resolving ``ticket.requester`` or ``tickets(id=1)``.
+        """
+        zenpy_client.cache.backing_store = MirrorCacheStore(self, zenpy_client.tickets._object_mapping)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class MirrorCacheStore(object):
+    """
+    Adapts a :class:`Mirror` for use as the backing store of a
+    :class:`~zenpy.lib.cache.ZenpyCacheManager`, building Zenpy objects from
+    the stored JSON.
+    """
+
+    def __init__(self, mirror, object_mapping):
+        self.mirror = mirror
+        self.object_mapping = object_mapping
+
+    def lookup(self, object_type, object_id):
+        if object_type not in self.mirror.object_types:
+            return None
+        object_json = self.mirror.get(object_type, object_id)
+        if object_json is None:
+            return None
+        return self.object_mapping.object_from_json(object_type, object_json)
+
+
+def _list_pages(api):
+    url = api._build_url(api.endpoint(cursor_pagination=True))
+    while url:
+        page = api._get(url, raw_response=True).json()
+        yield page
+        meta = page.get('meta')
+        if meta is not None:
+            url = page['links'].get('next') if meta.get('has_more') else None
+        else:
+            url = page.get('next_page')
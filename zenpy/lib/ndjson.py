@@ -0,0 +1,205 @@
+"""
+Streaming export of incremental pages to rotating, compressed NDJSON files.
+
+Pages are fetched on a background thread with ``incremental_pages()``, which
+returns the JSON from Zendesk without building objects. They are handed to
+the writer through a queue holding at most ``queue_size`` pages, so memory
+use stays constant however large the export is:
+
+.. code-block:: python
+
+    state = dict()
+    with NDJSONSink('archive', 'tickets', compression='gzip') as sink:
+        export_ndjson(zenpy_client.tickets.incremental_pages(start_time=0), sink, state=state)
+    # Resume later from state['after_cursor'], even if the export failed
+
+gzip is always available. zstd requires the ``zstandard`` package.
+"""
+
+import gzip
+import json
+import logging
+import os
+
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import iterate_concurrently, json_encode_for_printing
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+EXTENSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Keys of incremental pages that describe the page rather than holding records.
+PAGE_KEYS = ('after_cursor', 'after_url', 'before_cursor', 'before_url', 'count',
+             'end_of_stream', 'end_time', 'next_page', 'previous_page')
+
+
+class NDJSONSink(object):
+    """
+    Writes records as newline delimited JSON, starting a new file once
+    max_records records or max_bytes uncompressed bytes have been written.
+
+    Files are named ``{prefix}-{number:05d}.ndjson`` plus ``.gz`` or ``.zst``
+    in directory, and are written under a ``.part`` suffix which is removed
+    once the file is complete, so readers never see a partial file. When the
+    ``with`` block raises, the file being written is deleted instead.
+    """
+
+    def __init__(self, directory, prefix, compression='gzip', compression_level=None,
+                 max_records=1000000, max_bytes=None):
+        """
+        :param directory: directory to write files to, created if missing
+        :param prefix: start of every file name, eg the object type
+        :param compression: 'gzip', 'zstd' or None
+        :param compression_level: passed on to the compressor
+        :param max_records: records per file, None for no limit
+        :param max_bytes: uncompressed bytes per file, None for no limit
+        """
+        if compression not in EXTENSIONS:
+            raise ZenpyException("Unknown compression: {}, use one of: {}".format(
+                compression, ', '.join(str(c) for c in EXTENSIONS)))
+        if compression == 'zstd':
+            _import_zstandard()
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = compression
+        self.compression_level = compression_level
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.files = []
+        self.records = 0
+        self._file = None
+        self._raw = None
+        self._path = None
+        self._file_records = 0
+        self._file_bytes = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def write(self, record):
+        """ Write a record, a dict or Zenpy object, as one line. """
+        line = json.dumps(record, separators=(',', ':'),
+                          default=json_encode_for_printing).encode('utf-8') + b'\n'
+        if self._file is None:
+            self._open()
+        self._file.write(line)
+        self.records += 1
+        self._file_records += 1
+        self._file_bytes += len(line)
+        if (self.max_records and self._file_records >= self.max_records) \
+                or (self.max_bytes and self._file_bytes >= self.max_bytes):
+            self._close_file()
+
+    def close(self):
+        self._close_file()
+
+    def abort(self):
+        """
+        Close the current file without publishing it, deleting its ``.part``
+        file. Files already completed are kept.
+        """
+        if self._file is None:
+            return
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        os.remove(self._path + '.part')
+        log.debug("Discarded %s records of incomplete %s", self._file_records, self._path)
+        self._file = self._raw = self._path = None
+
+    def _open(self):
+        name = '{}-{:05d}.ndjson{}'.format(self.prefix, len(self.files) + 1,
+                                           EXTENSIONS[self.compression])
+        self._path = os.path.join(self.directory, name)
+        raw = open(self._path + '.part', 'wb')
+        if self.compression == 'gzip':
+            level = 6 if self.compression_level is None else self.compression_level
+            self._file = gzip.GzipFile(filename=name, mode='wb', compresslevel=level,
+                                       fileobj=raw)
+            self._raw = raw
+        elif self.compression == 'zstd':
+            zstandard = _import_zstandard()
+            level = 3 if self.compression_level is None else self.compression_level
+            self._file = zstandard.ZstdCompressor(level=level).stream_writer(raw)
+            self._raw = raw
+        else:
+            self._file = raw
+            self._raw = None
+        self._file_records = 0
+        self._file_bytes = 0
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        self._file.close()
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        os.replace(self._path + '.part', self._path)
+        log.debug("Wrote %s records to %s", self._file_records, self._path)
+        self.files.append(self._path)
+        self._file = self._raw = self._path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def export_ndjson(pages, sink, key=None, queue_size=2, state=None):
+    """
+    Write the records of every page to sink, fetching pages on a background
+    thread while the previous ones are written.
+
+    :param pages: iterable of incremental pages, eg from ``incremental_pages()``
+    :param sink: :class:`NDJSONSink` to write to
+    :param key: key holding the records, by default the one list in each page
+    :param queue_size: pages fetched ahead of the writer
+    :param state: dict to keep the progress in. It is updated as files are
+        completed, so when the export raises it holds the position to resume
+        from, with nothing lost once the incomplete file is discarded.
+    :return: a dict with the number of pages and records written, and the
+        ``after_cursor`` or ``end_time`` of the last page to resume from
+    """
+    if state is None:
+        state = dict()
+    state.update(pages=0, records=0, after_cursor=None, end_time=None)
+    # The position after the last page written, and after the page before.
+    position = dict(after_cursor=None, end_time=None)
+    for page in iterate_concurrently([lambda: pages], max_workers=1, queue_size=queue_size):
+        page_key = key or _records_key(page)
+        records = page.get(page_key) or ()
+        completed_files = len(sink.files)
+        for record in records:
+            sink.write(record)
+        state['pages'] += 1
+        state['records'] += len(records)
+        previous = dict(position)
+        for attr in ('after_cursor', 'end_time'):
+            if page.get(attr) is not None:
+                position[attr] = page[attr]
+        if len(sink.files) > completed_files:
+            # Resume after this page only if all of its records are in
+            # completed files, otherwise repeat it.
+            state.update(position if sink._file is None else previous)
+    state.update(position)
+    return state
+
+
+def _records_key(page):
+    keys = [k for k, v in page.items() if isinstance(v, list) and k not in PAGE_KEYS]
+    if len(keys) != 1:
+        raise ZenpyException("Cannot tell which of {} holds the records, pass key".format(keys))
+    return keys[0]
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ZenpyException("zstd compression requires the zstandard package")
+    return zstandard
@@ -0,0 +1,174 @@
+"""
+Connection pooling for the requests Session Zenpy uses.
+
+requests keeps one urllib3 connection pool per host, holding at most
+``pool_maxsize`` connections. When more threads than that share a client,
+surplus connections are opened for each request and then closed when the pool
+is full ("Connection pool is full, discarding connection"), so every request
+pays for a new TCP and TLS handshake. :class:`ZenpyHTTPAdapter` records how
+the pools are used, so that can be spotted and the pool sized accordingly.
+"""
+
+import logging
+from threading import Lock
+
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+
+def pool_size(max_concurrency=None, pool_maxsize=None):
+    """
+    Return the number of connections to keep per host: pool_maxsize if given,
+    otherwise enough for max_concurrency threads and never fewer than the
+    requests default.
+    """
+    if pool_maxsize is not None:
+        return int(pool_maxsize)
+    return max(DEFAULT_POOLSIZE, int(max_concurrency or 0))
+
+
+class ConnectionStats(object):
+    """
+    Usage counters of a single connection pool, ie one host.
+
+    * requests: connections checked out of the pool
+    * connections: new connections opened
+    * in_use: connections currently checked out
+    * peak_in_use: the most connections checked out at once
+    * exhausted: checkouts that found no idle connection, and had to open
+      one or, if the pool blocks, wait for one
+    * discarded: connections closed on return because the pool was full
+    """
+
+    def __init__(self, maxsize):
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.requests = 0
+        self.connections = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.exhausted = 0
+        self.discarded = 0
+
+    def checked_out(self, exhausted):
+        with self._lock:
+            self.requests += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            if exhausted:
+                self.exhausted += 1
+
+    def returned(self, discarded):
+        with self._lock:
+            # A slot whose checkout failed is returned too, so never go negative.
+            self.in_use = max(0, self.in_use - 1)
+            if discarded:
+                self.discarded += 1
+
+    def opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def as_dict(self):
+        with self._lock:
+            return dict(maxsize=self.maxsize,
+                        requests=self.requests,
+                        connections=self.connections,
+                        in_use=self.in_use,
+                        peak_in_use=self.peak_in_use,
+                        exhausted=self.exhausted,
+                        discarded=self.discarded)
+
+
+class _StatsPoolMixin(object):
+    """ Counts checkouts, returns and new connections of a urllib3 pool. """
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        pool = self.pool
+        exhausted = pool is not None and pool.empty()
+        conn = super(_StatsPoolMixin, self)._get_conn(timeout=timeout)
+        self.stats.checked_out(exhausted)
+        return conn
+
+    def _put_conn(self, conn):
+        pool = self.pool
+        self.stats.returned(discarded=conn is not None and pool is not None and pool.full())
+        super(_StatsPoolMixin, self)._put_conn(conn)
+
+    def _new_conn(self):
+        self.stats.opened()
+        return super(_StatsPoolMixin, self)._new_conn()
+
+
+class StatsHTTPConnectionPool(_StatsPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class StatsHTTPSConnectionPool(_StatsPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class StatsPoolManager(PoolManager):
+    """ PoolManager whose pools record their usage in a shared dict of ConnectionStats. """
+
+    def __init__(self, stats, *args, **kwargs):
+        super(StatsPoolManager, self).__init__(*args, **kwargs)
+        self.stats = stats
+        self._stats_lock = Lock()
+        self.pool_classes_by_scheme = dict(http=StatsHTTPConnectionPool,
+                                           https=StatsHTTPSConnectionPool)
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super(StatsPoolManager, self)._new_pool(scheme, host, port,
+                                                       request_context=request_context)
+        key = '{}://{}:{}'.format(scheme, host, port)
+        with self._stats_lock:
+            if key not in self.stats:
+                self.stats[key] = ConnectionStats(pool.pool.maxsize if pool.pool else None)
+            pool.stats = self.stats[key]
+        return pool
+
+
+class ZenpyHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records the usage of its connection pools, see
+    :meth:`pool_stats`. It takes the same arguments as HTTPAdapter, eg:
+
+    .. code-block:: python
+
+        session.mount('https://', ZenpyHTTPAdapter(**Zenpy.http_adapter_kwargs(max_concurrency=16)))
+
+    Requests sent through a proxy are not counted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.stats = dict()
+        super(ZenpyHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        # Mirrors HTTPAdapter.init_poolmanager, which saves these for pickling.
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = StatsPoolManager(self.stats,
+                                            num_pools=connections,
+                                            maxsize=maxsize,
+                                            block=block,
+                                            **pool_kwargs)
+
+    def __setstate__(self, state):
+        self.stats = dict()
+        super(ZenpyHTTPAdapter, self).__setstate__(state)
+
+    def pool_stats(self):
+        """
+        Return a dict of ``scheme://host:port`` to the usage of its pool,
+        see :class:`ConnectionStats`.
+        """
+        return dict((key, stats.as_dict()) for key, stats in list(self.stats.items()))
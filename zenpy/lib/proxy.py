@@ -1,16 +1,64 @@
+_SENTINEL = object()
+
+# Values that can never be modified in place, so are never wrapped.
+_IMMUTABLE_TYPES = frozenset((str, bytes, int, float, bool, type(None)))
+
+
+def _wrap(element, dirty_callback):
+    """
+    We want to know if an item stored in a proxy is modified. If the element
+    is a list or dict, we wrap it in a ProxyList or ProxyDict which executes
+    dirty_callback when modified. If it is a ZenpyObject, the callback
+    updates the parent object. Elements that are already proxies are
+    returned unchanged, so every child is only wrapped once, but now report
+    to the container they were read from.
+    """
+    element_type = type(element)
+    if element_type in _IMMUTABLE_TYPES:
+        return element
+    if element_type is ProxyList or element_type is ProxyDict:
+        element.dirty_callback = dirty_callback
+        return element
+    if isinstance(element, list):
+        return ProxyList(element, dirty_callback=dirty_callback)
+    if isinstance(element, dict):
+        return ProxyDict(element, dirty_callback=dirty_callback)
+    # If it is a Zenpy object this will either return None or the previous wrapper.
+    if getattr(element, '_dirty_callback', _SENTINEL) is not _SENTINEL:
+        # Don't set callback if already set.
+        if not callable(element._dirty_callback):
+            element._dirty_callback = dirty_callback
+    return element
+
+
+def _adopt(element, dirty_callback):
+    """
+    A proxy stored in a container reports its changes to that container
+    from then on, even when it was moved there from another object.
+    """
+    element_type = type(element)
+    if element_type is ProxyList or element_type is ProxyDict:
+        element.dirty_callback = dirty_callback
+
+
 class ProxyDict(dict):
     """
     Proxy for dict, records when the dictionary has been modified.
+
+    Lists and dicts stored in the dict are wrapped the first time they are
+    read and the wrapper replaces them, so reads do not allocate after the
+    first and never mark the dict as modified.
     """
     def __init__(self, *args, **kwargs):
         self.dirty_callback = kwargs.pop('dirty_callback', None)
         super(dict, self).__init__()
         dict.update(self, *args, **kwargs)
-        self._sentinel = object()
         self._dirty = False
 
     def update(self, *args, **kwargs):
         dict.update(self, *args, **kwargs)
+        for element in dict.values(self):
+            _adopt(element, self._set_dirty)
         self._set_dirty()
 
     def pop(self, key, default=None):
@@ -36,8 +84,9 @@ class ProxyDict(dict):
 
     def __getitem__(self, k):
         element = dict.__getitem__(self, k)
-        wrapped = self._wrap_element(element)
-        dict.__setitem__(self, k, wrapped)
+        wrapped = _wrap(element, self._set_dirty)
+        if wrapped is not element:
+            dict.__setitem__(self, k, wrapped)
         return wrapped
 
     def __delitem__(self, k):
@@ -46,84 +95,89 @@ class ProxyDict(dict):
 
     def __setitem__(self, k, v):
         dict.__setitem__(self, k, v)
+        _adopt(v, self._set_dirty)
         self._set_dirty()
 
     def _wrap_element(self, element):
-        """
-        We want to know if an item is modified that is stored in this dict.
-        If the element is a list or dict, we wrap it in a ProxyList or ProxyDict,
-        and if it is modified execute a callback that updates this instance.
-        If it is a ZenpyObject, then the callback updates the parent object.
-        """
-        def dirty_callback():
-            self._set_dirty()
-
-        if isinstance(element, list):
-            element = ProxyList(element, dirty_callback=dirty_callback)
-        elif isinstance(element, dict):
-            element = ProxyDict(element, dirty_callback=dirty_callback)
-        # If it is a Zenpy object this will either return None or the previous wrapper.
-        elif getattr(element, '_dirty_callback',
-                     self._sentinel) is not self._sentinel:
-            # Don't set callback if already set.
-            if not callable(element._dirty_callback):
-                element._dirty_callback = dirty_callback
-        return element
+        return _wrap(element, self._set_dirty)
 
 
 class ProxyList(list):
     """
     Proxy for list, records when the list has been modified.
+
+    Lists and dicts stored in the list are wrapped the first time they are
+    read and the wrapper replaces them, so reads do not allocate after the
+    first and never mark the list as modified. _version counts the changes
+    made to the list and its children, so indexes built over the list can
+    tell when they are stale.
     """
     def __init__(self, iterable=None, dirty_callback=None):
         list.__init__(self, iterable or [])
         self.dirty_callback = dirty_callback
         self._dirty = False
-        self._sentinel = object()
-
-        # Doesn't exist in 2.7
-        if hasattr(list, 'clear'):
+        self._version = 0
 
-            def clear():
-                list.clear(self)
-                self._set_dirty()
+    # Doesn't exist in 2.7
+    if hasattr(list, 'clear'):
 
-            self.clear = clear
+        def clear(self):
+            list.clear(self)
+            self._set_dirty()
 
     def _clean_dirty(self):
         self._dirty = False
 
     def _set_dirty(self):
+        self._version += 1
         if self.dirty_callback is not None:
             self.dirty_callback()
         self._dirty = True
 
     def append(self, item):
         list.append(self, item)
+        _adopt(item, self._set_dirty)
         self._set_dirty()
 
     def extend(self, iterable):
+        start = len(self)
         list.extend(self, iterable)
+        self._adopt_from(start)
         self._set_dirty()
 
     def insert(self, index, item):
         list.insert(self, index, item)
+        _adopt(item, self._set_dirty)
         self._set_dirty()
 
     def remove(self, item):
         list.remove(self, item)
         self._set_dirty()
 
+    def reverse(self):
+        list.reverse(self)
+        self._set_dirty()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._set_dirty()
+
     def __getitem__(self, item):
+        if isinstance(item, slice):
+            return ProxyList([self[index] for index in range(*item.indices(len(self)))],
+                             dirty_callback=self._set_dirty)
         element = list.__getitem__(self, item)
-        wrapped = self._wrap_element(element)
-        self[item] = wrapped
+        wrapped = _wrap(element, self._set_dirty)
+        if wrapped is not element:
+            list.__setitem__(self, item, wrapped)
         return wrapped
 
     def __iter__(self):
-        for index, element in enumerate(list.__iter__(self), start=0):
-            wrapped = self._wrap_element(element)
-            list.__setitem__(self, index, wrapped)
+        dirty_callback = self._set_dirty
+        for index, element in enumerate(list.__iter__(self)):
+            wrapped = _wrap(element, dirty_callback)
+            if wrapped is not element:
+                list.__setitem__(self, index, wrapped)
             yield wrapped
 
     def pop(self, index=-1):
@@ -136,37 +190,30 @@ class ProxyList(list):
         self._set_dirty()
 
     def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = list(value)
+            for element in value:
+                _adopt(element, self._set_dirty)
+        else:
+            _adopt(value, self._set_dirty)
         list.__setitem__(self, key, value)
         self._set_dirty()
 
     def __iadd__(self, other):
+        start = len(self)
         r = list.__iadd__(self, other)
+        self._adopt_from(start)
         self._set_dirty()
         return r
 
+    def _adopt_from(self, start):
+        for index in range(start, len(self)):
+            _adopt(list.__getitem__(self, index), self._set_dirty)
+
     def __imul__(self, other):
         r = list.__imul__(self, other)
         self._set_dirty()
         return r
 
     def _wrap_element(self, element):
-        """
-        We want to know if an item is modified that is stored in this list.
-        If the element is a list or dict, we wrap it in a ProxyList or ProxyDict,
-        and if it is modified execute a callback that updates this
-        instance. If it is a ZenpyObject, then the callback updates the parent object.
-        """
-        def dirty_callback():
-            self._set_dirty()
-
-        if isinstance(element, list):
-            element = ProxyList(element, dirty_callback=dirty_callback)
-        elif isinstance(element, dict):
-            element = ProxyDict(element, dirty_callback=dirty_callback)
-        # If it is a Zenpy object this will either return None or the previous wrapper.
-        elif getattr(element, '_dirty_callback',
-                     self._sentinel) is not self._sentinel:
-            # Don't set callback if already set.
-            if not callable(element._dirty_callback):
-                element._dirty_callback = dirty_callback
-        return element
+        return _wrap(element, self._set_dirty)
@@ -0,0 +1,151 @@
+"""
+Background refresh of cached objects from the incremental exports.
+
+Cached users, organizations and tickets are otherwise only replaced when they
+expire or are evicted. A :class:`CacheRefresher` polls the incremental exports
+on a daemon thread. Objects changed in Zendesk are replaced in the cache, and
+deleted ones are evicted, so caches can use long expiry times and stay fresh:
+
+.. code-block:: python
+
+    zenpy_client.cache.mapping['ticket'].set_cache_impl('TTLCache', 10000, ttl=3600)
+    refresher = CacheRefresher(zenpy_client, interval=60).start()
+    ...
+    refresher.stop()
+
+Objects that are not cached are skipped, the refresher never adds to a cache.
+"""
+
+import logging
+import threading
+from time import time
+
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.mirror import CURSOR_TYPES, TIME_TYPES, TOMBSTONES
+from zenpy.lib.util import as_plural
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+DEFAULT_OBJECT_TYPES = ('ticket', 'user', 'organization')
+
+
+class CacheRefresher(object):
+    """
+    Tails the incremental exports of object_types and refreshes the matching
+    entries of the client's cache every interval seconds.
+    """
+
+    def __init__(self, zenpy_client, object_types=DEFAULT_OBJECT_TYPES, interval=60,
+                 start_time=None, per_page=None):
+        """
+        :param zenpy_client: the :class:`Zenpy` whose cache is refreshed
+        :param object_types: object types to follow, any of ticket, user and organization
+        :param interval: seconds between polls
+        :param start_time: unix time of the oldest change to apply, defaults to
+            a minute before the refresher is created
+        :param per_page: page size of the incremental requests
+        """
+        unknown = set(object_types) - set(CURSOR_TYPES + TIME_TYPES)
+        if unknown:
+            raise ZenpyException("No incremental export for: {}".format(', '.join(sorted(unknown))))
+        self.zenpy_client = zenpy_client
+        self.object_types = tuple(object_types)
+        self.interval = interval
+        self.per_page = per_page
+        self.start_time = int(time()) - 60 if start_time is None else start_time
+        self.polls = 0
+        self.updated = 0
+        self.evicted = 0
+        self.errors = 0
+        self.last_error = None
+        self._positions = dict()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """ Start polling on a daemon thread. Returns self. """
+        if self._thread is not None and self._thread.is_alive():
+            raise ZenpyException("CacheRefresher is already running")
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='zenpy-cache-refresher')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """ Stop polling and wait for the thread to finish its current poll. """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.refresh()
+            self._stopped.wait(self.interval)
+
+    def refresh(self):
+        """
+        Apply the changes made since the last poll to the cache. Errors are
+        logged and counted, and the poll is retried from the same position
+        next time.
+        """
+        for object_type in self.object_types:
+            if self._stopped.is_set():
+                break
+            try:
+                self._refresh(object_type)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                log.warning("Refreshing the %s cache failed: %s", object_type, e)
+        self.polls += 1
+
+    def _refresh(self, object_type):
+        api = getattr(self.zenpy_client, as_plural(object_type))
+        position = self._positions.get(object_type)
+        if object_type in CURSOR_TYPES:
+            if position is not None:
+                pages = api.incremental_pages(cursor=position, per_page=self.per_page)
+            else:
+                pages = api.incremental_pages(start_time=self.start_time, per_page=self.per_page)
+        else:
+            pages = api.incremental_pages(start_time=position or self.start_time,
+                                          per_page=self.per_page)
+        key = as_plural(object_type)
+        for page in pages:
+            for object_json in page.get(key) or ():
+                self._apply(api, object_type, object_json)
+            position = page.get('after_cursor' if object_type in CURSOR_TYPES else 'end_time',
+                                position)
+            self._positions[object_type] = position
+
+    def _apply(self, api, object_type, object_json):
+        cache = self.zenpy_client.cache.mapping.get(object_type)
+        if cache is None or object_json['id'] not in cache:
+            return
+        if TOMBSTONES[object_type](object_json):
+            cache.pop(object_json['id'])
+            self.evicted += 1
+            log.debug("Refresher evicted %s %s", object_type, object_json['id'])
+        else:
+            # Deserializing adds the new version to the cache.
+            api._object_mapping.object_from_json(object_type, object_json)
+            self.updated += 1
+            log.debug("Refresher updated %s %s", object_type, object_json['id'])
+
+    def stats(self):
+        return dict(polls=self.polls, updated=self.updated, evicted=self.evicted,
+                    errors=self.errors)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,512 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from zenpy.lib.api_objects import Attachment, Comment
+from zenpy.lib.exception import ZenpyException
+from zenpy.lib.util import is_iterable_but_not_string
+
+__author__ = 'facetoe'
+
+log = logging.getLogger(__name__)
+
+
+class AttachmentDownloader(object):
+    """
+    Downloads many attachments concurrently.
+
+    Each attachment is streamed to a ``.part`` file next to its destination and
+    renamed into place once it is complete, so a destination file only ever
+    exists in full. When a ``.part`` file is left behind by an interrupted run
+    the download resumes from where it stopped using an HTTP Range request.
+    Completed files are verified against the size Zendesk reports for the
+    attachment.
+
+    All requests go through the Api, so they honour the configured timeout
+    and rate limiting.
+    """
+
+    PART_SUFFIX = '.part'
+
+    def __init__(self, api, destination, max_workers=4, chunk_size=1024 * 1024,
+                 overwrite=False):
+        """
+        :param api: the :class:`AttachmentApi` used to resolve and download attachments
+        :param destination: directory the attachments are written to
+        :param max_workers: number of attachments downloaded at the same time
+        :param chunk_size: number of bytes read from the network at a time
+        :param overwrite: download attachments again even if already present
+        """
+        if not os.path.isdir(destination):
+            raise ZenpyException(
+                "Download destination must be a directory: {}".format(destination))
+        self.api = api
+        self.destination = destination
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.overwrite = overwrite
+
+    def download(self, attachments, raise_on_error=True):
+        """
+        Download attachments.
+
+        :param attachments: attachment ids, :class:`Attachment` objects or
+            :class:`Comment` objects whose attachments should be downloaded
+        :param raise_on_error: if True, re-raise the first error once all other
+            downloads have finished. If False, the error is returned in place of the path.
+        :return: dict of attachment id to the path it was written to
+        """
+        results = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(self._attachment_id(a), executor.submit(self.download_one, a))
+                       for a in self._expand(attachments)]
+            for attachment_id, future in futures:
+                try:
+                    results[attachment_id] = future.result()
+                except Exception as e:
+                    log.error("Failed to download attachment %s: %s", attachment_id, e)
+                    results[attachment_id] = e
+
+        if raise_on_error:
+            for result in results.values():
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def download_one(self, attachment):
+        """
+        Download a single attachment, resuming a previous partial download if present.
+
+        :param attachment: attachment id or :class:`Attachment`
+        :return: the path the attachment was written to
+        """
+        if not isinstance(attachment, Attachment):
+            attachment = self.api(id=attachment)
+
+        path = os.path.join(self.destination, self.file_name(attachment))
+        expected_size = attachment.size
+        if not self.overwrite and os.path.exists(path) and \
+                (expected_size is None or os.path.getsize(path) == expected_size):
+            log.debug("Attachment %s already downloaded to %s", attachment.id, path)
+            return path
+
+        part_path = path + self.PART_SUFFIX
+        offset = 0
+        # Only resume when we know how large the file should be, otherwise
+        # there is no way to tell a complete part file from a partial one.
+        if expected_size is not None and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            if offset > expected_size:
+                offset = 0
+
+        if expected_size is None or offset < expected_size:
+            self._fetch(attachment, part_path, offset)
+
+        size = os.path.getsize(part_path)
+        if expected_size is not None and size != expected_size:
+            raise ZenpyException(
+                "Attachment {} is {} bytes, expected {} bytes".format(
+                    attachment.id, size, expected_size))
+        os.replace(part_path, path)
+        return path
+
+    def file_name(self, attachment):
+        """
+        Name of the file an attachment is written to. The id is included
+        because attachment file names are rarely unique.
+        """
+        return "{}-{}".format(attachment.id,
+                              os.path.basename(attachment.file_name or 'attachment'))
+
+    def _fetch(self, attachment, part_path, offset):
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else None
+        response = self.api._call_api(self.api.session.get,
+                                      attachment.content_url,
+                                      stream=True,
+                                      timeout=self.api.timeout,
+                                      headers=headers)
+        if offset and response.status_code != 206:
+            log.debug("Range request for attachment %s ignored, restarting download",
+                      attachment.id)
+            offset = 0
+        elif offset:
+            log.debug("Resuming attachment %s from byte %s", attachment.id, offset)
+
+        try:
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+        finally:
+            response.close()
+
+    def _expand(self, attachments):
+        if not is_iterable_but_not_string(attachments):
+            attachments = [attachments]
+        for item in attachments:
+            if isinstance(item, Comment):
+                for attachment in item.attachments or []:
+                    yield attachment
+            else:
+                yield item
+
+    @staticmethod
+    def _attachment_id(attachment):
+        return attachment.id if isinstance(attachment, Attachment) else attachment
+
+
+class ChunkedUploadReader(object):
+    """
+    Wraps a seekable file object so it is sent to Zendesk in fixed-size chunks
+    rather than being read into memory, reporting progress as it goes.
+
+    The reader knows its length so requests can send a Content-Length header,
+    and it can be rewound so a request can be retried after being rate limited.
+    """
+
+    def __init__(self, fp, name, chunk_size, progress_callback=None):
+        if not (hasattr(fp, 'seek') and hasattr(fp, 'tell')):
+            raise ZenpyException(
+                "Chunked uploads require a seekable file: {}".format(name))
+        self.fp = fp
+        self.name = name
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.start = fp.tell()
+        fp.seek(0, os.SEEK_END)
+        self.total = fp.tell() - self.start
+        fp.seek(self.start)
+        self.sent = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        chunk = self.fp.read(size)
+        if chunk:
+            self.sent += len(chunk)
+            if self.progress_callback is not None:
+                self.progress_callback(self.name, self.sent, self.total)
+        return chunk
+
+    def rewind(self):
+        self.fp.seek(self.start)
+        self.sent = 0
+
+    def __iter__(self):
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            yield chunk
+
+    def __len__(self):
+        return self.total
+
+
+class AttachmentUploader(object):
+    """
+    Uploads many files concurrently under a single upload token.
+
+    Zendesk groups uploads sharing a token, so the token returned for the first
+    file is used for all the others, which are then uploaded in parallel. Files
+    are streamed from disk in chunks, so memory use does not depend on file size.
+    """
+
+    def __init__(self, api, max_workers=4, chunk_size=64 * 1024,
+                 progress_callback=None):
+        """
+        :param api: the :class:`AttachmentApi` used to upload files
+        :param max_workers: number of files uploaded at the same time
+        :param chunk_size: number of bytes read from each file at a time
+        :param progress_callback: callable accepting the target name, bytes sent
+            and total bytes of a file, called as each chunk is sent
+        """
+        self.api = api
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+
+    def upload(self, files, token=None):
+        """
+        Upload files.
+
+        :param files: file paths, file objects with a name, or
+            (file path or object, target name) tuples
+        :param token: existing upload token to add the files to
+        :return: list of :class:`Upload` objects in the same order as files.
+            They all share the same token.
+        """
+        files = list(files)
+        uploads = [None] * len(files)
+        first = 0
+        if token is None and files:
+            uploads[0] = self.upload_one(files[0])
+            token = uploads[0].token
+            first = 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(i, executor.submit(self.upload_one, files[i], token))
+                       for i in range(first, len(files))]
+            for i, future in futures:
+                uploads[i] = future.result()
+        return uploads
+
+    def upload_one(self, file, token=None, content_type=None):
+        """
+        Upload a single file.
+
+        :param file: file path, file object with a name or (file, target name) tuple
+        :param token: upload token to add the file to
+        :param content_type: content type of the file
+        :return: :class:`Upload`
+        """
+        fp, target_name, should_close = self._open(file)
+        try:
+            reader = ChunkedUploadReader(fp, target_name, self.chunk_size,
+                                         self.progress_callback)
+            url = self.api._build_url(
+                self.api.endpoint.upload(filename=target_name, token=token))
+
+            def post(url, **kwargs):
+                # Start from the beginning if this is a retry.
+                reader.rewind()
+                return self.api.session.post(url, **kwargs)
+            post.__name__ = 'post'
+
+            response = self.api._call_api(
+                post, url,
+                data=reader,
+                timeout=self.api.timeout,
+                headers={'Content-Type': content_type or 'application/octet-stream'})
+        finally:
+            if should_close:
+                fp.close()
+        return self.api._process_response(response)
+
+    def _open(self, file):
+        target_name = None
+        if isinstance(file, tuple):
+            file, target_name = file
+        if hasattr(file, 'read'):
+            if not target_name and not getattr(file, 'name', None):
+                raise ZenpyException("upload requires a target file name")
+            return file, target_name or os.path.basename(file.name), False
+        # Paths, either strings or PathLike objects.
+        path = str(file)
+        return open(path, 'rb'), target_name or os.path.basename(path), True
+
+
+def upload_tokens(payload):
+    """
+    Yield the upload tokens in the ``uploads`` of a serialized request
+    payload, eg the comment of a ticket or every ticket of create_many.
+    """
+    stack = [payload]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key == 'uploads' and is_iterable_but_not_string(value):
+                    for token in value:
+                        if isinstance(token, str):
+                            yield token
+                elif key == 'uploads' and isinstance(value, str):
+                    yield value
+                else:
+                    stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+class UploadIndex(object):
+    """
+    Local index of uploads keyed by a SHA-256 hash of their content, so uploading
+    the same file again reuses the existing upload token instead of transferring
+    the file a second time.
+
+    Zendesk discards uploads that are not used within a limited time, so a token
+    is only reused until the upload's ``expires_at`` or, when Zendesk does not
+    say, until ``ttl`` seconds have passed since the upload was made. A token
+    can only be attached once, so each token is handed out by one index only
+    once, and is no longer reused by any index after it has been sent in the
+    ``uploads`` of a ticket, request or comment. Tokens are reused when an
+    earlier run uploaded a file but never attached it.
+
+    The index is stored in SQLite, so passing a file path lets it be shared
+    between runs of an import. The default keeps it in memory.
+    """
+
+    DEFAULT_TTL = 55 * 60
+
+    def __init__(self, path=':memory:', ttl=DEFAULT_TTL, chunk_size=1024 * 1024):
+        """
+        :param path: path of the SQLite database, or ``:memory:``
+        :param ttl: seconds an upload token is reused for when Zendesk does not
+            return an expiry time
+        :param chunk_size: number of bytes read at a time when hashing files
+        """
+        self.path = path
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        # Tokens handed out by this index, which may not have been sent yet.
+        self._claimed = set()
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    digest TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    token TEXT NOT NULL,
+                    upload TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    PRIMARY KEY (digest, file_name)
+                )""")
+
+    def upload(self, api, fp, target_name=None, content_type=None):
+        """
+        Upload a file unless an upload with identical content and name is still
+        valid and has not been handed out, in which case that upload is
+        returned instead.
+
+        :param api: the :class:`AttachmentApi` used for uploads
+        :param fp: file object, content, or file path to be uploaded
+        :param target_name: name of the file inside Zendesk
+        :param content_type: content type of the file
+        :return: :class:`Upload`
+        """
+        digest, size, target_name = self._describe(fp, target_name)
+        if digest is None:
+            # Not something we know how to hash, upload it as is.
+            return api._upload(fp, target_name=target_name, content_type=content_type)
+
+        upload_json = self.get(digest, target_name)
+        if upload_json is not None:
+            log.debug("Reusing upload of %s (%s bytes)", target_name, size)
+            return api._object_mapping.object_from_json('upload', upload_json)
+
+        upload = api._upload(fp, target_name=target_name, content_type=content_type)
+        self.add(digest, target_name, size, upload)
+        with self._lock:
+            self._claimed.add(upload.token)
+        return upload
+
+    def get(self, digest, file_name):
+        """
+        Return the JSON of a still valid upload of this content and name, or
+        None. The upload is handed out, so it is not returned again.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, upload, expires, token FROM uploads "
+                "WHERE digest = ? AND file_name = ?",
+                (digest, file_name)).fetchone()
+            if row is None or row[2] <= time.time() or row[3] in self._claimed:
+                self.misses += 1
+                return None
+            self._claimed.add(row[3])
+            self.hits += 1
+            self.bytes_saved += row[0]
+            return json.loads(row[1])
+
+    def add(self, digest, file_name, size, upload):
+        """
+        Record an :class:`Upload` of content with the given digest and name.
+        """
+        expires = time.time() + self.ttl
+        if upload.expires_at:
+            expires = min(expires, upload.expires.timestamp())
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, file_name, size, upload.token,
+                 json.dumps(upload.to_dict()), expires))
+
+    def mark_used(self, tokens):
+        """
+        Stop reusing the uploads made with tokens. Zendesk spends a token
+        once a comment uses it, so this is called for the tokens in every
+        request payload sent.
+        """
+        tokens = list(tokens)
+        if not tokens:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany("DELETE FROM uploads WHERE token = ?",
+                                         [(token,) for token in tokens])
+            self._claimed.difference_update(tokens)
+        log.debug("Upload tokens used: %s", tokens)
+
+    def invalidate(self, token):
+        """
+        Stop reusing the uploads made with token, for example because it
+        has been rejected by Zendesk.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM uploads WHERE token = ?", (token,))
+            self._claimed.discard(token)
+
+    def purge_expired(self):
+        """ Remove uploads that can no longer be reused. """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM uploads WHERE expires <= ?",
+                                     (time.time(),))
+
+    def stats(self):
+        """ Return the number of hits, misses and bytes not uploaded thanks to the index. """
+        return dict(hits=self.hits, misses=self.misses, bytes_saved=self.bytes_saved)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _describe(self, fp, target_name):
+        """
+        Return the digest, size and Zendesk file name of fp, resolving the name
+        the same way :class:`~zenpy.lib.request.UploadRequest` does.
+        """
+        if hasattr(fp, 'read'):
+            if not (hasattr(fp, 'seek') and hasattr(fp, 'tell')):
+                return None, None, target_name
+            target_name = target_name or getattr(fp, 'name', None)
+            position = fp.tell()
+            try:
+                digest, size = self._hash(fp)
+            finally:
+                fp.seek(position)
+            return digest, size, target_name
+        elif hasattr(fp, 'name') or (isinstance(fp, str) and os.path.isfile(fp)):
+            path = str(fp)
+            if hasattr(fp, 'name'):
+                target_name = target_name or fp.name
+            else:
+                target_name = target_name or path
+            with open(path, 'rb') as f:
+                digest, size = self._hash(f)
+            return digest, size, target_name
+        elif isinstance(fp, (str, bytes)) and target_name:
+            content = fp.encode('utf-8') if isinstance(fp, str) else fp
+            return hashlib.sha256(content).hexdigest(), len(content), target_name
+        return None, None, target_name
+
+    def _hash(self, fp):
+        sha = hashlib.sha256()
+        size = 0
+        while True:
+            chunk = fp.read(self.chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            sha.update(chunk)
+            size += len(chunk)
+        return sha.hexdigest(), size
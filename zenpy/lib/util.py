@@ -1,11 +1,19 @@
 import calendar
 import datetime
+import functools
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Full
+from threading import Event
+
+import dateutil.parser
+import dateutil.tz
+from requests.models import PreparedRequest
 
 import pytz
 
-from datetime import datetime, date # noqa ignores F811
+from datetime import datetime, date, timedelta # noqa ignores F811
 
 from zenpy.lib.proxy import ProxyDict, ProxyList
 
@@ -39,6 +47,108 @@ def to_unix_ts(start_time):
     return int(unix_time)
 
 
+def parse_datetime(value):
+    """
+    Parse a timestamp from Zendesk. UTC timestamps in ISO 8601 format, which
+    Zendesk returns, are parsed with datetime.fromisoformat, anything else
+    with dateutil. The result is the same as dateutil.parser.parse(value).
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value.endswith('Z'):
+        try:
+            parsed = datetime.fromisoformat(value[:-1])
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                return parsed.replace(tzinfo=dateutil.tz.UTC)
+    return dateutil.parser.parse(value)
+
+
+def as_utc(datetime_obj):
+    """
+    Given a datetime object, return it converted to UTC.
+    Naive datetime objects are assumed to already be UTC.
+    """
+    if not is_timezone_aware(datetime_obj):
+        return pytz.utc.localize(datetime_obj)
+    return datetime_obj.astimezone(pytz.utc)
+
+
+def split_time_window(start, end, parts):
+    """
+    Split the time between start and end into consecutive windows suitable for
+    the *_between search parameters.
+
+    Zendesk compares *_between bounds exclusively and with second granularity,
+    so every window but the last is extended by one second to include the
+    start of the next window. Returns a list of (start, end) tuples.
+    """
+    step = int((end - start).total_seconds() // parts)
+    if step < 1:
+        return [(start, end)]
+    bounds = [start + timedelta(seconds=step * i) for i in range(parts)]
+    bounds.append(end)
+    windows = [(bounds[i], bounds[i + 1] + timedelta(seconds=1))
+               for i in range(parts - 1)]
+    windows.append((bounds[-2], bounds[-1]))
+    return windows
+
+
+def iterate_concurrently(iterable_factories, max_workers, queue_size=1000):
+    """
+    Consume several iterables on a thread pool and yield their items as they
+    become available.
+
+    Each factory is called without arguments in a worker thread and must return
+    an iterable. Items pass through a queue holding at most queue_size items,
+    so fast producers wait for the consumer rather than buffering without bound.
+    The first exception raised by a producer is re-raised in the consumer.
+    When the consumer stops early the producers stop too.
+    """
+    done = object()
+    results = Queue(maxsize=queue_size)
+    stopped = Event()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                results.put(entry, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce(factory):
+        try:
+            if stopped.is_set():
+                return
+            for item in factory():
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((None, e))
+        finally:
+            put((done, None))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for factory in iterable_factories:
+            executor.submit(produce, factory)
+        remaining = len(iterable_factories)
+        try:
+            while remaining:
+                item, error = results.get()
+                if error is not None:
+                    raise error
+                elif item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            stopped.set()
+
+
 def get_object_type(zenpy_object):
     """ Given an instance of a Zenpy object, return it's object type """
     return to_snake_case(zenpy_object.__class__.__name__)
@@ -103,6 +213,7 @@ def extract_id(*object_types):
     Decorator for extracting id from passed parameters for specific types.
     """
     def outer(func):
+        @functools.wraps(func)
         def inner(*args, **kwargs):
             def id_of(x):
                 return x.id if type(x) in object_types else x
@@ -156,3 +267,17 @@ def all_are_none(*args):
 def all_are_not_none(*args):
     """ Check if all args are not none. """
     return all(arg is not None for arg in args)
+
+
+def canonical_url(url, params=None):
+    """
+    Return url with params merged into its query string, sorted by name, so
+    that the same request always produces the same string.
+    """
+    if not params:
+        return url
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    request = PreparedRequest()
+    request.prepare_url(url, params)
+    return request.url